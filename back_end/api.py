@@ -0,0 +1,296 @@
+"""
+Async HTTP interview service.
+
+    uvicorn back_end.api:app --host 0.0.0.0 --port 8000
+
+Turns run on ``LangGraphHiringBot.aprocess_message``, so a single worker
+serves many concurrent interviews without a thread per request. The bot (or
+worker pool) is built in the background after startup: ``/healthz`` answers
+at once, ``/readyz`` once the bot is warm, and requests arriving before that
+wait for it.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from .config import get_settings
+from .feedback import FeedbackSink
+from .metrics import REGISTRY
+from .results import ResultsStore
+from .turns import Overloaded
+
+logger = logging.getLogger(__name__)
+
+
+class TurnRequest(BaseModel):
+    message: str
+
+
+class TurnResponse(BaseModel):
+    response: str
+    stage: str
+
+
+class StartRequest(BaseModel):
+    candidate_name: str = ""
+
+
+class FeedbackRequest(BaseModel):
+    rating: int = Field(ge=1, le=5)
+    type: str = "General"
+    conversation_id: Optional[str] = None
+    name: str = ""
+    email: str = ""
+    comments: str = ""
+
+
+def build_bot():
+    """Import and construct the bot; LangChain and LangGraph are only loaded here."""
+    if get_settings().api_workers:
+        from .workers import WorkerPool
+        return WorkerPool(get_settings().api_workers)
+    from .bot import LangGraphHiringBot
+    return LangGraphHiringBot()
+
+
+async def warm_up(app: FastAPI):
+    started = time.perf_counter()
+    try:
+        app.state.bot = await asyncio.to_thread(build_bot)
+        if not get_settings().api_workers:
+            # Worker processes open their own connections as they start.
+            await app.state.bot.awarm_up()
+    except Exception:
+        logger.exception("Bot warm-up failed")
+        raise
+    logger.info("Bot ready after %.2fs", time.perf_counter() - started)
+    return app.state.bot
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    logging.basicConfig(level=settings.log_level)
+    # Results are read straight from the shared store, whichever process recorded them.
+    app.state.results = ResultsStore(settings.results_db_path) if settings.results_db_path else None
+    app.state.feedback = (FeedbackSink(settings.feedback_log_path, settings.feedback_fsync_every,
+                                       settings.feedback_fsync_seconds)
+                          if settings.feedback_log_path else None)
+    # A bot set on app.state beforehand (tests, benchmarks) is used as is.
+    owned = getattr(app.state, "bot", None) is None
+    if owned:
+        app.state.warmup = asyncio.ensure_future(warm_up(app))
+    else:
+        app.state.warmup = asyncio.get_running_loop().create_future()
+        app.state.warmup.set_result(app.state.bot)
+    yield
+    if app.state.results is not None:
+        app.state.results.close()
+    if app.state.feedback is not None:
+        await asyncio.to_thread(app.state.feedback.close)
+    try:
+        bot = await app.state.warmup
+    except Exception:
+        return
+    bot.close()
+    if owned:
+        app.state.bot = None
+
+
+app = FastAPI(title="AI Hiring Assistant", lifespan=lifespan)
+
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded):
+    retry_after = max(1, round(exc.retry_after))
+    return JSONResponse(status_code=503, headers={"Retry-After": str(retry_after)},
+                        content={"detail": str(exc), "retry_after": retry_after})
+
+
+async def _bot(request: Request):
+    """The in-process bot, or a ``WorkerPool`` routing to worker processes, once warm."""
+    return await asyncio.shield(request.app.state.warmup)
+
+
+async def _existing(bot, conversation_id: str) -> dict:
+    status = await bot.aconversation_status(conversation_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown interview")
+    return status
+
+
+def _sse(data, event=None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz(request: Request):
+    """200 once the bot is built; load balancers route interviews here only after that."""
+    warmup = request.app.state.warmup
+    if not warmup.done():
+        return JSONResponse(status_code=503, content={"status": "warming up"})
+    if warmup.exception() is not None:
+        return JSONResponse(status_code=503, content={"status": "failed", "detail": repr(warmup.exception())})
+    return {"status": "ready"}
+
+
+@app.get("/healthz/llm-pool")
+async def llm_pool(request: Request):
+    """Provider connection pool usage; ``saturated`` means LLM calls are waiting for a connection."""
+    bot = await _bot(request)
+    return await asyncio.to_thread(bot.pool_status)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return REGISTRY.render()
+
+
+@app.post("/interviews", status_code=201)
+async def start_interview(request: Request, start: Optional[StartRequest] = None):
+    """Admit a new interview; 503 with ``Retry-After`` when the LLM backlog is too long."""
+    conversation_id = str(uuid.uuid4())
+    candidate_name = start.candidate_name.strip() if start else ""
+    wait = await (await _bot(request)).astart_conversation(conversation_id, candidate_name)
+    return {"conversation_id": conversation_id, "stage": "greeting", "estimated_wait_seconds": round(wait, 1)}
+
+
+@app.get("/interviews/{conversation_id}")
+async def interview_status(conversation_id: str, request: Request):
+    return {"conversation_id": conversation_id, **await _existing(await _bot(request), conversation_id)}
+
+
+@app.get("/interviews/{conversation_id}/evaluation")
+async def interview_evaluation(conversation_id: str, request: Request):
+    """Per-question scores from the background evaluator, plus the aggregate score card."""
+    evaluation = await (await _bot(request)).aconversation_evaluation(conversation_id)
+    if evaluation is None:
+        raise HTTPException(status_code=404, detail="Unknown interview")
+    return {"conversation_id": conversation_id, **evaluation}
+
+
+@app.post("/interviews/{conversation_id}/turns", response_model=TurnResponse)
+async def take_turn(conversation_id: str, turn: TurnRequest, request: Request):
+    bot = await _bot(request)
+    await _existing(bot, conversation_id)
+    return await bot.aprocess_message(turn.message, conversation_id)
+
+
+@app.post("/interviews/{conversation_id}/turns/stream")
+async def stream_turn(conversation_id: str, turn: TurnRequest, request: Request):
+    """
+    Server-sent events: one ``data`` event per response chunk, then a
+    ``done`` event with the turn result (or an ``error`` event).
+    """
+    bot = await _bot(request)
+    await _existing(bot, conversation_id)
+    events: "asyncio.Queue" = asyncio.Queue()
+
+    async def on_chunk(text):
+        await events.put(_sse(text))
+
+    async def run_turn():
+        try:
+            result = await bot.aprocess_message(turn.message, conversation_id, on_chunk=on_chunk)
+            await events.put(_sse(result, "done"))
+        except Exception as e:
+            logger.exception("Streaming turn failed for %s", conversation_id)
+            await events.put(_sse({"detail": repr(e)}, "error"))
+        await events.put(None)
+
+    async def stream():
+        task = asyncio.create_task(run_turn())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # A client that disconnects mid-turn still gets its turn committed.
+            await asyncio.shield(task)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+def _results(request: Request) -> ResultsStore:
+    if request.app.state.results is None:
+        raise HTTPException(status_code=404, detail="The results store is disabled (RESULTS_DB_PATH)")
+    return request.app.state.results
+
+
+@app.get("/results")
+async def list_results(request: Request, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                       position: Optional[str] = None, tech: Optional[str] = None,
+                       result: Optional[str] = None,
+                       limit: int = 100, offset: int = 0):
+    """Completed interviews, newest first, filtered by completion time, position, technology and result."""
+    store = _results(request)
+    filters = dict(since=since, until=until, position=position, tech=tech, result=result)
+    candidates = await asyncio.to_thread(store.query, limit, offset, **filters)
+    return {"total": await asyncio.to_thread(store.count, **filters), "candidates": candidates}
+
+
+@app.get("/results/export")
+async def export_results(request: Request, format: Literal["csv", "parquet"] = "csv",
+                         rows: Literal["candidates", "answers"] = "candidates",
+                         since: Optional[datetime] = None, until: Optional[datetime] = None,
+                         position: Optional[str] = None, tech: Optional[str] = None,
+                         result: Optional[str] = None):
+    """Stream every matching candidate (or per-question row) as CSV or Parquet, a batch at a time."""
+    chunks = _results(request).export(format, rows, since=since, until=until, position=position, tech=tech,
+                                      result=result)
+    media_type = "text/csv" if format == "csv" else "application/vnd.apache.parquet"
+    filename = f"interview_{rows}_{datetime.now():%Y%m%d}.{format}"
+    return StreamingResponse(chunks, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@app.get("/results/{conversation_id}")
+async def interview_result(conversation_id: str, request: Request):
+    """A completed interview's stored score card and per-question results."""
+    record = await asyncio.to_thread(_results(request).get, conversation_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="No recorded result")
+    return record
+
+
+def _feedback(request: Request) -> FeedbackSink:
+    if request.app.state.feedback is None:
+        raise HTTPException(status_code=404, detail="Feedback collection is disabled (FEEDBACK_LOG_PATH)")
+    return request.app.state.feedback
+
+
+@app.post("/feedback", status_code=202)
+async def submit_feedback(feedback: FeedbackRequest, request: Request):
+    """Queue a feedback submission, tagged with its interview's current stage; it is written in the background."""
+    sink = _feedback(request)
+    stage = None
+    if feedback.conversation_id:
+        status = await (await _bot(request)).aconversation_status(feedback.conversation_id)
+        stage = status["stage"] if status else None
+    if not sink.submit(feedback.rating, feedback.type, stage, feedback.conversation_id, feedback.name,
+                       feedback.email, feedback.comments):
+        raise HTTPException(status_code=503, detail="Feedback queue is full")
+    return {"status": "queued", "stage": stage}
+
+
+@app.get("/feedback/summary")
+async def feedback_summary(request: Request):
+    """Rating counts and averages overall, by feedback type and by interview stage."""
+    return _feedback(request).summary()
@@ -1,162 +1,639 @@
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langgraph.graph import Graph, END
-from langchain.schema import HumanMessage, AIMessage
+import asyncio
+import logging
+import os
+import textwrap
+import time
+from functools import partial
+from typing import TypedDict
+
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langgraph.graph import END, START, StateGraph
+from langgraph.utils.runnable import RunnableCallable
 
 from .templates import Templates
-from .smith import LangSmithTracer
-
-from .config import settings
+from .turns import TurnStream
+from .smith import LangSmithTracer, JSONLTraceSink, SQLiteTraceSink, LangSmithHTTPSink
+from .store import ConversationStore, SQLiteConversationBackend, Stage, stage_for
+from .history import HistoryManager, estimate_tokens
+from .evaluation import AnswerEvaluator, score_card
+from .results import ResultsStore, parse_details
+from .questions import QUESTION_PLAN, QuestionBank
+from .models import ModelRouter, groq_client
+from .cache import MemoryResponseCache, SQLiteResponseCache, template_version
+from .checkpoint import SQLiteCheckpointSaver
+from .connections import aopen_connections, open_connections, pool_status
+from .metrics import (TURN_SECONDS, PHASE_SECONDS, TTFT_SECONDS, INPUT_TOKENS, OUTPUT_TOKENS,
+                      CACHE_REQUESTS, QUESTION_BANK_REQUESTS, ERRORS)
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+COMPLETE_RESPONSE = "Conversation complete."
+
+
+class InterviewState(TypedDict, total=False):
+    """Graph state of one interview: the turn's input and reply plus the progress flags."""
+
+    user_input: str
+    conversation_id: str
+    response: str
+    stage: str
+    greeting_done: bool
+    info_done: bool
+    tech_done: bool
+    hiring_done: bool
+    hiring_question_count: int
+    tech_stack: str
 
 
 def route_next_stage(state):
-    print("Routing State Flags:", state)
-    if not state.get("greeting_done", False):
-        return "greeting"
-    elif not state.get("info_done", False):
-        return "info"
-    elif not state.get("tech_done", False):
-        return "tech_stack"
-    elif state.get("hiring_question_count", 0) < 6:
-        return "hiring"
-    else:
-        return END
-
-
-def _build_prompt(template: str, history, input_str: str):
+    logger.debug("Routing state flags: %s", state)
+    stage = stage_for(state)
+    return END if stage is Stage.COMPLETE else stage
+
+
+def _compile_prompt(template: str):
     return ChatPromptTemplate.from_messages([
         ('system', template),
-        *[(msg.type, msg.content) for msg in history[-4:]],
+        MessagesPlaceholder("history"),
         ('human', '{input}')
-    ]), {"input": input_str}
+    ])
 
 
-class LangGraphHiringBot:
-    def __init__(self):
-        self.templates = Templates()
-        self.llm = ChatGroq(
-            api_key=settings.GROQ_API.get_secret_value(),
-            model="llama3-70b-8192",
-            temperature=0,
-            max_tokens=1024,
-        )
-        self.tracer = LangSmithTracer()
-        self.conversations = {}
+def _candidate_name(text: str) -> str:
+    name = text.strip().strip(".!,")
+    if not name or len(name) > 60 or name.lower() in ("hi", "hello", "hey", "okay", "ok", "yes", "start"):
+        return "there"
+    return name
 
-    def _run_stage(self, state, template, flag_name, next_stage):
-        input_str = state.get("user_input", "")
-        conversation_id = state.get("conversation_id", "default")
-        history = self.conversations.setdefault(conversation_id, {
-            "messages": [],
-            "flags": {
-                "greeting_done": False,
-                "info_done": False,
-                "tech_done": False,
-                "hiring_done": False,
-                "hiring_question_count": 0
-            }
-        })["messages"]
-
-        self.tracer.start_trace(conversation_id, input_str, state.get("stage", "unknown"))
-
-        prompt, inputs = _build_prompt(template, history, input_str)
-        response = (prompt | self.llm | StrOutputParser()).invoke(inputs)
-
-        history.extend([
-            HumanMessage(content=input_str),
-            AIMessage(content=response)
-        ])
-
-        new_state = {
-            **state,
-            "response": response,
-            "stage": next_stage,
-            flag_name: True
-        }
 
-        self.tracer.end_trace(conversation_id, response, new_state)
+def _prompt_inputs(history, input_str: str):
+    return {"history": history, "input": input_str}
 
-        return new_state
 
-    def greeting_node(self, state):
-        print('Running greeting_node')
-        return self._run_stage(state, self.templates.greeting, "greeting_done", "info")
+def _text(message) -> str:
+    return message.content if hasattr(message, "content") else str(message)
 
-    def info_node(self, state):
-        print('Running info_node')
-        return self._run_stage(state, self.templates.info, "info_done", "tech_stack")
 
-    def tech_stack_node(self, state):
-        print('Running tech_stack_node')
-        return self._run_stage(state, self.templates.tech_stack, "tech_done", "hiring")
-
-    def hiring_node(self, state):
-        print('Running hiring_node')
-        count = state.get("hiring_question_count", 0) + 1
-        updated_state = self._run_stage(state, self.templates.hiring_prompt, "hiring_done", "hiring")
-        updated_state["hiring_question_count"] = count
-        return updated_state
-
-
-    def create_graph(self):
-        graph = Graph()
+class LangGraphHiringBot:
+    def __init__(self, llm=None, conversations=None, llm_factory=None):
+        settings = get_settings()
+        self.templates = Templates()
+        # Each stage and background job gets the model, output budget and
+        # timeout from settings.llm_routes. A given ``llm`` serves every route;
+        # ``llm_factory`` builds one client per model name instead of ChatGroq.
+        if llm is not None:
+            llm_factory = lambda model: llm  # noqa: E731
+        self.models = ModelRouter(settings.llm_routes, client_factory=llm_factory or groq_client,
+                                  share=settings.api_workers)
+        self.tracer = self._create_tracer()
+
+        # stage -> (template, completion flag, next stage). Prompts and chains
+        # are compiled once here; history goes in through the placeholder.
+        # Chains end at the LLM so token usage metadata stays available.
+        self.stages = {
+            "greeting": (self.templates.greeting, "greeting_done", "info"),
+            "info": (self.templates.info, "info_done", "tech_stack"),
+            "tech_stack": (self.templates.tech_stack, "tech_done", "hiring"),
+            "hiring": (self.templates.hiring_prompt, "hiring_done", "hiring"),
+        }
+        self.chains = {
+            stage: _compile_prompt(template) | self.models.llm(stage)
+            for stage, (template, _, _) in self.stages.items()
+        }
+        self.scripts = {
+            "greeting": self.templates.greeting_script,
+            "info": self.templates.info_script,
+            "tech_stack": self.templates.tech_stack_script,
+        }
+        # The routed model and output budget are part of each version, so
+        # rerouting a stage misses (and purges) entries made under the old route.
+        self.template_versions = {}
+        for stage, (template, _, _) in self.stages.items():
+            route = self.models.route(stage)
+            self.template_versions[stage] = template_version(template, route["model"], route["max_tokens"])
+        self.cache = self._create_cache()
+        self.question_bank = self._load_question_bank()
+        if conversations is None:
+            conversations = ConversationStore(
+                max_conversations=settings.conversation_cache_size,
+                ttl_seconds=settings.conversation_ttl_seconds,
+                backend=SQLiteConversationBackend(settings.conversation_db_path)
+                if settings.conversation_db_path else None,
+            )
+        self.conversations = conversations
+        self.history = HistoryManager(
+            self.models.llm("summary"), self.templates.summary_prompt,
+            budgets=settings.history_token_budgets, max_workers=settings.summary_workers,
+            on_summary=self.conversations.save_state,
+        )
+        self.evaluator = AnswerEvaluator(
+            self.models.llm("evaluation"), self.templates.answer_evaluation_prompt, max_workers=settings.evaluation_workers,
+            on_result=self._evaluation_done, attempts=settings.evaluation_attempts,
+        )
+        # Completed interviews' score cards, queried and exported by HR.
+        self.results = ResultsStore(settings.results_db_path) if settings.results_db_path else None
+        # Graph state is checkpointed per conversation next to the transcript,
+        # so any worker can resume an interview from its last turn.
+        self.checkpointer = SQLiteCheckpointSaver(settings.conversation_db_path) \
+            if settings.conversation_db_path else None
+        self.graph = self.create_graph()
+
+    def _create_tracer(self):
+        settings = get_settings()
+        sinks = []
+        if "jsonl" in settings.trace_sinks:
+            sinks.append(JSONLTraceSink(settings.trace_jsonl_path))
+        if "sqlite" in settings.trace_sinks:
+            sinks.append(SQLiteTraceSink(settings.trace_db_path))
+        if "langsmith" in settings.trace_sinks or settings.langsmith_tracing:
+            api_key = settings.langsmith_api_key.get_secret_value() if settings.langsmith_api_key else None
+            sinks.append(LangSmithHTTPSink(settings.langsmith_endpoint, api_key, settings.langsmith_project))
+        return LangSmithTracer(
+            sinks,
+            sample_rate=settings.trace_sample_rate,
+            slow_ms=settings.trace_slow_ms,
+            ring_size=settings.trace_ring_size,
+            max_conversations=settings.conversation_cache_size,
+            queue_size=settings.trace_queue_size,
+        )
 
-        graph.add_node("greeting", self.greeting_node)
-        graph.add_node("info", self.info_node)
-        graph.add_node("tech_stack", self.tech_stack_node)
-        graph.add_node("hiring", self.hiring_node)
+    def _create_cache(self):
+        settings = get_settings()
+        if settings.response_cache == "memory":
+            return MemoryResponseCache(settings.response_cache_size)
+        if settings.response_cache == "disk":
+            return SQLiteResponseCache(settings.response_cache_path, settings.response_cache_size,
+                                       versions=self.template_versions)
+        return None
+
+    def _load_question_bank(self):
+        path = get_settings().question_bank_path
+        if not path or not os.path.exists(path):
+            logger.info("No question bank at %s; hiring questions are generated live", path)
+            return None
+        bank = QuestionBank.load(path)
+        logger.info("Loaded %d question slots from %s", len(bank.entries), path)
+        return bank
+
+    def _conversation(self, conversation_id):
+        return self.conversations.get(conversation_id)
+
+    def _start_stage(self, state, stage):
+        input_str = state.get("user_input", "")
+        conversation_id = state.get("conversation_id", "default")
+        started = time.perf_counter()
+        history = self.history.window(conversation_id, self._conversation(conversation_id), stage)
+        inputs = _prompt_inputs(history, input_str)
+        PHASE_SECONDS.observe(time.perf_counter() - started, stage=stage, phase="prompt")
 
-        graph.add_conditional_edges("greeting", route_next_stage, {"info": "info", END: END})
-        graph.add_conditional_edges("info", route_next_stage, {"tech_stack": "tech_stack", END: END})
-        graph.add_conditional_edges("tech_stack", route_next_stage, {"hiring": "hiring", END: END})
-        graph.add_conditional_edges("hiring", route_next_stage, {END: END})
+        started = time.perf_counter()
+        self.tracer.start_trace(conversation_id, input_str, stage)
+        PHASE_SECONDS.observe(time.perf_counter() - started, stage=stage, phase="trace")
 
-        graph.set_entry_point("greeting")
-        return graph.compile()
+        return self.chains[stage], inputs
 
-    def process_message(self, user_input: str, conversation_id: str = "default"):
-        conv = self.conversations.setdefault(conversation_id, {
-            "messages": [],
-            "flags": {
-                "greeting_done": False,
-                "info_done": False,
-                "tech_done": False,
-                "hiring_done": False,
-                "hiring_question_count": 0
-            }
-        })
-
-        state = {
-            "user_input": user_input,
-            "conversation_id": conversation_id,
-            **conv["flags"]
-        }
+    @staticmethod
+    def _call_config(state, stage):
+        """Lets the scheduler queue the call fairly by conversation and prioritise it by stage."""
+        return {"metadata": {"conversation_id": state.get("conversation_id", "default"), "stage": stage}}
 
-        current_stage = route_next_stage(state)
+    def _finish_stage(self, state, response, stage):
+        _, flag_name, next_stage = self.stages[stage]
+        conversation_id = state.get("conversation_id", "default")
+        transcript = self._conversation(conversation_id).transcript
+        transcript.append("human", state.get("user_input", ""))
+        transcript.append("ai", response)
+
+        # Nodes return only the channels they change, so the checkpoint
+        # written for the turn holds just this delta.
+        update = {"response": response, "stage": next_stage, flag_name: True}
+        # The state dict belongs to this turn, so the trace sees it updated in place.
+        state.update(update)
+
+        started = time.perf_counter()
+        self.tracer.end_trace(conversation_id, response, state)
+        PHASE_SECONDS.observe(time.perf_counter() - started, stage=stage, phase="trace")
+
+        return update
+
+    def _record_usage(self, stage, inputs, response, usage):
+        if usage:
+            INPUT_TOKENS.inc(usage.get("input_tokens", 0), stage=stage)
+            OUTPUT_TOKENS.inc(usage.get("output_tokens", 0), stage=stage)
+            return
+        # Providers that do not report usage (e.g. some streaming modes) get an estimate.
+        prompt_text = self.stages[stage][0] + inputs["input"] + "".join(_text(m) for m in inputs["history"])
+        INPUT_TOKENS.inc(estimate_tokens(prompt_text), stage=stage)
+        OUTPUT_TOKENS.inc(estimate_tokens(response), stage=stage)
+
+    def _cache_key(self, stage, inputs):
+        if self.cache is None or stage not in get_settings().response_cache_stages:
+            return None
+        return self.cache.key(stage, self.template_versions[stage], inputs["input"], inputs["history"])
+
+    def _render_script(self, stage, state):
+        input_str = state.get("user_input", "")
+        transcript = self._conversation(state.get("conversation_id", "default")).transcript
+        # The greeting answers the candidate's first message, which is their name.
+        name = _candidate_name(transcript.text(0) if len(transcript) else input_str)
+        return textwrap.dedent(self.scripts[stage]).strip().format(name=name, details=input_str.strip())
+
+    def _bank_question(self, state):
+        count = state.get("hiring_question_count", 0)
+        if count >= len(QUESTION_PLAN):
+            return None
+        # The first hiring turn carries the tech stack; later ones answer the previous question.
+        stack = state.get("user_input", "") if count == 0 else state.get("tech_stack", "")
+        conversation_id = state.get("conversation_id", "default")
+        asked = self._conversation(conversation_id).transcript.texts("ai")
+        question = self.question_bank.select(conversation_id, stack, count + 1, asked)
+        QUESTION_BANK_REQUESTS.inc(result="miss" if question is None else "hit")
+        return question
+
+    def _local_response(self, stage, state, inputs):
+        """
+        Response that needs no LLM call (scripted stage, bank question or
+        cache hit), plus the cache key to fill on a miss.
+        """
+        settings = get_settings()
+        if stage in settings.scripted_stages and stage in self.scripts:
+            return self._render_script(stage, state), None
+        if stage == "hiring" and self.question_bank is not None:
+            question = self._bank_question(state)
+            if question is not None:
+                return question, None
+        key = self._cache_key(stage, inputs)
+        if not key:
+            return None, None
+        response = self.cache.get(stage, key)
+        CACHE_REQUESTS.inc(stage=stage, result="miss" if response is None else "hit")
+        return response, key
+
+    def _fail_stage(self, state, stage, error):
+        ERRORS.inc(stage=stage)
+        logger.warning("Stage %s failed for %s: %r", stage, state.get("conversation_id", "default"), error)
+        self.tracer.end_trace(state.get("conversation_id", "default"), None, state, error=repr(error))
+
+    def _run_stage(self, state, stage):
+        chain, inputs = self._start_stage(state, stage)
+        response, key = self._local_response(stage, state, inputs)
+        if response is None:
+            started = time.perf_counter()
+            try:
+                message = chain.invoke(inputs, self._call_config(state, stage))
+            except Exception as e:
+                self._fail_stage(state, stage, e)
+                raise
+            elapsed = time.perf_counter() - started
+            PHASE_SECONDS.observe(elapsed, stage=stage, phase="llm")
+            TTFT_SECONDS.observe(elapsed, stage=stage)
+            response = _text(message)
+            self._record_usage(stage, inputs, response, getattr(message, "usage_metadata", None))
+            if key:
+                self.cache.put(stage, self.template_versions[stage], key, response)
+        return self._finish_stage(state, response, stage)
+
+    def _stream_stage(self, state, stage, write):
+        chain, inputs = self._start_stage(state, stage)
+        response, key = self._local_response(stage, state, inputs)
+        if response is not None:
+            write(response)
+        else:
+            chunks = []
+            usage = None
+            started = time.perf_counter()
+            try:
+                for chunk in chain.stream(inputs, self._call_config(state, stage)):
+                    if not chunks:
+                        TTFT_SECONDS.observe(time.perf_counter() - started, stage=stage)
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    text = _text(chunk)
+                    chunks.append(text)
+                    write(text)
+            except Exception as e:
+                self._fail_stage(state, stage, e)
+                raise
+            # Includes the time the consumer spends between chunks.
+            PHASE_SECONDS.observe(time.perf_counter() - started, stage=stage, phase="llm")
+            response = "".join(chunks)
+            self._record_usage(stage, inputs, response, usage)
+            if key:
+                self.cache.put(stage, self.template_versions[stage], key, response)
+        return self._finish_stage(state, response, stage)
+
+    def _complete_node(self, stage, state, result):
+        if stage == "hiring":
+            count = state.get("hiring_question_count", 0)
+            result["hiring_question_count"] = count + 1
+            if count == 0:
+                result["tech_stack"] = state.get("user_input", "")
+            else:
+                # Every hiring turn after the first answers the question asked just before it.
+                conversation_id = state.get("conversation_id", "default")
+                conv = self._conversation(conversation_id)
+                question = conv.transcript.text(-3) if len(conv.transcript) >= 3 else ""
+                self.evaluator.submit(conversation_id, conv, count, question, state.get("user_input", ""))
+        return result
+
+    # Graph nodes. LangGraph passes ``writer``, its custom stream, which
+    # carries reply chunks when the turn runs with ``streaming`` set.
+    def _stage_node(self, stage, state, config, writer):
+        logger.debug('Running %s_node', stage)
+        if config["configurable"].get("streaming"):
+            result = self._stream_stage(state, stage, writer)
+        else:
+            result = self._run_stage(state, stage)
+        return self._complete_node(stage, state, result)
+
+    async def _astage_node(self, stage, state, config, writer):
+        logger.debug('Running %s_node (async)', stage)
+        streaming = config["configurable"].get("streaming")
+        result = await self._arun_stage(state, stage, writer if streaming else None)
+        return self._complete_node(stage, state, result)
+
+    @staticmethod
+    def _closing_node(state, config, writer):
+        if config["configurable"].get("streaming"):
+            writer(COMPLETE_RESPONSE)
+        return {"response": COMPLETE_RESPONSE, "stage": Stage.COMPLETE.value}
+
+    @staticmethod
+    async def _aclosing_node(state, config, writer):
+        return LangGraphHiringBot._closing_node(state, config, writer)
+
+    async def _arun_stage(self, state, stage, write=None):
+        chain, inputs = self._start_stage(state, stage)
+        # The SQLite response cache is read and written in a thread, off the event loop.
+        disk_cache = isinstance(self.cache, SQLiteResponseCache)
+        if disk_cache:
+            response, key = await asyncio.to_thread(self._local_response, stage, state, inputs)
+        else:
+            response, key = self._local_response(stage, state, inputs)
+        if response is not None:
+            if write is not None:
+                write(response)
+            return self._finish_stage(state, response, stage)
+
+        started = time.perf_counter()
+        try:
+            if write is None:
+                message = await chain.ainvoke(inputs, self._call_config(state, stage))
+                TTFT_SECONDS.observe(time.perf_counter() - started, stage=stage)
+                response, usage = _text(message), getattr(message, "usage_metadata", None)
+            else:
+                chunks = []
+                usage = None
+                async for chunk in chain.astream(inputs, self._call_config(state, stage)):
+                    if not chunks:
+                        TTFT_SECONDS.observe(time.perf_counter() - started, stage=stage)
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    chunks.append(_text(chunk))
+                    write(chunks[-1])
+                response = "".join(chunks)
+        except Exception as e:
+            self._fail_stage(state, stage, e)
+            raise
+        PHASE_SECONDS.observe(time.perf_counter() - started, stage=stage, phase="llm")
+        self._record_usage(stage, inputs, response, usage)
+        if key and disk_cache:
+            await asyncio.to_thread(self.cache.put, stage, self.template_versions[stage], key, response)
+        elif key:
+            self.cache.put(stage, self.template_versions[stage], key, response)
+        return self._finish_stage(state, response, stage)
 
-        node_funcs = {
-            "greeting": self.greeting_node,
-            "info": self.info_node,
-            "tech_stack": self.tech_stack_node,
-            "hiring": self.hiring_node,
-            END: lambda s: {"stage": END, "response": "Conversation complete."}
+    def create_graph(self):
+        """
+        One turn is one pass through the graph: route on the flags to the
+        current stage's node, run it and stop. A finished interview goes to
+        the closing node instead.
+        """
+        graph = StateGraph(InterviewState)
+        # Node names must not clash with state keys such as ``tech_stack``.
+        nodes = {stage: f"{stage}_node" for stage in self.stages}
+        for stage, node in nodes.items():
+            # RunnableCallable gives each node a native async variant; trace=False
+            # because turns are traced by self.tracer, not LangChain callbacks.
+            graph.add_node(node, RunnableCallable(partial(self._stage_node, stage),
+                                                  partial(self._astage_node, stage), name=node, trace=False))
+            graph.add_edge(node, END)
+        graph.add_node("closing_node", RunnableCallable(self._closing_node, self._aclosing_node,
+                                                        name="closing_node", trace=False))
+        graph.add_edge("closing_node", END)
+        graph.add_conditional_edges(START, route_next_stage, {**nodes, END: "closing_node"})
+        return graph.compile(checkpointer=self.checkpointer)
+
+    def start_conversation(self, conversation_id: str, candidate_name: str = "") -> float:
+        """
+        Admit a new interview and return the estimated wait in seconds for
+        its first reply. Raises ``Overloaded`` if the LLM backlog is too long.
+        ``candidate_name`` is the name the candidate gave the portal.
+        """
+        wait = 0.0
+        if conversation_id not in self.conversations:
+            wait = self.models.scheduler("greeting").admit()
+        if candidate_name:
+            with self.conversations.checkout(conversation_id) as conv:
+                conv.candidate_name = candidate_name
+        else:
+            self.conversations.get(conversation_id)
+        return wait
+
+    def conversation_status(self, conversation_id: str):
+        """Stage, flags and message count of a conversation, or None if it is unknown."""
+        try:
+            conv = self.conversations[conversation_id]
+        except KeyError:
+            return None
+        return {
+            "stage": conv.flags.stage.value,
+            "messages": len(conv.transcript),
+            "flags": conv.flags.as_dict(),
         }
 
-        node_func = node_funcs.get(current_stage, node_funcs[END])
-        result = node_func(state)
-
-        for key in conv["flags"].keys():
+    def conversation_evaluation(self, conversation_id: str):
+        """
+        Score card built from the background per-answer evaluations, or None
+        if the conversation is unknown. Answers still unscored after a
+        restart, or that failed every attempt, are resubmitted.
+        """
+        try:
+            conv = self.conversations[conversation_id]
+        except KeyError:
+            return None
+        self.evaluator.resume(conversation_id, conv)
+        return score_card(conv.evaluations, get_settings().pass_score)
+
+    def _evaluation_done(self, conversation_id, conv):
+        # Scores land after the turn that submitted them was written through.
+        self.conversations.save_state(conversation_id, conv)
+        self._record_result(conversation_id, conv)
+
+    def _record_result(self, conversation_id, conv):
+        """
+        Store a finished interview's score card once none of its answers is
+        still being scored. If some could not be scored it is stored as
+        "Incomplete", and replaced once they are.
+        """
+        if self.results is None or conv.flags.stage is not Stage.COMPLETE or self.results.has_final(conversation_id):
+            return
+        card = score_card(conv.evaluations, get_settings().pass_score)
+        if card["pending"]:
+            return
+        # One human message per stage; the third answers the details form.
+        replies = conv.transcript.texts("human")
+        profile = {"candidate_name": conv.candidate_name,
+                   "tech_stack": conv.flags.tech_stack, **parse_details(replies[2] if len(replies) > 2 else "")}
+        try:
+            if self.results.record(conversation_id, profile, card):
+                logger.info("Recorded results of %s: %s (%d)", conversation_id, card["result"], card["score"])
+        except Exception:
+            logger.exception("Recording results of %s failed", conversation_id)
+
+    async def astart_conversation(self, conversation_id: str, candidate_name: str = "") -> float:
+        """
+        ``start_conversation`` for coroutines. Waiting for a turn in flight
+        and reloading from the persistent tier never block the event loop.
+        """
+        wait = 0.0
+        if conversation_id not in self.conversations:
+            wait = self.models.scheduler("greeting").admit()
+        if candidate_name:
+            async with self.conversations.acheckout(conversation_id) as conv:
+                conv.candidate_name = candidate_name
+        else:
+            await self.conversations.aget(conversation_id)
+        return wait
+
+    async def aconversation_status(self, conversation_id: str):
+        # A conversation evicted from memory is reloaded from SQLite.
+        return await asyncio.to_thread(self.conversation_status, conversation_id)
+
+    async def aconversation_evaluation(self, conversation_id: str):
+        return await asyncio.to_thread(self.conversation_evaluation, conversation_id)
+
+    def warm_up(self) -> int:
+        """Open provider connections before the first candidate; a no-op with a stand-in LLM."""
+        return open_connections() if self.models.client_factory is groq_client else 0
+
+    async def awarm_up(self) -> int:
+        """``warm_up`` for the running event loop's pool, which async turns use."""
+        return await aopen_connections() if self.models.client_factory is groq_client else 0
+
+    def pool_status(self) -> dict:
+        """Usage of the process's provider connection pools (shared with any other bot in it)."""
+        return pool_status()
+
+    def close(self):
+        """Finish background evaluations, flush traces and stop summarization and the LLM schedulers."""
+        self.evaluator.shutdown()
+        self.history.shutdown()
+        self.models.close()
+        self.tracer.close()
+        if self.checkpointer is not None:
+            self.checkpointer.close()
+        if self.results is not None:
+            self.results.close()
+
+    def _begin_turn(self, user_input, conversation_id):
+        conv = self._conversation(conversation_id)
+        state = {"user_input": user_input, "conversation_id": conversation_id}
+        # The checkpoint holds the flags. Without one (no checkpointer, or an
+        # interview from before checkpointing) they come from the session.
+        if self.checkpointer is None or (len(conv.transcript) and not self.checkpointer.has_thread(conversation_id)):
+            state.update(conv.flags.as_dict())
+        return conv, state, stage_for(conv.flags).value
+
+    @staticmethod
+    def _graph_config(conversation_id, streaming=False):
+        return {"configurable": {"thread_id": conversation_id, "streaming": streaming}}
+
+    def _end_turn(self, conversation_id, conv, result):
+        # The session keeps a copy of the flags for status queries and handoff between workers.
+        for key in conv.flags.keys():
             if key in result:
-                conv["flags"][key] = result[key]
+                setattr(conv.flags, key, result[key])
+        stage = result.get("stage", Stage.COMPLETE.value)
+        if conv.flags.stage is Stage.COMPLETE:
+            # The last hiring turn ends the interview, so it reports it complete.
+            stage = Stage.COMPLETE.value
+            self._record_result(conversation_id, conv)
 
         return {
             "response": result.get("response", ""),
-            "stage": result.get("stage", "complete")
+            "stage": stage
         }
 
+    def process_message(self, user_input: str, conversation_id: str = "default"):
+        with self.conversations.checkout(conversation_id):
+            return self._process_turn(user_input, conversation_id)
+
+    def _process_turn(self, user_input, conversation_id):
+        started = time.perf_counter()
+        conv, state, current_stage = self._begin_turn(user_input, conversation_id)
+        # Only the final checkpoint of the turn is written.
+        result = self.graph.invoke(state, self._graph_config(conversation_id), checkpoint_during=False)
+
+        TURN_SECONDS.observe(time.perf_counter() - started, stage=current_stage)
+        return self._end_turn(conversation_id, conv, result)
+
+    async def aprocess_message(self, user_input: str, conversation_id: str = "default", on_chunk=None):
+        """
+        Async ``process_message`` built on the LLM's ``ainvoke``/``astream``, so
+        one event loop can carry many interviews. When ``on_chunk`` (a
+        coroutine function) is given, the reply is streamed to it chunk by chunk.
+        """
+        async with self.conversations.acheckout(conversation_id):
+            started = time.perf_counter()
+            begin = partial(self._begin_turn, user_input, conversation_id)
+            # Looking up the checkpoint is SQLite under the checkpointer's lock.
+            conv, state, current_stage = begin() if self.checkpointer is None else await asyncio.to_thread(begin)
+
+            if on_chunk is None:
+                result = await self.graph.ainvoke(state, self._graph_config(conversation_id),
+                                                  checkpoint_during=False)
+            else:
+                result = None
+                async for mode, value in self.graph.astream(state, self._graph_config(conversation_id, True),
+                                                            stream_mode=["custom", "values"],
+                                                            checkpoint_during=False):
+                    if mode == "custom":
+                        await on_chunk(value)
+                    else:
+                        result = value
+
+            TURN_SECONDS.observe(time.perf_counter() - started, stage=current_stage)
+            return self._end_turn(conversation_id, conv, result)
+
+    def stream_message(self, user_input: str, conversation_id: str = "default"):
+        """
+        Streaming variant of ``process_message``. Iterating the returned
+        ``TurnStream`` yields response chunks as the LLM produces them; once
+        exhausted, history, flags and traces are committed and
+        ``TurnStream.result`` holds the same dict ``process_message`` returns.
+        """
+        return TurnStream(self._stream_turn(user_input, conversation_id))
+
+    def _stream_turn(self, user_input, conversation_id):
+        with self.conversations.checkout(conversation_id):
+            started = time.perf_counter()
+            conv, state, current_stage = self._begin_turn(user_input, conversation_id)
+
+            result = None
+            for mode, value in self.graph.stream(state, self._graph_config(conversation_id, True),
+                                                 stream_mode=["custom", "values"], checkpoint_during=False):
+                if mode == "custom":
+                    yield value
+                else:
+                    result = value
+
+            TURN_SECONDS.observe(time.perf_counter() - started, stage=current_stage)
+            return self._end_turn(conversation_id, conv, result)
+
 
 if __name__ == "__main__":
+    logging.basicConfig(level=get_settings().log_level)
     print("\U0001F916 AI Hiring Bot - Simulated Chat\n")
     bot = LangGraphHiringBot()
     while True:
@@ -164,5 +641,8 @@ if __name__ == "__main__":
         if user_input.lower() in ["exit", "quit"]:
             print("\nExiting bot. Goodbye!")
             break
-        result = bot.process_message(user_input)
-        print(f"\U0001F916 Bot ({result['stage']}): {result['response']}\n")
+        print("\U0001F916 Bot: ", end="", flush=True)
+        stream = bot.stream_message(user_input)
+        for chunk in stream:
+            print(chunk, end="", flush=True)
+        print(f"\n({stream.result['stage']})\n")
@@ -0,0 +1,144 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+
+def template_version(template: str, *params) -> str:
+    """
+    Content hash of a prompt template and whatever else shapes its output,
+    such as the routed model and its ``max_tokens``; changing any of them
+    changes every cache key built from it.
+    """
+    digest = hashlib.sha256(template.encode())
+    for param in params:
+        digest.update(b"\0" + str(param).encode())
+    return digest.hexdigest()[:12]
+
+
+def normalize_input(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class ResponseCache:
+    """
+    Base for caches of deterministic (temperature=0) stage responses, keyed on
+    stage, template version, normalized input and the history window sent
+    with it. Subclasses provide bounded storage via ``_get`` and ``_put``.
+    """
+
+    def __init__(self):
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def key(stage: str, version: str, input_str: str, history: Iterable) -> str:
+        digest = hashlib.sha256()
+        for part in (stage, version, normalize_input(input_str)):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        for msg in history:
+            digest.update(f"{msg.type}:{msg.content}".encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, stage: str, key: str) -> Optional[str]:
+        response = self._get(key)
+        with self._stats_lock:
+            counter = self.hits if response is not None else self.misses
+            counter[stage] = counter.get(stage, 0) + 1
+        return response
+
+    def put(self, stage: str, version: str, key: str, response: str):
+        self._put(stage, version, key, response)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._stats_lock:
+            return {"hits": dict(self.hits), "misses": dict(self.misses)}
+
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _put(self, stage: str, version: str, key: str, response: str):
+        raise NotImplementedError
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU holding at most ``max_entries`` responses."""
+
+    def __init__(self, max_entries: int = 10000):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def _put(self, stage, version, key, response):
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    On-disk LRU that survives restarts. Entries written under an older
+    template version are purged on open via ``versions``.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, max_entries: int = 10000, versions: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self.max_entries = max_entries
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                stage TEXT NOT NULL,
+                version TEXT NOT NULL,
+                response TEXT NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+        """)
+        with self._db:
+            for stage, version in (versions or {}).items():
+                self._db.execute("DELETE FROM responses WHERE stage = ? AND version != ?", (stage, version))
+
+    def _get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with self._db:
+                self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def _put(self, stage, version, key, response):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, stage, version, response, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, stage, version, response, time.time())
+            )
+            # Trimming walks the last_used index, so do it in batches rather than per write.
+            self._puts += 1
+            if self._puts % self.PRUNE_EVERY == 0:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
@@ -1,3 +1,7 @@
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
 from pydantic_settings import BaseSettings
 from pydantic import Field, SecretStr, ValidationError
 
@@ -5,16 +9,117 @@ class Settings(BaseSettings):
     GROQ_API: SecretStr = Field(..., env="GROQ_API")
     langsmith_tracing: bool = Field(default=False, env="LANGSMITH_TRACING")
     langsmith_endpoint: str = Field(default="https://api.smith.langchain.com", env="LANGSMITH_ENDPOINT")
-    langsmith_api_key: SecretStr = Field(default=None, env="LANGSMITH_API_KEY")
+    langsmith_api_key: Optional[SecretStr] = Field(default=None, env="LANGSMITH_API_KEY")
     langsmith_project: str = Field(default="pg_agi", env="LANGSMITH_PROJECT")
+    # In-memory conversations are evicted after the 50-minute exam window
+    # (see Templates._terms_prompt) or once the LRU is full.
+    conversation_cache_size: int = Field(default=10000, env="CONVERSATION_CACHE_SIZE")
+    conversation_ttl_seconds: float = Field(default=50 * 60, env="CONVERSATION_TTL_SECONDS")
+    # SQLite file for the write-through tier; unset keeps conversations in memory only.
+    conversation_db_path: Optional[str] = Field(default=None, env="CONVERSATION_DB_PATH")
+    # Approximate prompt tokens of history sent per stage; older messages are
+    # folded into a rolling summary instead of being dropped.
+    history_token_budgets: Dict[str, int] = Field(
+        default={"greeting": 256, "info": 512, "tech_stack": 512, "hiring": 3072},
+        env="HISTORY_TOKEN_BUDGETS",
+    )
+    summary_workers: int = Field(default=2, env="SUMMARY_WORKERS")
+    # Background pool scoring each hiring answer, tries per answer before it
+    # is marked "error", and the score needed to pass.
+    evaluation_workers: int = Field(default=2, env="EVALUATION_WORKERS")
+    evaluation_attempts: int = Field(default=3, env="EVALUATION_ATTEMPTS")
+    pass_score: int = Field(default=60, env="PASS_SCORE")
+    # SQLite file of completed interviews' score cards (python -m back_end.results); unset disables it.
+    results_db_path: Optional[str] = Field(default="results.db", env="RESULTS_DB_PATH")
+    # JSONL log of portal feedback, with its rating totals checkpointed beside it; unset disables it.
+    # Queued submissions are fsynced once this many are unsynced or the oldest has waited this long.
+    feedback_log_path: Optional[str] = Field(default="feedback.jsonl", env="FEEDBACK_LOG_PATH")
+    feedback_fsync_every: int = Field(default=50, env="FEEDBACK_FSYNC_EVERY")
+    feedback_fsync_seconds: float = Field(default=2.0, env="FEEDBACK_FSYNC_SECONDS")
+    # Pre-generated hiring questions (python -m back_end.questions build); skipped if the file is missing.
+    question_bank_path: Optional[str] = Field(default="question_bank.json", env="QUESTION_BANK_PATH")
+    # Stages rendered locally from Templates scripts without an LLM call.
+    scripted_stages: List[str] = Field(default=[], env="SCRIPTED_STAGES")
+    # Trace export: any of "jsonl", "sqlite", "langsmith" (LANGSMITH_TRACING also enables "langsmith").
+    trace_sinks: List[str] = Field(default=[], env="TRACE_SINKS")
+    trace_jsonl_path: str = Field(default="traces.jsonl", env="TRACE_JSONL_PATH")
+    trace_db_path: str = Field(default="traces.db", env="TRACE_DB_PATH")
+    # Fraction of conversations exported; errored or slow traces are always exported.
+    trace_sample_rate: float = Field(default=1.0, env="TRACE_SAMPLE_RATE")
+    trace_slow_ms: float = Field(default=5000.0, env="TRACE_SLOW_MS")
+    trace_ring_size: int = Field(default=50, env="TRACE_RING_SIZE")
+    trace_queue_size: int = Field(default=10000, env="TRACE_QUEUE_SIZE")
+    log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    # Port for the Prometheus /metrics endpoint; unset disables it.
+    metrics_port: Optional[int] = Field(default=None, env="METRICS_PORT")
+    # Opt-in cache of temperature=0 stage responses: "memory", "disk" or unset.
+    response_cache: Optional[str] = Field(default=None, env="RESPONSE_CACHE")
+    response_cache_stages: List[str] = Field(default=["greeting", "info", "tech_stack"], env="RESPONSE_CACHE_STAGES")
+    response_cache_size: int = Field(default=10000, env="RESPONSE_CACHE_SIZE")
+    response_cache_path: str = Field(default="response_cache.db", env="RESPONSE_CACHE_PATH")
+    # Interview service the Streamlit portal talks to (``uvicorn back_end.api:app``).
+    api_url: str = Field(default="http://127.0.0.1:8000", env="API_URL")
+    api_timeout_seconds: float = Field(default=120.0, env="API_TIMEOUT_SECONDS")
+    # Chat messages the exam portal renders at once; older ones are a click away.
+    portal_message_window: int = Field(default=20, env="PORTAL_MESSAGE_WINDOW")
+    # Worker processes behind the service, each owning a hash slice of conversations; 0 runs in-process.
+    api_workers: int = Field(default=0, env="API_WORKERS")
+    # Model, output-token budget and timeout (seconds) per stage and background
+    # job; see back_end/models.py. Uses that share a model share its client.
+    llm_routes: Dict[str, Dict[str, Any]] = Field(
+        default={
+            "greeting": {"model": "llama3-8b-8192", "max_tokens": 256, "timeout": 15},
+            "info": {"model": "llama3-8b-8192", "max_tokens": 512, "timeout": 20},
+            "tech_stack": {"model": "llama3-8b-8192", "max_tokens": 512, "timeout": 20},
+            "hiring": {"model": "llama3-70b-8192", "max_tokens": 1024, "timeout": 60},
+            "summary": {"model": "llama3-8b-8192", "max_tokens": 512, "timeout": 30},
+            "evaluation": {"model": "llama3-70b-8192", "max_tokens": 256, "timeout": 30},
+            "rescore": {"model": "llama3-70b-8192", "max_tokens": 1024, "timeout": 120},
+            "question_generation": {"model": "llama3-70b-8192", "max_tokens": 4096, "timeout": 120},
+        },
+        env="LLM_ROUTES",
+    )
+    # Provider limits enforced by the LLM scheduler, per model (Groq's depend
+    # on the model and account tier, e.g. 30 requests and 6000 tokens per
+    # minute on the free tier); unset means unlimited.
+    llm_requests_per_minute: Optional[float] = Field(default=None, env="LLM_REQUESTS_PER_MINUTE")
+    llm_tokens_per_minute: Optional[float] = Field(default=None, env="LLM_TOKENS_PER_MINUTE")
+    llm_max_concurrency: int = Field(default=64, env="LLM_MAX_CONCURRENCY")
+    llm_max_retries: int = Field(default=3, env="LLM_MAX_RETRIES")
+    # New interviews are turned away when the estimated wait for an LLM slot exceeds this.
+    admission_max_wait_seconds: float = Field(default=30.0, env="ADMISSION_MAX_WAIT_SECONDS")
+    scheduler_max_queue: int = Field(default=1000, env="SCHEDULER_MAX_QUEUE")
+    # One keep-alive connection pool to the provider per process (per event
+    # loop for async calls), shared by every model client; see
+    # back_end/connections.py. Keep it at or above the concurrent LLM calls
+    # a process makes, or calls queue for a connection.
+    llm_base_url: str = Field(default="https://api.groq.com", env="LLM_BASE_URL")
+    llm_pool_size: int = Field(default=100, env="LLM_POOL_SIZE")
+    llm_keepalive_seconds: float = Field(default=120.0, env="LLM_KEEPALIVE_SECONDS")
+    # Connections opened at startup so the first candidate skips the TLS handshake; 0 disables.
+    llm_warmup_connections: int = Field(default=4, env="LLM_WARMUP_CONNECTIONS")
 
     class Config:
         env_file = "../.env"
         env_file_encoding = "utf-8"
 
-try:
-    settings = Settings()
-except ValidationError as e:
-    print("❌ Environment configuration is invalid:")
-    print(e.json(indent=2))
-    raise SystemExit(1)
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Validate the environment on first use and return the same ``Settings`` afterwards."""
+    try:
+        return Settings()
+    except ValidationError as e:
+        logger.error("Environment configuration is invalid:\n%s", e.json(indent=2))
+        raise
+
+
+def __getattr__(name: str):
+    # ``from back_end.config import settings`` validates at that import, as
+    # before. back_end modules call get_settings() where they use a value
+    # instead, so importing them needs no environment.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,168 @@
+"""
+Process-wide HTTP connection pools for the LLM provider. Every ``ChatGroq``
+client in the process, across stages, models and bots, sends through the same
+keep-alive pools, so a connection's TLS handshake is paid once and then
+reused. ``open_connections`` and ``aopen_connections`` open connections
+before the first candidate arrives, and ``pool_status`` reports how close
+the pools are to saturation.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_clients: Optional[Tuple[httpx.Client, httpx.AsyncClient]] = None
+_clients_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(max_connections=settings.llm_pool_size,
+                        max_keepalive_connections=settings.llm_pool_size,
+                        keepalive_expiry=settings.llm_keepalive_seconds)
+
+
+class _LoopTransport(httpx.AsyncBaseTransport):
+    """One pooled transport per event loop, since async connections cannot move between loops."""
+
+    def __init__(self, limits: httpx.Limits):
+        self._limits = limits
+        self._transports: Dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = {}
+        self._lock = threading.Lock()
+
+    def _current(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                # Connections of loops that have since closed are dead; drop them with their pools.
+                self._transports = {other: pooled for other, pooled in self._transports.items()
+                                    if not other.is_closed()}
+                transport = self._transports[loop] = httpx.AsyncHTTPTransport(limits=self._limits)
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._current().handle_async_request(request)
+
+    async def aclose(self):
+        # Only this loop's connections can be closed from here.
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    def pools(self) -> list:
+        with self._lock:
+            return [transport._pool for loop, transport in self._transports.items() if not loop.is_closed()]
+
+
+def http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """The shared sync and async clients, created on first use."""
+    global _clients
+    with _clients_lock:
+        if _clients is None:
+            limits = _limits()
+            _clients = (httpx.Client(transport=httpx.HTTPTransport(limits=limits), follow_redirects=True),
+                        httpx.AsyncClient(transport=_LoopTransport(limits), follow_redirects=True))
+        return _clients
+
+
+def close():
+    """Close the shared clients; the next ``http_clients`` call opens new pools."""
+    global _clients
+    with _clients_lock:
+        clients, _clients = _clients, None
+    if clients is not None:
+        # Async connections belong to their event loops and are dropped with them.
+        clients[0].close()
+
+
+def _probe_url() -> str:
+    return get_settings().llm_base_url.rstrip("/") + "/"
+
+
+def open_connections(connections: Optional[int] = None, timeout: float = 5.0) -> int:
+    """
+    Open up to ``connections`` keep-alive connections to the provider in the
+    sync pool, in parallel, and return how many requests got a response (of
+    any status). Failures are logged, not raised: warm-up is best effort.
+    """
+    connections = get_settings().llm_warmup_connections if connections is None else connections
+    if connections <= 0:
+        return 0
+    client, _ = http_clients()
+    started = time.perf_counter()
+
+    def probe(_):
+        try:
+            client.head(_probe_url(), timeout=timeout)
+            return True
+        except httpx.HTTPError as e:
+            logger.warning("Provider warm-up request failed: %r", e)
+            return False
+
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        opened = sum(pool.map(probe, range(connections)))
+    logger.info("Opened %d/%d provider connections in %.2fs", opened, connections, time.perf_counter() - started)
+    return opened
+
+
+async def aopen_connections(connections: Optional[int] = None, timeout: float = 5.0) -> int:
+    """``open_connections`` for the async pool of the running event loop."""
+    connections = get_settings().llm_warmup_connections if connections is None else connections
+    if connections <= 0:
+        return 0
+    _, client = http_clients()
+    started = time.perf_counter()
+
+    async def probe():
+        try:
+            await client.head(_probe_url(), timeout=timeout)
+            return True
+        except httpx.HTTPError as e:
+            logger.warning("Provider warm-up request failed: %r", e)
+            return False
+
+    opened = sum(await asyncio.gather(*(probe() for _ in range(connections))))
+    logger.info("Opened %d/%d provider connections in %.2fs", opened, connections, time.perf_counter() - started)
+    return opened
+
+
+def _pool_stats(pools) -> dict:
+    connections = active = queued = 0
+    for pool in pools:
+        pool_connections = list(pool.connections)
+        connections += len(pool_connections)
+        active += sum(1 for connection in pool_connections if not connection.is_idle())
+        queued += sum(1 for request in list(pool._requests) if request.is_queued())
+    return {"connections": connections, "active": active, "idle": connections - active, "queued": queued}
+
+
+def pool_status() -> dict:
+    """
+    Connection counts of the shared pools. ``saturation`` is the busiest
+    pool's share of ``max_connections`` in use; requests are ``queued`` only
+    once a pool is full.
+    """
+    settings = get_settings()
+    with _clients_lock:
+        clients = _clients
+    if clients is None:
+        return {"max_connections": settings.llm_pool_size, "sync": None, "async": None, "saturation": 0.0,
+                "saturated": False}
+    client, async_client = clients
+    sync = _pool_stats([client._transport._pool])
+    loop_pools = async_client._transport.pools()
+    async_ = _pool_stats(loop_pools)
+    busiest = max([sync["active"]] + [_pool_stats([pool])["active"] for pool in loop_pools])
+    return {"max_connections": settings.llm_pool_size, "sync": sync, "async": {**async_, "loops": len(loop_pools)},
+            "saturation": round(busiest / settings.llm_pool_size, 3),
+            "saturated": busiest >= settings.llm_pool_size or sync["queued"] + async_["queued"] > 0}
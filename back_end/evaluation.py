@@ -0,0 +1,118 @@
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from .metrics import EVALUATIONS, EVALUATION_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def extract_json(text: str) -> Dict[str, Any]:
+    """The JSON object in an LLM reply, ignoring any text around it."""
+    match = _JSON_OBJECT.search(text)
+    if match is None:
+        raise ValueError("No JSON object in evaluation")
+    return json.loads(match.group(0))
+
+
+class AnswerEvaluator:
+    """
+    Scores each hiring-stage answer in a background pool as soon as it
+    arrives, so the candidate's turn only generates the next question.
+    Results accumulate in the conversation's ``evaluations`` map, keyed by
+    question number. ``on_result(conversation_id, conv)`` runs after each one.
+    A failed evaluation, including a reply without usable JSON, is retried
+    up to ``attempts`` times in all before the answer is marked "error".
+    """
+
+    def __init__(self, llm, template: str, max_workers: int = 2, on_result=None, attempts: int = 3,
+                 retry_delay: float = 1.0):
+        self._chain = ChatPromptTemplate.from_template(template) | llm
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="answer-eval")
+        self._on_result = on_result
+        self._attempts = max(1, attempts)
+        self._retry_delay = retry_delay
+        # (conversation_id, number) of evaluations queued or running in this process.
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def submit(self, conversation_id: str, conv, number: int, question: str, answer: str):
+        # The question and answer stay on the pending record, so it can be resubmitted after a restart.
+        conv.evaluations[number] = {"number": number, "question": question, "answer": answer, "status": "pending"}
+        with self._lock:
+            self._running.add((conversation_id, number))
+        self._executor.submit(self._evaluate, conversation_id, conv, number, question, answer)
+
+    def resume(self, conversation_id: str, conv) -> int:
+        """
+        Resubmit answers left "pending" by an earlier process, or marked
+        "error" once their attempts ran out. Returns how many were submitted.
+        """
+        records = [record for record in list(conv.evaluations.values())
+                   if record["status"] in ("pending", "error") and "answer" in record]
+        with self._lock:
+            records = [record for record in records if (conversation_id, record["number"]) not in self._running]
+        for record in records:
+            self.submit(conversation_id, conv, record["number"], record["question"], record["answer"])
+        return len(records)
+
+    def _evaluate(self, conversation_id, conv, number, question, answer):
+        record = {"number": number, "question": question, "answer": answer}
+        started = time.perf_counter()
+        for attempt in range(1, self._attempts + 1):
+            try:
+                message = self._chain.invoke({"question": question, "answer": answer})
+                result = extract_json(message.content)
+                if result.get("skip"):
+                    record["status"] = "skipped"
+                else:
+                    record.update(status="scored", mark=int(result["mark"]), correct=bool(result.get("correct")),
+                                  feedback=result.get("feedback", ""))
+                break
+            except Exception as e:
+                logger.warning("Evaluating answer %d of %s failed (attempt %d of %d): %r",
+                               number, conversation_id, attempt, self._attempts, e)
+                record.update(status="error", error=repr(e))
+                if attempt < self._attempts:
+                    time.sleep(self._retry_delay * 2 ** (attempt - 1))
+        if record["status"] != "error":
+            record.pop("error", None)
+        EVALUATION_SECONDS.observe(time.perf_counter() - started)
+        EVALUATIONS.inc(status=record["status"])
+        conv.evaluations[number] = record
+        with self._lock:
+            self._running.discard((conversation_id, number))
+        if self._on_result is not None:
+            self._on_result(conversation_id, conv)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+def score_card(evaluations: Dict[int, Dict[str, Any]], pass_score: int) -> Dict[str, Any]:
+    """Aggregate per-question results into the score card's numbers."""
+    evaluations = dict(evaluations)
+    questions = [evaluations[number] for number in sorted(evaluations)]
+    scored = [q for q in questions if q["status"] == "scored"]
+    failed = sum(q["status"] == "error" for q in questions)
+    score = round(sum(q["mark"] for q in scored) / (10 * len(scored)) * 100) if scored else 0
+    return {
+        "questions": [q for q in questions if q["status"] != "skipped"],
+        "pending": sum(q["status"] == "pending" for q in questions),
+        "failed": failed,
+        "total_questions": len(scored),
+        "correct_answers": sum(q["correct"] for q in scored),
+        "score": score,
+        "pass_score": pass_score,
+        # An answer that could not be scored leaves the result open rather than counting against it.
+        "result": "Incomplete" if failed else "Pass" if scored and score >= pass_score else "Fail",
+        "feedback": "\n".join(f"Q{q['number']}: {q['feedback']}" for q in scored if q.get("feedback")),
+    }
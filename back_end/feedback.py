@@ -0,0 +1,261 @@
+"""
+Candidate feedback from the portal's feedback page.
+
+``FeedbackSink.submit`` only queues a submission and adds its rating to the
+running totals, so the page never waits on the disk. A background worker
+appends queued submissions to a JSONL log and fsyncs it once
+``fsync_every`` submissions are unsynced or ``fsync_seconds`` have passed.
+After each fsync the totals are checkpointed beside the log, so the
+per-type and per-stage summary survives restarts without rereading every
+submission.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .metrics import FEEDBACK_FSYNC_SECONDS, FEEDBACK_SUBMISSIONS
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_TYPES = ("General", "Bug Report", "Feature Request", "Other")
+RATINGS = range(1, 6)
+# Queued by close(): sync what is outstanding, then stop the worker.
+_STOP = object()
+
+
+class RatingStats:
+    """Histogram of the 1-5 ratings in one group of submissions."""
+
+    __slots__ = ("histogram",)
+
+    def __init__(self, histogram: Optional[List[int]] = None):
+        self.histogram = list(histogram) if histogram else [0] * len(RATINGS)
+
+    def add(self, rating: int):
+        self.histogram[rating - RATINGS[0]] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        count = sum(self.histogram)
+        total = sum(rating * n for rating, n in zip(RATINGS, self.histogram))
+        return {"count": count, "average": round(total / count, 2) if count else None,
+                "ratings": {str(rating): n for rating, n in zip(RATINGS, self.histogram)}}
+
+
+class FeedbackTotals:
+    """Running rating totals overall, by feedback type and by interview stage."""
+
+    def __init__(self):
+        self.overall = RatingStats()
+        self.by_type: Dict[str, RatingStats] = {}
+        self.by_stage: Dict[str, RatingStats] = {}
+
+    def add(self, record: Dict[str, Any]):
+        rating = record["rating"]
+        self.overall.add(rating)
+        self.by_type.setdefault(record["type"], RatingStats()).add(rating)
+        self.by_stage.setdefault(record["stage"], RatingStats()).add(rating)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"submissions": sum(self.overall.histogram), "overall": self.overall.as_dict(),
+                "by_type": {name: stats.as_dict() for name, stats in sorted(self.by_type.items())},
+                "by_stage": {name: stats.as_dict() for name, stats in sorted(self.by_stage.items())}}
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"overall": self.overall.histogram,
+                "by_type": {name: stats.histogram for name, stats in self.by_type.items()},
+                "by_stage": {name: stats.histogram for name, stats in self.by_stage.items()}}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "FeedbackTotals":
+        totals = cls()
+        totals.overall = RatingStats(data["overall"])
+        totals.by_type = {name: RatingStats(histogram) for name, histogram in data["by_type"].items()}
+        totals.by_stage = {name: RatingStats(histogram) for name, histogram in data["by_stage"].items()}
+        return totals
+
+    def copy(self) -> "FeedbackTotals":
+        return self.from_json(self.to_json())
+
+
+class FeedbackSink:
+    """
+    Write-behind feedback log. Submissions wait in a bounded queue; when it
+    is full they are dropped and counted rather than blocking the caller.
+    A crash loses at most the submissions not yet fsynced.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 50, fsync_seconds: float = 2.0, queue_size: int = 10000):
+        self.path = path
+        self.totals_path = path + ".totals.json"
+        self.fsync_every = fsync_every
+        self.fsync_seconds = fsync_seconds
+        self.dropped = 0
+        self.write_errors = 0
+        # Totals of fsynced submissions, checkpointed by the worker, and of every accepted one.
+        self._synced = self._recover()
+        self._totals = self._synced.copy()
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._drain, name="feedback-sink", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def _recover(self) -> FeedbackTotals:
+        # Start from the last checkpoint and replay only the log after it. A
+        # missing or unreadable checkpoint means one full pass over the log.
+        totals, offset = FeedbackTotals(), 0
+        try:
+            with open(self.totals_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            totals, offset = FeedbackTotals.from_json(checkpoint["totals"]), checkpoint["offset"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable feedback totals %s; rebuilding from the log", self.totals_path)
+        if not os.path.exists(self.path):
+            return FeedbackTotals()
+        with open(self.path, "rb+") as f:
+            if offset > f.seek(0, os.SEEK_END):
+                totals, offset = FeedbackTotals(), 0
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A crash can leave a partially written last line; cut it
+                    # off so new submissions start on a fresh line.
+                    f.truncate(offset)
+                    break
+                offset += len(line)
+                try:
+                    totals.add(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("Skipping malformed feedback line in %s: %r", self.path, line[:80])
+        return totals
+
+    def submit(self, rating: int, feedback_type: str = "General", stage: Optional[str] = None,
+               conversation_id: Optional[str] = None, name: str = "", email: str = "", comments: str = "") -> bool:
+        """Queue one submission; returns False if it was dropped because the queue is full."""
+        if rating not in RATINGS:
+            raise ValueError(f"rating must be between {RATINGS[0]} and {RATINGS[-1]}, not {rating!r}")
+        record = {"submitted_at": time.time(), "conversation_id": conversation_id, "stage": stage or "unknown",
+                  "type": feedback_type, "rating": rating, "name": name, "email": email, "comments": comments}
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            FEEDBACK_SUBMISSIONS.inc(result="dropped")
+            return False
+        with self._lock:
+            self._totals.add(record)
+        FEEDBACK_SUBMISSIONS.inc(result="queued")
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        """Rating counts and averages overall, by feedback type and by stage, including queued submissions."""
+        with self._lock:
+            summary = self._totals.as_dict()
+        return {**summary, "queued": self._queue.qsize(), "dropped": self.dropped}
+
+    def _drain(self):
+        # Append submissions as they arrive, but fsync (and checkpoint the
+        # totals) only once enough are unsynced or the oldest has waited
+        # fsync_seconds. Events queued by flush() force a sync.
+        unsynced: List[Dict[str, Any]] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            while batch and isinstance(batch[-1], dict) and len(batch) < self.fsync_every:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [item for item in batch if isinstance(item, dict)]
+            control = batch[-1] if batch and not isinstance(batch[-1], dict) else None
+            if records and self._write(records):
+                if not unsynced:
+                    deadline = time.monotonic() + self.fsync_seconds
+                unsynced.extend(records)
+            due = deadline is not None and time.monotonic() >= deadline
+            if unsynced and (control is not None or due or len(unsynced) >= self.fsync_every):
+                if self._sync(unsynced):
+                    unsynced, deadline = [], None
+                else:
+                    # Keep them unsynced; the next fsync covers them too.
+                    deadline = time.monotonic() + self.fsync_seconds
+            for _ in batch:
+                self._queue.task_done()
+            if control is _STOP:
+                return
+            if control is not None:
+                control.set()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        """Append a batch to the log; on failure it is dropped and the log cut back to where it started."""
+        start = self._file.tell()
+        try:
+            self._file.write(b"".join(json.dumps(record).encode("utf-8") + b"\n" for record in batch))
+            self._file.flush()
+            return True
+        except OSError:
+            self.write_errors += 1
+            logger.exception("Appending %d feedback submissions to %s failed", len(batch), self.path)
+        try:
+            self._file.truncate(start)
+        except OSError:
+            logger.exception("Cutting %s back to %d bytes failed", self.path, start)
+        return False
+
+    def _sync(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Fsync the log and add ``records``, every submission written since the
+        last successful fsync, to the synced totals. Returns False if the
+        fsync failed, leaving them to the next one.
+        """
+        started = time.perf_counter()
+        try:
+            os.fsync(self._file.fileno())
+        except OSError:
+            self.write_errors += 1
+            logger.exception("Syncing %s failed", self.path)
+            return False
+        for record in records:
+            self._synced.add(record)
+        # Written to a temporary file and renamed, so a crash leaves either
+        # checkpoint intact. A failed checkpoint only means a longer replay
+        # of the log on the next start.
+        temporary = self.totals_path + ".tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump({"offset": self._file.tell(), "totals": self._synced.to_json()}, f)
+            os.replace(temporary, self.totals_path)
+        except OSError:
+            self.write_errors += 1
+            logger.exception("Checkpointing feedback totals to %s failed", self.totals_path)
+        FEEDBACK_FSYNC_SECONDS.observe(time.perf_counter() - started)
+        return True
+
+    def flush(self):
+        """Block until every queued submission is written and fsynced."""
+        if self._worker is not None:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+
+    def close(self):
+        """Write and fsync outstanding submissions, then stop the worker."""
+        if self._worker is None:
+            return
+        worker, self._worker = self._worker, None
+        self._queue.put(_STOP)
+        worker.join()
+        self._file.close()
+
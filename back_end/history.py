@@ -0,0 +1,82 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from langchain_core.messages import SystemMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for budgeting prompts."""
+    return len(text) // 4 + 1
+
+
+class HistoryManager:
+    """
+    Packs the most recent messages of a conversation into a per-stage token
+    budget. Messages that fall out of the window are folded into a rolling
+    summary by a background worker, so each turn only pays for the budget
+    and never waits on summarization. ``on_summary(conversation_id, conv)``
+    runs after each update.
+    """
+
+    def __init__(self, llm, summary_template: str, budgets: Dict[str, int], max_workers: int = 2,
+                 on_summary=None):
+        self.budgets = budgets
+        self._on_summary = on_summary
+        self._summarizer = ChatPromptTemplate.from_template(summary_template) | llm | StrOutputParser()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="history-summary")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def window(self, conversation_id: str, conv, stage: str) -> List:
+        """Messages to send for ``stage``: the rolling summary plus the newest messages that fit."""
+        transcript = conv.transcript
+        budget = self.budgets.get(stage, self.budgets.get("default", 1024))
+        summary, summarized = conv.summary
+
+        start = len(transcript)
+        used = estimate_tokens(summary) if summary else 0
+        while start > summarized:
+            cost = estimate_tokens(transcript.text(start - 1))
+            if used + cost > budget:
+                break
+            used += cost
+            start -= 1
+
+        if start > summarized:
+            self._schedule(conversation_id, conv, start)
+
+        window = transcript.messages(start)
+        if summary:
+            window = [SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"), *window]
+        return window
+
+    def _schedule(self, conversation_id, conv, upto):
+        with self._lock:
+            if conversation_id in self._pending:
+                return
+            self._pending.add(conversation_id)
+        self._executor.submit(self._summarize, conversation_id, conv, upto)
+
+    def _summarize(self, conversation_id, conv, upto):
+        try:
+            summary, summarized = conv.summary
+            transcript = "\n".join(f"{kind}: {text}" for kind, text in conv.transcript.pairs(summarized, upto))
+            updated = self._summarizer.invoke({"summary": summary or "(none)", "transcript": transcript})
+            # Single assignment so readers never see a summary/offset mismatch.
+            conv.summary = (updated, upto)
+            if self._on_summary is not None:
+                self._on_summary(conversation_id, conv)
+        except Exception:
+            logger.exception("[%s] History summarization failed", conversation_id)
+        finally:
+            with self._lock:
+                self._pending.discard(conversation_id)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
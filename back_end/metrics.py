@@ -0,0 +1,166 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_str(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TURN_SECONDS = REGISTRY.histogram(
+    "hiringbot_turn_seconds", "End-to-end process_message latency.", ["stage"])
+PHASE_SECONDS = REGISTRY.histogram(
+    "hiringbot_phase_seconds", "Time spent per phase of a stage (prompt, llm, trace).", ["stage", "phase"])
+TTFT_SECONDS = REGISTRY.histogram(
+    "hiringbot_time_to_first_token_seconds", "Time from LLM call to the first response token.", ["stage"])
+INPUT_TOKENS = REGISTRY.counter(
+    "hiringbot_input_tokens_total", "Prompt tokens sent to the LLM.", ["stage"])
+OUTPUT_TOKENS = REGISTRY.counter(
+    "hiringbot_output_tokens_total", "Completion tokens received from the LLM.", ["stage"])
+CACHE_REQUESTS = REGISTRY.counter(
+    "hiringbot_cache_requests_total", "Response cache lookups.", ["stage", "result"])
+QUESTION_BANK_REQUESTS = REGISTRY.counter(
+    "hiringbot_question_bank_requests_total", "Hiring questions served from the bank (hit) or generated live (miss).",
+    ["result"])
+ERRORS = REGISTRY.counter(
+    "hiringbot_errors_total", "Failed stage turns.", ["stage"])
+EVALUATIONS = REGISTRY.counter(
+    "hiringbot_answer_evaluations_total", "Background answer evaluations by outcome.", ["status"])
+EVALUATION_SECONDS = REGISTRY.histogram(
+    "hiringbot_answer_evaluation_seconds", "Time to score one answer in the background.")
+UI_RENDER_SECONDS = REGISTRY.histogram(
+    "hiringbot_ui_render_seconds", "Streamlit script run time per page.", ["page"])
+SCHEDULER_WAIT_SECONDS = REGISTRY.histogram(
+    "hiringbot_llm_scheduler_wait_seconds", "Time LLM calls wait in the scheduler queue.", ["priority"])
+LLM_RETRIES = REGISTRY.counter(
+    "hiringbot_llm_retries_total", "LLM calls retried after a transient provider error.", ["stage"])
+ADMISSIONS = REGISTRY.counter(
+    "hiringbot_admissions_total", "New interviews admitted, queued behind others, or shed.", ["result"])
+FEEDBACK_SUBMISSIONS = REGISTRY.counter(
+    "hiringbot_feedback_submissions_total", "Portal feedback submissions queued for the log, or dropped.", ["result"])
+FEEDBACK_FSYNC_SECONDS = REGISTRY.histogram(
+    "hiringbot_feedback_fsync_seconds", "Time to fsync the feedback log and checkpoint its totals.")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` from a daemon thread."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,90 @@
+"""
+Per-use model routing. ``Settings.llm_routes`` maps each graph stage and
+background job to a model, an output-token budget and a request timeout.
+Uses that name the same model share one client and one rate-limit
+scheduler, since provider limits apply per model.
+"""
+import logging
+from typing import Callable, Dict, Optional
+
+from langchain_core.language_models import BaseChatModel
+
+from .config import get_settings
+from .scheduler import LLMScheduler, ScheduledLLM
+
+logger = logging.getLogger(__name__)
+
+# Used for any use missing from LLM_ROUTES.
+DEFAULT_ROUTE = {"model": "llama3-70b-8192", "max_tokens": 1024, "timeout": 60.0}
+
+
+def llm_route(use: str, routes: Optional[Dict[str, dict]] = None) -> dict:
+    routes = get_settings().llm_routes if routes is None else routes
+    return {**DEFAULT_ROUTE, **routes.get(use, {})}
+
+
+def groq_client(model: str, temperature: float = 0, **params):
+    from langchain_groq import ChatGroq
+
+    from .connections import http_clients
+    settings = get_settings()
+    http_client, http_async_client = http_clients()
+    return ChatGroq(api_key=settings.GROQ_API.get_secret_value(), model=model, temperature=temperature,
+                    base_url=settings.llm_base_url, http_client=http_client, http_async_client=http_async_client,
+                    **params)
+
+
+class ModelRouter:
+    """
+    Hands out the LLM for each use: the shared, scheduled client for its
+    model, bound to the route's ``max_tokens`` and ``timeout``.
+    ``client_factory`` builds the raw chat model for a model name.
+    """
+
+    def __init__(self, routes: Optional[Dict[str, dict]] = None, client_factory: Callable = groq_client,
+                 share: int = 1):
+        self.routes = get_settings().llm_routes if routes is None else routes
+        self.client_factory = client_factory
+        # Provider limits are per account, so worker processes each enforce a share.
+        self.share = max(share, 1)
+        self.clients: Dict[str, ScheduledLLM] = {}
+        self.schedulers: Dict[str, LLMScheduler] = {}
+
+    def _client(self, model: str) -> ScheduledLLM:
+        settings = get_settings()
+        client = self.clients.get(model)
+        if client is None:
+            rpm, tpm = settings.llm_requests_per_minute, settings.llm_tokens_per_minute
+            scheduler = self.schedulers[model] = LLMScheduler(
+                requests_per_minute=rpm and rpm / self.share,
+                tokens_per_minute=tpm and tpm / self.share,
+                max_concurrency=settings.llm_max_concurrency,
+                max_queue=settings.scheduler_max_queue,
+                max_wait_seconds=settings.admission_max_wait_seconds,
+            )
+            client = self.clients[model] = ScheduledLLM(self.client_factory(model), scheduler,
+                                                        max_retries=settings.llm_max_retries)
+            logger.info("Created LLM client for %s", model)
+        return client
+
+    def route(self, use: str) -> dict:
+        return llm_route(use, self.routes)
+
+    def model(self, use: str) -> str:
+        return self.route(use)["model"]
+
+    def llm(self, use: str):
+        route = self.route(use)
+        client = self._client(route["model"])
+        # Plain runnables standing in for a chat model take no call options.
+        if not isinstance(client.llm, BaseChatModel):
+            return client
+        return client.bind(max_tokens=route["max_tokens"], timeout=route["timeout"])
+
+    def scheduler(self, use: str) -> LLMScheduler:
+        self._client(self.model(use))
+        return self.schedulers[self.model(use)]
+
+    def close(self):
+        for scheduler in self.schedulers.values():
+            scheduler.close()
@@ -0,0 +1,218 @@
+"""
+Pre-generated hiring questions, indexed by technology, question type and difficulty.
+
+    python -m back_end.questions build python django docker java spring --per-slot 8 \\
+        --output question_bank.json --concurrency 8
+    python -m back_end.questions stats question_bank.json
+
+``build`` only generates slots that are short of ``--per-slot`` valid
+questions, so rerunning it extends an existing bank or resumes an
+interrupted build.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .templates import Templates
+
+logger = logging.getLogger(__name__)
+
+# (question type, difficulty) for each of the interview's four questions.
+QUESTION_PLAN = [("mcq", "easy"), ("mcq", "medium"), ("code_fix", "medium"), ("descriptive", "hard")]
+QUESTION_TYPES = ("mcq", "code_fix", "descriptive")
+DIFFICULTIES = ("easy", "medium", "hard")
+_TYPE_LABELS = {"mcq": "Multiple Choice", "code_fix": "Code Fix", "descriptive": "Descriptive"}
+
+_ALIASES = {
+    "js": "javascript", "ts": "typescript", "node": "nodejs", "node.js": "nodejs", "react.js": "react",
+    "reactjs": "react", "postgres": "postgresql", "k8s": "kubernetes", "golang": "go",
+    "spring boot": "spring", "springboot": "spring", "c sharp": "c#", "mongo": "mongodb",
+}
+_STACK_SEPARATORS = re.compile(r",|;|/|\n|\band\b|&|\|")
+_MCQ_OPTIONS = re.compile(r"^\s*[A-D]\)", re.MULTILINE)
+
+
+def normalize_tech(name: str) -> str:
+    name = " ".join(name.lower().strip(" .:-*").split())
+    return _ALIASES.get(name, name)
+
+
+def extract_stack(text: str) -> List[str]:
+    """Normalized technologies from a candidate's free-text tech stack reply, in the order given."""
+    techs = []
+    for part in _STACK_SEPARATORS.split(text):
+        tech = normalize_tech(part)
+        if tech and tech not in techs:
+            techs.append(tech)
+    return techs
+
+
+def validate_question(text: str, question_type: str) -> bool:
+    text = text.strip()
+    if not 20 <= len(text) <= 2000:
+        return False
+    if question_type == "mcq":
+        return len(_MCQ_OPTIONS.findall(text)) == 4
+    if question_type == "code_fix":
+        return text.count("```") >= 2
+    return True
+
+
+def _json_array(text: str) -> list:
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        raise ValueError("No JSON array in reply")
+    return json.loads(text[start:end + 1])
+
+
+def _slot(technology: str, question_type: str, difficulty: str) -> str:
+    return f"{technology}|{question_type}|{difficulty}"
+
+
+class QuestionBank:
+    """
+    In-memory question index loaded from a single JSON file mapping
+    ``"technology|type|difficulty"`` to a list of question texts.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, List[str]]] = None):
+        self.entries: Dict[str, List[str]] = entries or {}
+        self.technologies = {key.split("|", 1)[0] for key in self.entries}
+
+    @classmethod
+    def load(cls, path: str) -> "QuestionBank":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["entries"])
+
+    def save(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def add(self, technology: str, question_type: str, difficulty: str, questions: Iterable[str]) -> int:
+        existing = self.entries.setdefault(_slot(technology, question_type, difficulty), [])
+        seen = {" ".join(q.lower().split()) for q in existing}
+        added = 0
+        for question in questions:
+            key = " ".join(question.lower().split())
+            if key not in seen and validate_question(question, question_type):
+                existing.append(question.strip())
+                seen.add(key)
+                added += 1
+        self.technologies.add(technology)
+        return added
+
+    def count(self, technology: str, question_type: str, difficulty: str) -> int:
+        return len(self.entries.get(_slot(technology, question_type, difficulty), ()))
+
+    def select(self, conversation_id: str, stack_text: str, number: int, asked: Iterable[str]) -> Optional[str]:
+        """
+        Question ``number`` (1-based) for a candidate, formatted for the chat,
+        or None on a miss. Technologies are rotated across questions, and any
+        question text already present in ``asked`` is skipped.
+        """
+        if number > len(QUESTION_PLAN):
+            return None
+        question_type, difficulty = QUESTION_PLAN[number - 1]
+        techs = [tech for tech in extract_stack(stack_text) if tech in self.technologies]
+        if not techs:
+            return None
+        asked = list(asked)
+        offset = zlib.crc32(conversation_id.encode())
+        for i in range(len(techs)):
+            tech = techs[(number - 1 + i) % len(techs)]
+            candidates = self.entries.get(_slot(tech, question_type, difficulty), ())
+            for j in range(len(candidates)):
+                question = candidates[(offset + j) % len(candidates)]
+                if not any(question in text for text in asked):
+                    return (f"Question {number} of {len(QUESTION_PLAN)} "
+                            f"({difficulty.title()}, {_TYPE_LABELS[question_type]} on {tech}):\n\n{question}")
+        return None
+
+
+async def _generate_slot(chain, bank: QuestionBank, slot: Tuple[str, str, str], per_slot: int,
+                         limit: asyncio.Semaphore, attempts: int = 3) -> int:
+    technology, question_type, difficulty = slot
+    added = 0
+    for _ in range(attempts):
+        missing = per_slot - bank.count(*slot)
+        if missing <= 0:
+            break
+        async with limit:
+            try:
+                message = await chain.ainvoke({"count": missing, "technology": technology,
+                                               "question_type": question_type, "difficulty": difficulty})
+                questions = _json_array(message.content)
+            except Exception as e:
+                logger.warning("Generating %s failed: %r", _slot(*slot), e)
+                continue
+        added += bank.add(technology, question_type, difficulty, [q for q in questions if isinstance(q, str)])
+    return added
+
+
+def plan_slots(technologies: List[str]) -> List[Tuple[str, str, str]]:
+    return [(normalize_tech(tech), question_type, difficulty) for tech in technologies
+            for question_type in QUESTION_TYPES for difficulty in DIFFICULTIES]
+
+
+async def build(llm, bank: QuestionBank, technologies: List[str], per_slot: int, concurrency: int,
+                output: Optional[str] = None) -> int:
+    """Fill every (technology, type, difficulty) slot up to ``per_slot`` validated questions."""
+    from langchain_core.prompts import ChatPromptTemplate
+    chain = ChatPromptTemplate.from_template(Templates().question_generation_prompt) | llm
+    limit = asyncio.Semaphore(concurrency)
+    added = 0
+    tasks = [asyncio.ensure_future(_generate_slot(chain, bank, slot, per_slot, limit))
+             for slot in plan_slots(technologies)]
+    for done, task in enumerate(asyncio.as_completed(tasks), 1):
+        added += await task
+        # Checkpoint periodically so an interrupted build keeps its progress.
+        if output and done % 10 == 0:
+            bank.save(output)
+    if output:
+        bank.save(output)
+    return added
+
+
+def _default_llm():
+    from .models import groq_client, llm_route
+    route = llm_route("question_generation")
+    return groq_client(route["model"], max_tokens=route["max_tokens"], timeout=route["timeout"], temperature=0.7)
+
+
+def main(argv: Optional[List[str]] = None, llm=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_parser = sub.add_parser("build", help="generate and validate questions")
+    build_parser.add_argument("technologies", nargs="+")
+    build_parser.add_argument("--output", default="question_bank.json")
+    build_parser.add_argument("--per-slot", type=int, default=8)
+    build_parser.add_argument("--concurrency", type=int, default=8)
+    stats_parser = sub.add_parser("stats", help="count questions per slot")
+    stats_parser.add_argument("path")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "stats":
+        bank = QuestionBank.load(args.path)
+        for key in sorted(bank.entries):
+            print(f"{key:<40}{len(bank.entries[key]):>6}")
+        return 0
+
+    bank = QuestionBank.load(args.output) if os.path.exists(args.output) else QuestionBank()
+    added = asyncio.run(build(llm or _default_llm(), bank, args.technologies, args.per_slot,
+                              args.concurrency, args.output))
+    short = [slot for slot in plan_slots(args.technologies) if bank.count(*slot) < args.per_slot]
+    print(f"Added {added} questions; {len(short)} slot(s) still short of {args.per_slot}")
+    return 1 if short else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
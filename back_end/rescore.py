@@ -0,0 +1,215 @@
+"""
+Bulk re-evaluation of archived interview transcripts against the current rubric.
+
+    python -m back_end.rescore exports/ archive.jsonl --output rescored.jsonl --concurrency 32
+
+Inputs are the exam portal's "Export Chat" text files (or directories of
+them) and JSONL files with one ``{"conversation_id", "candidate_name",
+"messages": [{"role", "content"}]}`` object per line. Transcripts are read
+lazily and at most ``--concurrency`` are in flight, so memory stays flat
+however large the corpus.
+
+Every result is appended to ``--output`` as soon as it arrives, tagged with
+the rubric version. Rerunning the same command resumes: transcripts already
+scored under the current rubric are skipped, failed ones are retried.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Set
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from .cache import template_version
+from .evaluation import extract_json
+from .templates import Templates
+
+logger = logging.getLogger(__name__)
+
+_ROLE_LINE = re.compile(r"^(User|Assistant): ", re.MULTILINE)
+
+
+def parse_exported_transcript(text: str) -> Dict:
+    """Inverse of ``front_end.transcript.export_transcript``."""
+    header, _, body = text.partition("=" * 50 + "\n")
+    fields = dict(line.split(": ", 1) for line in header.splitlines()[1:] if ": " in line)
+    name = header.splitlines()[0].partition(" - ")[2] if header else ""
+    parts = _ROLE_LINE.split(body)
+    # split() yields [preamble, role, content, role, content, ...]
+    messages = [{"role": role.lower(), "content": content.rstrip("\n")}
+                for role, content in zip(parts[1::2], parts[2::2])]
+    return {"conversation_id": fields.get("Session ID", ""), "candidate_name": name, "messages": messages}
+
+
+def iter_transcripts(paths: List[str]) -> Iterator[Dict]:
+    """Yield transcripts one at a time from export files, JSONL files and directories of either."""
+    for path in paths:
+        if os.path.isdir(path):
+            yield from iter_transcripts(sorted(os.path.join(path, name) for name in os.listdir(path)))
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    if line.strip():
+                        transcript = json.loads(line)
+                        transcript.setdefault("conversation_id", f"{os.path.basename(path)}:{line_no}")
+                        yield transcript
+        elif path.endswith(".txt"):
+            with open(path, encoding="utf-8") as f:
+                transcript = parse_exported_transcript(f.read())
+            transcript["conversation_id"] = transcript["conversation_id"] or os.path.basename(path)
+            yield transcript
+
+
+def format_transcript(messages: List[Dict]) -> str:
+    return "\n".join(f"{'Candidate' if m['role'] == 'user' else 'Assistant'}: {m['content']}" for m in messages)
+
+
+def parse_evaluation(text: str) -> Dict:
+    evaluation = extract_json(text)
+    if "score" not in evaluation:
+        raise ValueError("Evaluation has no score")
+    return evaluation
+
+
+class ResultLog:
+    """
+    Append-only JSONL results file that doubles as the resume checkpoint.
+    Only the ids already scored under ``rubric_version`` are kept in memory.
+    """
+
+    def __init__(self, path: str, rubric_version: str, fsync_every: int = 50):
+        self.path = path
+        self.rubric_version = rubric_version
+        self.fsync_every = fsync_every
+        self.done: Set[str] = set()
+        self._since_sync = 0
+        if os.path.exists(path):
+            self._recover()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _recover(self):
+        # A crash can leave a partially written last line; cut it off so new
+        # records start on a fresh line.
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("rubric_version") == self.rubric_version and not record.get("error"):
+                    self.done.add(record["conversation_id"])
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        if not record.get("error"):
+            self.done.add(record["conversation_id"])
+        self._since_sync += 1
+        if self._since_sync >= self.fsync_every:
+            os.fsync(self._file.fileno())
+            self._since_sync = 0
+
+    def close(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+class Rescorer:
+    """Scores transcripts with ``Templates.evaluation_prompt`` at bounded concurrency."""
+
+    def __init__(self, llm, concurrency: int = 16, retries: int = 3, backoff: float = 1.0):
+        template = Templates().evaluation_prompt
+        self.chain = ChatPromptTemplate.from_template(template) | llm
+        self.rubric_version = template_version(template)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+
+    async def evaluate(self, transcript: Dict) -> Dict:
+        record = {
+            "conversation_id": transcript["conversation_id"],
+            "candidate_name": transcript.get("candidate_name", ""),
+            "rubric_version": self.rubric_version,
+        }
+        inputs = {"transcript": format_transcript(transcript["messages"])}
+        for attempt in range(self.retries + 1):
+            try:
+                message = await self.chain.ainvoke(inputs)
+                record.update(parse_evaluation(message.content))
+                record.pop("error", None)
+                break
+            except Exception as e:
+                record["error"] = repr(e)
+                if attempt < self.retries:
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
+        record["evaluated_at"] = datetime.datetime.now().isoformat(timespec="seconds")
+        return record
+
+    async def run(self, transcripts: Iterator[Dict], log: ResultLog, progress_every: int = 100) -> Dict[str, int]:
+        counts = {"scored": 0, "failed": 0, "skipped": 0}
+        pending = set()
+        started = time.perf_counter()
+
+        def collect(done):
+            for task in done:
+                record = task.result()
+                log.write(record)
+                counts["failed" if record.get("error") else "scored"] += 1
+                finished = counts["scored"] + counts["failed"]
+                if finished % progress_every == 0:
+                    logger.info("%d transcripts evaluated (%.1f/s)", finished,
+                                finished / (time.perf_counter() - started))
+
+        for transcript in transcripts:
+            if transcript["conversation_id"] in log.done:
+                counts["skipped"] += 1
+                continue
+            if len(pending) >= self.concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+            pending.add(asyncio.ensure_future(self.evaluate(transcript)))
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            collect(done)
+        return counts
+
+
+def _default_llm():
+    from .models import groq_client, llm_route
+    route = llm_route("rescore")
+    return groq_client(route["model"], max_tokens=route["max_tokens"], timeout=route["timeout"])
+
+
+def main(argv: Optional[List[str]] = None, llm=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="export .txt files, .jsonl files or directories")
+    parser.add_argument("--output", required=True, help="results JSONL; also the resume checkpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    rescorer = Rescorer(llm or _default_llm(), concurrency=args.concurrency, retries=args.retries)
+    log = ResultLog(args.output, rescorer.rubric_version)
+    if log.done:
+        logger.info("Resuming: %d transcripts already scored under rubric %s", len(log.done), rescorer.rubric_version)
+    try:
+        counts = asyncio.run(rescorer.run(iter_transcripts(args.inputs), log))
+    finally:
+        log.close()
+    print(f"rubric {rescorer.rubric_version}: {counts['scored']} scored, {counts['failed']} failed, "
+          f"{counts['skipped']} already done")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""
+Results of completed interviews for HR: one row per candidate and one per
+question, in an indexed SQLite file shared by every worker.
+
+    python -m back_end.results export drive.parquet --since 2026-10-01 --position "Backend Developer"
+    python -m back_end.results list --tech python --result pass
+
+Candidates can be queried by completion date, position, technology and
+result. Exports stream CSV or Parquet in batches, so memory stays flat
+however many candidates a drive has.
+"""
+import argparse
+import csv
+import datetime
+import io
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .questions import extract_stack, normalize_tech
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"^\+?[\d\s()-]{7,}$")
+_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+_LABEL = re.compile(r"^\s*(?:\d+\s*[.)]\s*)?([a-z ]+?)\s*[:=-]\s*(.+)$", re.IGNORECASE)
+_FIELD_SEPARATORS = re.compile(r",|;|\n")
+
+# Column name -> type, in export order.
+CANDIDATE_COLUMNS = {
+    "conversation_id": "string", "completed_at": "timestamp", "candidate_name": "string", "email": "string",
+    "experience": "string", "position": "string", "location": "string", "tech_stack": "string",
+    "total_questions": "int", "correct_answers": "int", "score": "int", "pass_score": "int", "result": "string",
+}
+ANSWER_COLUMNS = {
+    "conversation_id": "string", "completed_at": "timestamp", "candidate_name": "string", "position": "string",
+    "number": "int", "status": "string", "mark": "int", "correct": "bool", "question": "string", "answer": "string",
+    "feedback": "string",
+}
+_ANSWER_FIELDS = ("number", "question", "answer", "status", "mark", "correct", "feedback")
+
+Timestamp = Union[datetime.datetime, datetime.date, float, None]
+
+
+def parse_details(text: str) -> Dict[str, str]:
+    """
+    Best-effort email, experience, position and location from the candidate's
+    reply to the details form. Labelled fields ("Position: ...") are used as
+    given; otherwise unlabelled fields are read in the form's order.
+    """
+    details = {"email": "", "experience": "", "position": "", "location": ""}
+    unlabelled = []
+    for field in (f.strip() for f in _FIELD_SEPARATORS.split(text or "")):
+        if not field:
+            continue
+        label = _LABEL.match(field)
+        key = label.group(1).lower() if label else ""
+        value = label.group(2).strip() if label else field
+        email = _EMAIL.search(field)
+        if email:
+            details["email"] = email.group(0)
+        elif "position" in key or "role" in key:
+            details["position"] = value
+        elif "location" in key or "city" in key:
+            details["location"] = value
+        elif "experience" in key or _YEARS.search(value):
+            years = _YEARS.search(value)
+            details["experience"] = f"{years.group(1)} years" if years else value
+        elif value.lower() in ("fresher", "experienced", "experienced professional"):
+            details["experience"] = details["experience"] or value.lower().split()[0]
+        elif not _PHONE.match(value) and "phone" not in key:
+            unlabelled.append(value)
+    for key in ("position", "location"):
+        if not details[key] and unlabelled:
+            details[key] = unlabelled.pop(0)
+    return details
+
+
+def _timestamp(value: Timestamp) -> Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    return value.timestamp()
+
+
+def _result(value: Optional[str]) -> Optional[str]:
+    return value.strip().title() if value else None
+
+
+class ResultsStore:
+    """
+    Completed interviews in SQLite (WAL mode, so worker processes and the
+    API can share the file). Writes go through one locked connection; each
+    export reads on its own connection so it never holds up recording.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                conversation_id TEXT PRIMARY KEY,
+                completed_at REAL NOT NULL,
+                candidate_name TEXT NOT NULL,
+                email TEXT NOT NULL,
+                experience TEXT NOT NULL,
+                position TEXT NOT NULL COLLATE NOCASE,
+                location TEXT NOT NULL,
+                tech_stack TEXT NOT NULL,
+                total_questions INTEGER NOT NULL,
+                correct_answers INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                pass_score INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                feedback TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS candidates_by_date ON candidates (completed_at);
+            CREATE INDEX IF NOT EXISTS candidates_by_position ON candidates (position, completed_at);
+            CREATE INDEX IF NOT EXISTS candidates_by_result ON candidates (result, completed_at);
+            CREATE TABLE IF NOT EXISTS candidate_skills (
+                skill TEXT NOT NULL,
+                conversation_id TEXT NOT NULL,
+                PRIMARY KEY (skill, conversation_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS answers (
+                conversation_id TEXT NOT NULL,
+                number INTEGER NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                status TEXT NOT NULL,
+                mark INTEGER,
+                correct INTEGER,
+                feedback TEXT NOT NULL,
+                PRIMARY KEY (conversation_id, number)
+            ) WITHOUT ROWID;
+        """)
+        self._db.commit()
+
+    def record(self, conversation_id: str, profile: Dict[str, str], card: Dict[str, Any],
+               completed_at: Optional[float] = None, replace: bool = False) -> bool:
+        """
+        Store a candidate's profile and score card (``evaluation.score_card``).
+        An existing record is kept unless ``replace`` or its result is
+        "Incomplete"; returns whether this call wrote.
+        """
+        row = (conversation_id, time.time() if completed_at is None else completed_at,
+               profile.get("candidate_name", ""), profile.get("email", ""), profile.get("experience", ""),
+               profile.get("position", ""), profile.get("location", ""), profile.get("tech_stack", ""),
+               card["total_questions"], card["correct_answers"], card["score"], card["pass_score"], card["result"],
+               card["feedback"])
+        answers = [(conversation_id, q["number"], q.get("question", ""), q.get("answer", ""), q["status"],
+                    q.get("mark"), q.get("correct"), q.get("feedback", "")) for q in card["questions"]]
+        skills = [(skill, conversation_id) for skill in extract_stack(profile.get("tech_stack", ""))]
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM candidates WHERE conversation_id = ? AND result = 'Incomplete'",
+                             (conversation_id,))
+            written = self._db.execute(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO candidates VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+            ).rowcount
+            if not written:
+                return False
+            self._db.execute("DELETE FROM answers WHERE conversation_id = ?", (conversation_id,))
+            self._db.execute("DELETE FROM candidate_skills WHERE conversation_id = ?", (conversation_id,))
+            self._db.executemany("INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?)", answers)
+            self._db.executemany("INSERT OR IGNORE INTO candidate_skills VALUES (?, ?)", skills)
+        return True
+
+    def has_final(self, conversation_id: str) -> bool:
+        """Whether the candidate is recorded with every answer scored (a result other than "Incomplete")."""
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM candidates WHERE conversation_id = ? AND result != 'Incomplete'",
+                                    (conversation_id,)).fetchone() is not None
+
+    def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """One candidate's score card with its per-question results, or None if not recorded."""
+        with self._lock:
+            cursor = self._db.execute("SELECT * FROM candidates WHERE conversation_id = ?", (conversation_id,))
+            names = [column[0] for column in cursor.description]
+            row = cursor.fetchone()
+            questions = self._db.execute(
+                f"SELECT {', '.join(_ANSWER_FIELDS)} FROM answers WHERE conversation_id = ? ORDER BY number",
+                (conversation_id,)
+            ).fetchall()
+        if row is None:
+            return None
+        record = self._candidate(dict(zip(names, row)))
+        record["questions"] = [dict(zip(_ANSWER_FIELDS, q)) for q in questions]
+        for question in record["questions"]:
+            if question["correct"] is not None:
+                question["correct"] = bool(question["correct"])
+        return record
+
+    @staticmethod
+    def _candidate(row: Dict[str, Any]) -> Dict[str, Any]:
+        row["completed_at"] = datetime.datetime.fromtimestamp(row["completed_at"], datetime.timezone.utc).isoformat()
+        return row
+
+    @staticmethod
+    def _where(since: Timestamp = None, until: Timestamp = None, position: Optional[str] = None,
+               tech: Optional[str] = None, result: Optional[str] = None) -> Tuple[str, list]:
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("c.completed_at >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("c.completed_at < ?")
+            params.append(_timestamp(until))
+        if position:
+            clauses.append("c.position = ?")
+            params.append(position.strip())
+        if result:
+            clauses.append("c.result = ?")
+            params.append(_result(result))
+        if tech:
+            clauses.append("c.conversation_id IN (SELECT conversation_id FROM candidate_skills WHERE skill = ?)")
+            params.append(normalize_tech(tech))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit: Optional[int] = 100, offset: int = 0, **filters) -> List[Dict[str, Any]]:
+        """
+        Candidates matching ``since`` (inclusive), ``until`` (exclusive),
+        ``position``, ``tech`` and ``result`` filters, newest first.
+        """
+        where, params = self._where(**filters)
+        sql = f"SELECT * FROM candidates c{where} ORDER BY c.completed_at DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            cursor = self._db.execute(sql, params + [-1 if limit is None else limit, offset])
+            names = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        return [self._candidate(dict(zip(names, row))) for row in rows]
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM candidates c{where}", params).fetchone()[0]
+
+    def iter_rows(self, rows: str = "candidates", batch_size: int = 5000, **filters) -> Iterator[List[tuple]]:
+        """
+        Batches of export rows (``CANDIDATE_COLUMNS`` or ``ANSWER_COLUMNS``
+        order), oldest first, read on a private connection.
+        """
+        where, params = self._where(**filters)
+        if rows == "candidates":
+            sql = f"SELECT {', '.join('c.' + c for c in CANDIDATE_COLUMNS)} FROM candidates c{where}"
+        elif rows == "answers":
+            columns = ", ".join(("a." if c in _ANSWER_FIELDS else "c.") + c for c in ANSWER_COLUMNS)
+            sql = f"SELECT {columns} FROM candidates c JOIN answers a USING (conversation_id){where}"
+        else:
+            raise ValueError(f"rows must be 'candidates' or 'answers', not {rows!r}")
+        sql += " ORDER BY c.completed_at, c.conversation_id" + (", a.number" if rows == "answers" else "")
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            cursor = db.execute(sql, params)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                yield batch
+        finally:
+            db.close()
+
+    def export(self, format: str = "csv", rows: str = "candidates", batch_size: int = 5000,
+               **filters) -> Iterator[bytes]:
+        """Stream an export as chunks of CSV or Parquet bytes, one chunk per batch."""
+        columns = CANDIDATE_COLUMNS if rows == "candidates" else ANSWER_COLUMNS
+        batches = self.iter_rows(rows, batch_size, **filters)
+        if format == "csv":
+            return _csv_chunks(columns, batches)
+        if format == "parquet":
+            return _parquet_chunks(columns, batches)
+        raise ValueError(f"format must be 'csv' or 'parquet', not {format!r}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _export_value(kind: str, value):
+    if value is None:
+        return None
+    if kind == "timestamp":
+        return datetime.datetime.fromtimestamp(value, datetime.timezone.utc)
+    if kind == "bool":
+        return bool(value)
+    return value
+
+
+def _csv_chunks(columns: Dict[str, str], batches) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    kinds = list(columns.values())
+    for batch in batches:
+        for row in batch:
+            writer.writerow([value.isoformat() if isinstance(value, datetime.datetime) else value
+                             for value in (_export_value(kind, v) for kind, v in zip(kinds, row))])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _Chunks(io.RawIOBase):
+    """Write-only file collecting bytes until they are drained to the response."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_chunks(columns: Dict[str, str], batches) -> Iterator[bytes]:
+    # Imported here so CSV exports and queries never pay for loading pyarrow.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"string": pa.string(), "int": pa.int32(), "bool": pa.bool_(), "timestamp": pa.timestamp("ms", tz="UTC")}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns.items()])
+    kinds = list(columns.values())
+    sink = _Chunks()
+    # One row group per batch, so only a batch is ever held in memory.
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in batches:
+            arrays = [pa.array([_export_value(kind, row[i]) for row in batch], type=schema.field(i).type)
+                      for i, kind in enumerate(kinds)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _date(text: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(text)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=settings.results_db_path)
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export", help="write matching candidates to a CSV or Parquet file")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--rows", choices=["candidates", "answers"], default="candidates")
+    list_parser = sub.add_parser("list", help="print matching candidates, newest first")
+    list_parser.add_argument("--limit", type=int, default=50)
+    for command in (export_parser, list_parser):
+        command.add_argument("--since", type=_date, help="ISO date or datetime, inclusive")
+        command.add_argument("--until", type=_date, help="ISO date or datetime, exclusive")
+        command.add_argument("--position")
+        command.add_argument("--tech")
+        command.add_argument("--result", choices=["pass", "fail", "incomplete"])
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error("no results store: set RESULTS_DB_PATH or pass --db")
+
+    store = ResultsStore(args.db)
+    filters = dict(since=args.since, until=args.until, position=args.position, tech=args.tech, result=args.result)
+    try:
+        if args.command == "export":
+            format = "parquet" if args.output.endswith(".parquet") else "csv"
+            with open(args.output, "wb") as f:
+                for chunk in store.export(format, args.rows, **filters):
+                    f.write(chunk)
+            print(f"Exported {store.count(**filters)} candidates to {args.output}")
+        else:
+            for candidate in store.query(limit=args.limit, **filters):
+                print(f"{candidate['completed_at'][:16]}  {candidate['result']:<10}  {candidate['score']:>3}  "
+                      f"{candidate['candidate_name']}  {candidate['position']}  {candidate['tech_stack']}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+
+from langchain_core.runnables import Runnable
+
+from .history import estimate_tokens
+from .metrics import ADMISSIONS, LLM_RETRIES, SCHEDULER_WAIT_SECONDS
+# Defined with the other LangChain-free types so the API and worker router import it cheaply.
+from .turns import Overloaded
+
+logger = logging.getLogger(__name__)
+
+# Lower is served first: interviews already in the hiring stage go ahead of
+# new greetings, and background work (summaries, evaluations) goes last.
+PRIORITIES = {"hiring": 0, "tech_stack": 1, "info": 1, "greeting": 2, "background": 3}
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, provider 5xx errors and connection failures are worth retrying."""
+    if getattr(error, "status_code", None) in RETRY_STATUS:
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in ("RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError")
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float):
+        """Return (or, if negative, charge) tokens once actual usage is known."""
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Ticket:
+    __slots__ = ("priority", "conversation_id", "tokens", "enqueued", "granted", "event", "future", "loop")
+
+    def __init__(self, priority, conversation_id, tokens):
+        self.priority = priority
+        self.conversation_id = conversation_id
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.event = None
+        self.future = None
+        self.loop = None
+
+
+class LLMScheduler:
+    """
+    Central gate in front of the LLM provider.
+
+    Calls wait for a request token, enough tokens for their estimated prompt
+    and completion, and a concurrency slot. Waiting calls are served by
+    priority (``PRIORITIES``) and, within a priority, round-robin across
+    conversations so one long conversation cannot starve the rest. Unset
+    limits are not enforced.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_concurrency: int = 64, max_queue: int = 1000, max_wait_seconds: float = 30.0):
+        self._requests = TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        # priority -> conversation -> waiting tickets
+        self._queues = [OrderedDict() for _ in range(max(PRIORITIES.values()) + 1)]
+        self._queued = 0
+        self._in_flight = 0
+        # Smoothed call latency and token cost, for wait estimates.
+        self._latency = 1.0
+        self._call_tokens = 512.0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._dispatch, name="llm-scheduler", daemon=True)
+        self._dispatcher.start()
+
+    # -- queueing ------------------------------------------------------------
+
+    def _wait_time(self, ticket, now) -> float:
+        wait = 0.0
+        if self._requests is not None:
+            wait = self._requests.wait_time(1, now)
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.wait_time(ticket.tokens, now))
+        return wait
+
+    def _grant(self, ticket):
+        if self._requests is not None:
+            self._requests.take(1)
+        if self._tokens is not None:
+            self._tokens.take(ticket.tokens)
+        self._in_flight += 1
+        ticket.granted = True
+        SCHEDULER_WAIT_SECONDS.observe(time.monotonic() - ticket.enqueued, priority=ticket.priority)
+        if ticket.event is not None:
+            ticket.event.set()
+        elif ticket.future is not None:
+            ticket.loop.call_soon_threadsafe(_resolve, ticket.future)
+
+    def _head(self):
+        for queue in self._queues:
+            if queue:
+                return queue, next(iter(queue))
+        return None, None
+
+    def _enqueue(self, ticket):
+        """Grant at once if nothing is waiting and capacity allows, otherwise queue."""
+        if (self._queued == 0 and self._in_flight < self.max_concurrency
+                and self._wait_time(ticket, time.monotonic()) == 0):
+            self._grant(ticket)
+            return
+        self._queues[ticket.priority].setdefault(ticket.conversation_id, deque()).append(ticket)
+        self._queued += 1
+        self._cond.notify_all()
+
+    def _remove(self, ticket):
+        waiting = self._queues[ticket.priority].get(ticket.conversation_id)
+        if waiting is not None and ticket in waiting:
+            waiting.remove(ticket)
+            self._queued -= 1
+            if not waiting:
+                del self._queues[ticket.priority][ticket.conversation_id]
+
+    def _dispatch(self):
+        with self._cond:
+            while not self._closed:
+                queue, conversation_id = self._head()
+                if queue is None or self._in_flight >= self.max_concurrency:
+                    self._cond.wait()
+                    continue
+                waiting: Deque[_Ticket] = queue[conversation_id]
+                wait = self._wait_time(waiting[0], time.monotonic())
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                ticket = waiting.popleft()
+                self._queued -= 1
+                # Round-robin: this conversation goes behind the others at its priority.
+                del queue[conversation_id]
+                if waiting:
+                    queue[conversation_id] = waiting
+                self._grant(ticket)
+
+    def acquire(self, priority: int, conversation_id: str, tokens: int) -> _Ticket:
+        ticket = _Ticket(priority, conversation_id, tokens)
+        ticket.event = threading.Event()
+        with self._cond:
+            self._enqueue(ticket)
+        ticket.event.wait()
+        return ticket
+
+    async def aacquire(self, priority: int, conversation_id: str, tokens: int) -> _Ticket:
+        ticket = _Ticket(priority, conversation_id, tokens)
+        ticket.loop = asyncio.get_running_loop()
+        ticket.future = ticket.loop.create_future()
+        with self._cond:
+            self._enqueue(ticket)
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            with self._cond:
+                if ticket.granted:
+                    self._release_locked(ticket, None, 0.0)
+                else:
+                    self._remove(ticket)
+            raise
+        return ticket
+
+    def _release_locked(self, ticket, used_tokens: Optional[int], latency: float):
+        self._in_flight -= 1
+        if used_tokens is not None:
+            if self._tokens is not None:
+                self._tokens.give(ticket.tokens - used_tokens)
+            self._call_tokens = 0.9 * self._call_tokens + 0.1 * used_tokens
+        if latency:
+            self._latency = 0.9 * self._latency + 0.1 * latency
+        self._cond.notify_all()
+
+    def release(self, ticket: _Ticket, used_tokens: Optional[int] = None, latency: float = 0.0):
+        with self._cond:
+            self._release_locked(ticket, used_tokens, latency)
+
+    def close(self):
+        """Stop the dispatcher; calls still queued are never granted."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._dispatcher.join()
+
+    # -- admission -----------------------------------------------------------
+
+    def throughput(self) -> float:
+        """Estimated sustainable calls per second under the configured limits."""
+        rate = self.max_concurrency / max(self._latency, 1e-3)
+        if self._requests is not None:
+            rate = min(rate, self._requests.rate)
+        if self._tokens is not None:
+            rate = min(rate, self._tokens.rate / max(self._call_tokens, 1.0))
+        return rate
+
+    def estimate_wait(self, priority: int = PRIORITIES["greeting"]) -> float:
+        """Seconds a new call at ``priority`` would wait behind the calls queued ahead of it."""
+        with self._cond:
+            ahead = sum(len(waiting) for queue in self._queues[:priority + 1] for waiting in queue.values())
+            busy = max(0, self._in_flight + ahead + 1 - self.max_concurrency)
+            return busy / self.throughput() if busy else 0.0
+
+    def admit(self) -> float:
+        """
+        Admit a new interview and return its estimated wait, or raise
+        ``Overloaded`` if the queue is full or the wait is too long.
+        """
+        wait = self.estimate_wait()
+        if self._queued >= self.max_queue or wait > self.max_wait_seconds:
+            ADMISSIONS.inc(result="shed")
+            raise Overloaded(max(wait, 1.0))
+        ADMISSIONS.inc(result="admitted" if wait == 0 else "queued")
+        return wait
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _prompt_tokens(prompt) -> int:
+    messages = prompt.to_messages() if hasattr(prompt, "to_messages") else [prompt]
+    return sum(estimate_tokens(str(getattr(m, "content", m))) for m in messages)
+
+
+def _used_tokens(message) -> Optional[int]:
+    usage = getattr(message, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+class ScheduledLLM(Runnable):
+    """
+    Routes every call to ``llm`` through an ``LLMScheduler``, retrying
+    transient provider errors with jittered exponential backoff. The
+    conversation and stage are read from the call's config metadata;
+    calls without them (summaries, evaluations) are background priority.
+    """
+
+    def __init__(self, llm, scheduler: LLMScheduler, max_retries: int = 3, expected_output_tokens: int = 256,
+                 backoff_base: float = 0.5, backoff_cap: float = 20.0):
+        self.llm = llm
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.expected_output_tokens = expected_output_tokens
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+    def __getattr__(self, name):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def _plan(self, input, config, kwargs) -> Dict[str, Any]:
+        metadata = (config or {}).get("metadata", {})
+        stage = metadata.get("stage", "background")
+        # Reserve the output budget bound by the model route, if any.
+        output_tokens = kwargs.get("max_tokens") or self.expected_output_tokens
+        return {"priority": PRIORITIES.get(stage, PRIORITIES["background"]), "stage": stage,
+                "conversation_id": metadata.get("conversation_id", "background"),
+                "tokens": _prompt_tokens(input) + output_tokens}
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _should_retry(self, error, attempt, plan) -> bool:
+        if attempt >= self.max_retries or not is_retryable(error):
+            return False
+        LLM_RETRIES.inc(stage=plan["stage"])
+        logger.info("Retrying %s call for %s after %r", plan["stage"], plan["conversation_id"], error)
+        return True
+
+    def invoke(self, input, config=None, **kwargs):
+        plan = self._plan(input, config, kwargs)
+        for attempt in range(self.max_retries + 1):
+            ticket = self.scheduler.acquire(plan["priority"], plan["conversation_id"], plan["tokens"])
+            started = time.monotonic()
+            try:
+                message = self.llm.invoke(input, config, **kwargs)
+            except Exception as e:
+                self.scheduler.release(ticket)
+                if not self._should_retry(e, attempt, plan):
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            self.scheduler.release(ticket, _used_tokens(message), time.monotonic() - started)
+            return message
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        plan = self._plan(input, config, kwargs)
+        for attempt in range(self.max_retries + 1):
+            ticket = await self.scheduler.aacquire(plan["priority"], plan["conversation_id"], plan["tokens"])
+            started = time.monotonic()
+            try:
+                message = await self.llm.ainvoke(input, config, **kwargs)
+            except Exception as e:
+                self.scheduler.release(ticket)
+                if not self._should_retry(e, attempt, plan):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            self.scheduler.release(ticket, _used_tokens(message), time.monotonic() - started)
+            return message
+
+    def stream(self, input, config=None, **kwargs):
+        # Only a call that fails before its first chunk is retried.
+        plan = self._plan(input, config, kwargs)
+        for attempt in range(self.max_retries + 1):
+            ticket = self.scheduler.acquire(plan["priority"], plan["conversation_id"], plan["tokens"])
+            started = time.monotonic()
+            used = None
+            streamed = False
+            try:
+                for chunk in self.llm.stream(input, config, **kwargs):
+                    streamed = True
+                    used = _used_tokens(chunk) or used
+                    yield chunk
+            except Exception as e:
+                self.scheduler.release(ticket)
+                if streamed or not self._should_retry(e, attempt, plan):
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            except GeneratorExit:
+                self.scheduler.release(ticket)
+                raise
+            self.scheduler.release(ticket, used, time.monotonic() - started)
+            return
+
+    async def astream(self, input, config=None, **kwargs):
+        plan = self._plan(input, config, kwargs)
+        for attempt in range(self.max_retries + 1):
+            ticket = await self.scheduler.aacquire(plan["priority"], plan["conversation_id"], plan["tokens"])
+            started = time.monotonic()
+            used = None
+            streamed = False
+            try:
+                async for chunk in self.llm.astream(input, config, **kwargs):
+                    streamed = True
+                    used = _used_tokens(chunk) or used
+                    yield chunk
+            except Exception as e:
+                self.scheduler.release(ticket)
+                if streamed or not self._should_retry(e, attempt, plan):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except (GeneratorExit, asyncio.CancelledError):
+                self.scheduler.release(ticket)
+                raise
+            self.scheduler.release(ticket, used, time.monotonic() - started)
+            return
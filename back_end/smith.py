@@ -1,73 +1,294 @@
-from langchain.schema import HumanMessage, AIMessage
-from typing import Dict, Any, List
+import atexit
 import datetime
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+import zlib
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
 
 
-def log(message: str, error: bool = False):
-    prefix = "[ERROR]" if error else "[INFO]"
-    print(f"{prefix} {message}")
+logger = logging.getLogger(__name__)
+
+
+# Only routing flags are kept from the stage state; the response text is
+# already stored as the trace output.
+TRACE_STATE_KEYS = ("stage", "greeting_done", "info_done", "tech_done", "hiring_done", "hiring_question_count")
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.datetime.utcfromtimestamp(timestamp).isoformat()
+
+
+def _serialize(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Export form of a trace entry: adds an id and ISO timestamps, drops private fields."""
+    record = {key: value for key, value in entry.items() if not key.startswith("_") and key != "started_at"}
+    record["id"] = entry.setdefault("id", str(uuid.uuid4()))
+    record["timestamp"] = _iso(entry["started_at"])
+    if entry.get("latency_ms") is not None:
+        record["end_time"] = _iso(entry["started_at"] + entry["latency_ms"] / 1000)
+    return record
+
+
+class JSONLTraceSink:
+    """Appends one JSON object per trace record to a file."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]):
+        self._file.write("".join(json.dumps(record, default=str) + "\n" for record in records))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class SQLiteTraceSink:
+    """Stores trace records in an indexed SQLite table."""
+
+    def __init__(self, path: str):
+        # Only ever used from the tracer's worker thread.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS traces (
+                id TEXT PRIMARY KEY,
+                conversation_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                stage TEXT,
+                timestamp TEXT NOT NULL,
+                latency_ms REAL,
+                error TEXT,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS traces_conversation ON traces (conversation_id, timestamp);
+        """)
+
+    def write(self, records: List[Dict[str, Any]]):
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO traces VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(r["id"], r["conversation_id"], r["kind"], r.get("stage"), r["timestamp"],
+                  r.get("latency_ms"), r.get("error"), json.dumps(r, default=str)) for r in records]
+            )
+
+    def close(self):
+        self._db.close()
+
+
+class LangSmithHTTPSink:
+    """
+    Posts batches of runs to a LangSmith-compatible ``/runs/batch`` endpoint,
+    such as ``Settings.langsmith_endpoint`` or a local stand-in for it.
+    """
+
+    def __init__(self, endpoint: str, api_key: Optional[str], project: str, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/runs/batch"
+        self.api_key = api_key
+        self.project = project
+        self.timeout = timeout
+
+    def _run(self, record):
+        return {
+            "id": record["id"],
+            "name": record.get("stage") or record["kind"],
+            "run_type": "chain",
+            "start_time": record["timestamp"],
+            "end_time": record.get("end_time", record["timestamp"]),
+            "inputs": {"input": record.get("input")},
+            "outputs": {"output": record.get("output"), "evaluation": record.get("evaluation")},
+            "error": record.get("error"),
+            "session_name": self.project,
+            "extra": {"metadata": {"conversation_id": record["conversation_id"], "state": record.get("state")}},
+        }
+
+    def write(self, records: List[Dict[str, Any]]):
+        body = json.dumps({"post": [self._run(r) for r in records]}, default=str).encode()
+        request = urllib.request.Request(self.url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        if self.api_key:
+            request.add_header("x-api-key", self.api_key)
+        urllib.request.urlopen(request, timeout=self.timeout).close()
+
+    def close(self):
+        pass
 
 
 class LangSmithTracer:
     """
     LangSmith-like tracer for logging conversation runs, inputs, outputs,
-    states, and evaluations with a convenient logger method.
+    states, and evaluations.
+
+    Recording a trace only touches an in-memory ring buffer and enqueues the
+    finished record; a background worker drains the bounded queue in batches
+    to the configured sinks. Conversations are head-sampled by
+    ``sample_rate``; errored or slow traces are always exported (tail
+    sampling). When the queue is full records are dropped and counted
+    rather than blocking the turn.
     """
 
-    def __init__(self):
-        # Store conversation traces keyed by conversation_id
-        self.traces: Dict[str, List[Dict[str, Any]]] = {}
+    def __init__(self, sinks=None, sample_rate: float = 1.0, slow_ms: float = 5000.0,
+                 ring_size: int = 50, max_conversations: int = 10000, queue_size: int = 10000,
+                 batch_size: int = 100):
+        # Most recent traces per conversation, least recently traced conversation first
+        self.traces: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self.sinks = list(sinks or [])
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.ring_size = ring_size
+        self.max_conversations = max_conversations
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.exported = 0
+        self.sink_errors = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._worker = None
+        if self.sinks:
+            self._worker = threading.Thread(target=self._drain, name="trace-sink", daemon=True)
+            self._worker.start()
+            atexit.register(self.close)
+
+    def _head_sampled(self, conversation_id: str) -> bool:
+        return zlib.crc32(conversation_id.encode()) % 10000 < self.sample_rate * 10000
+
+    def _ring(self, conversation_id: str) -> Deque[Dict[str, Any]]:
+        ring = self.traces.get(conversation_id)
+        if ring is None:
+            ring = self.traces[conversation_id] = deque(maxlen=self.ring_size)
+            while len(self.traces) > self.max_conversations:
+                self.traces.popitem(last=False)
+        else:
+            self.traces.move_to_end(conversation_id)
+        return ring
+
+    def _last(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            ring = self.traces.get(conversation_id)
+            return ring[-1] if ring else None
+
+    def _export(self, record: Dict[str, Any]):
+        if not self.sinks:
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
     def start_trace(self, conversation_id: str, input_text: str, stage: str):
         """Begin a new trace entry for a conversation stage."""
+        # Ids and ISO timestamps are filled in by the export worker, off the turn.
         trace_entry = {
-            "timestamp": datetime.datetime.utcnow().isoformat(),
+            "kind": "trace",
+            "conversation_id": conversation_id,
+            "started_at": time.time(),
             "stage": stage,
             "input": input_text,
             "output": None,
             "state": None,
             "evaluation": None,
+            "latency_ms": None,
+            "error": None,
+            "_started": time.perf_counter(),
         }
-        self.traces.setdefault(conversation_id, []).append(trace_entry)
-        log(f"[{conversation_id}] Started trace at stage '{stage}' with input: {input_text}")
+        with self._lock:
+            self._ring(conversation_id).append(trace_entry)
         return trace_entry
 
-    def end_trace(self, conversation_id: str, output_text: str, state: dict):
-        """Complete the last trace entry with output and state info."""
-        if conversation_id not in self.traces or not self.traces[conversation_id]:
-            log(f"[{conversation_id}] Warning: No trace started for this conversation to end.", error=True)
+    def end_trace(self, conversation_id: str, output_text: Optional[str], state: dict, error: Optional[str] = None):
+        """Complete the last trace entry with output and state info, and queue it for export."""
+        trace_entry = self._last(conversation_id)
+        if trace_entry is None:
+            logger.warning("[%s] No trace started for this conversation to end.", conversation_id)
             return
 
-        trace_entry = self.traces[conversation_id][-1]
         trace_entry["output"] = output_text
-        trace_entry["state"] = state.copy()
-        log(f"[{conversation_id}] Ended trace with output: {output_text} and state: {state}")
+        trace_entry["state"] = {key: state[key] for key in TRACE_STATE_KEYS if key in state}
+        trace_entry["error"] = error
+        trace_entry["latency_ms"] = (time.perf_counter() - trace_entry["_started"]) * 1000
+
+        if (self._head_sampled(conversation_id) or error is not None
+                or trace_entry["latency_ms"] >= self.slow_ms):
+            self._export(trace_entry)
 
     def add_evaluation(self, conversation_id: str, evaluation: dict):
         """Add an evaluation (e.g., correctness, relevance) to the last trace."""
-        if conversation_id not in self.traces or not self.traces[conversation_id]:
-            log(f"[{conversation_id}] Warning: No trace started for this conversation to add evaluation.",
-                     error=True)
+        trace_entry = self._last(conversation_id)
+        if trace_entry is None:
+            logger.warning("[%s] No trace started for this conversation to add evaluation.", conversation_id)
             return
 
-        self.traces[conversation_id][-1]["evaluation"] = evaluation
-        log(f"[{conversation_id}] Added evaluation: {evaluation}")
+        trace_entry["evaluation"] = evaluation
+        self._export({"kind": "evaluation", "conversation_id": conversation_id, "started_at": time.time(),
+                      "stage": trace_entry["stage"], "trace_id": trace_entry.setdefault("id", str(uuid.uuid4())),
+                      "evaluation": evaluation})
 
     def get_conversation_traces(self, conversation_id: str):
-        """Retrieve all traces for a given conversation."""
-        return self.traces.get(conversation_id, [])
+        """Retrieve the retained traces for a given conversation."""
+        with self._lock:
+            return list(self.traces.get(conversation_id, ()))
 
     def print_traces(self, conversation_id: str):
         """Print all traces for debugging."""
         traces = self.get_conversation_traces(conversation_id)
         if not traces:
-            log(f"[{conversation_id}] No traces found.")
+            logger.info("[%s] No traces found.", conversation_id)
             return
-        log(f"[{conversation_id}] Printing all traces:")
+        logger.info("[%s] Printing all traces:", conversation_id)
         for i, trace in enumerate(traces, 1):
             print(f"Trace {i} - Stage: {trace['stage']}")
             print(f"  Input: {trace['input']}")
             print(f"  Output: {trace['output']}")
             print(f"  State: {trace['state']}")
             print(f"  Evaluation: {trace['evaluation']}")
-            print(f"  Timestamp: {trace['timestamp']}\n")
+            print(f"  Latency: {trace['latency_ms']} ms")
+            print(f"  Timestamp: {_iso(trace['started_at'])}\n")
+
+    def _drain(self):
+        # Block for one record, then take whatever else is already queued, so
+        # writes are batched under load without delaying them when idle.
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            records = batch[:-1] if stop else batch
+            if records:
+                self._write([_serialize(record) for record in records])
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch):
+        for sink in self.sinks:
+            try:
+                sink.write(batch)
+            except Exception:
+                self.sink_errors += 1
+                logger.exception("Trace sink %s failed", type(sink).__name__)
+        self.exported += len(batch)
+
+    def flush(self):
+        """Block until every queued record has been handed to the sinks."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def close(self):
+        """Flush outstanding records, stop the worker and close the sinks."""
+        if self._worker is None:
+            return
+        worker, self._worker = self._worker, None
+        self._queue.put(None)
+        worker.join()
+        for sink in self.sinks:
+            sink.close()
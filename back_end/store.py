@@ -0,0 +1,458 @@
+import asyncio
+import contextlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class Stage(str, Enum):
+    GREETING = "greeting"
+    INFO = "info"
+    TECH_STACK = "tech_stack"
+    HIRING = "hiring"
+    COMPLETE = "complete"
+
+    def __str__(self):
+        # Metric labels, traces and logs see the plain stage name.
+        return self.value
+
+
+# Hiring turns before the interview is complete: four questions plus the
+# tech stack reply and the closing message.
+HIRING_TURNS = 6
+
+
+def stage_for(flags) -> Stage:
+    """The stage a conversation with these flags (any mapping with ``get``) is in."""
+    if not flags.get("greeting_done", False):
+        return Stage.GREETING
+    if not flags.get("info_done", False):
+        return Stage.INFO
+    if not flags.get("tech_done", False):
+        return Stage.TECH_STACK
+    if flags.get("hiring_question_count", 0) < HIRING_TURNS:
+        return Stage.HIRING
+    return Stage.COMPLETE
+
+
+class Flags:
+    """
+    Per-conversation progress flags as a slotted record. It also reads and
+    updates like the ``dict`` it replaces (``flags["info_done"]``,
+    ``update``, ``**flags``), so turn state, traces and the persistent tier
+    keep their flag names.
+    """
+
+    __slots__ = ("greeting_done", "info_done", "tech_done", "hiring_done", "hiring_question_count",
+                 # The candidate's tech stack reply, used to pick bank questions.
+                 "tech_stack")
+
+    def __init__(self):
+        self.greeting_done = False
+        self.info_done = False
+        self.tech_done = False
+        self.hiring_done = False
+        self.hiring_question_count = 0
+        self.tech_stack = ""
+
+    @property
+    def stage(self) -> Stage:
+        return stage_for(self)
+
+    def keys(self):
+        return self.__slots__
+
+    def __contains__(self, key) -> bool:
+        return key in self.__slots__
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def update(self, values=(), **kwargs):
+        for key, value in dict(values, **kwargs).items():
+            self[key] = value
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+_MESSAGE_KINDS = {"human": 0, "ai": 1}
+_KIND_NAMES = ("human", "ai")
+
+
+class Transcript:
+    """
+    Append-only message buffer: message kinds in a ``bytearray`` and texts
+    in a list. LangChain message objects are only built, by ``messages``,
+    when a prompt needs them.
+    """
+
+    __slots__ = ("_kinds", "_texts")
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]] = ()):
+        self._kinds = bytearray()
+        self._texts: List[str] = []
+        for kind, text in pairs:
+            self.append(kind, text)
+
+    def append(self, kind: str, text: str):
+        self._kinds.append(_MESSAGE_KINDS[kind])
+        self._texts.append(text)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def kind(self, index: int) -> str:
+        return _KIND_NAMES[self._kinds[index]]
+
+    def text(self, index: int) -> str:
+        return self._texts[index]
+
+    def texts(self, kind: str) -> List[str]:
+        code = _MESSAGE_KINDS[kind]
+        return [text for k, text in zip(self._kinds, self._texts) if k == code]
+
+    def pairs(self, start: int = 0, stop: Optional[int] = None) -> List[Tuple[str, str]]:
+        return [(_KIND_NAMES[k], text) for k, text in zip(self._kinds[start:stop], self._texts[start:stop])]
+
+    def messages(self, start: int = 0, stop: Optional[int] = None) -> list:
+        # Imported here so the router process and the store itself never load LangChain.
+        from langchain_core.messages import AIMessage, HumanMessage
+        types = (HumanMessage, AIMessage)
+        return [types[k](content=text) for k, text in zip(self._kinds[start:stop], self._texts[start:stop])]
+
+
+class Session:
+    """State of one conversation."""
+
+    __slots__ = ("transcript", "flags", "lock", "evaluations", "summary", "candidate_name", "persisted",
+                 "last_access")
+
+    def __init__(self):
+        self.transcript = Transcript()
+        self.flags = Flags()
+        # Plain Lock rather than RLock: a streamed turn holds it inside a
+        # generator that may be closed from another thread.
+        self.lock = threading.Lock()
+        # Background per-answer scores, by question number.
+        self.evaluations: Dict[int, Dict[str, Any]] = {}
+        # Rolling summary of transcript[:offset] that fell out of the prompt window.
+        self.summary = ("", 0)
+        # Name from the portal's name form, given when the interview is started.
+        self.candidate_name = ""
+        # Number of messages already written to the persistent tier.
+        self.persisted = 0
+        self.last_access = time.monotonic()
+
+
+def new_conversation() -> Session:
+    return Session()
+
+
+def dump_conversation(conv: Session) -> Dict[str, Any]:
+    """Picklable copy of a conversation, for handing it to another process."""
+    return {
+        "messages": conv.transcript.pairs(),
+        "flags": conv.flags.as_dict(),
+        "summary": conv.summary,
+        "candidate_name": conv.candidate_name,
+        "persisted": conv.persisted,
+        "evaluations": dict(conv.evaluations),
+    }
+
+
+def restore_conversation(data: Dict[str, Any]) -> Session:
+    conv = Session()
+    conv.transcript = Transcript(data["messages"])
+    conv.flags.update(data["flags"])
+    conv.summary = tuple(data["summary"])
+    conv.candidate_name = data.get("candidate_name", "")
+    conv.persisted = data["persisted"]
+    conv.evaluations.update(data["evaluations"])
+    return conv
+
+
+class SQLiteConversationBackend:
+    """
+    Write-through persistent tier. Flags and the rolling summary are
+    upserted per turn, messages are append-only, and answer evaluations are
+    upserted per question, so a save only writes what the turn added.
+    Background summaries and evaluations are saved as they land
+    (``save_state``), since they finish after the turn that started them.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                conversation_id TEXT PRIMARY KEY,
+                flags TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                summary TEXT NOT NULL DEFAULT '',
+                summary_offset INTEGER NOT NULL DEFAULT 0,
+                candidate_name TEXT NOT NULL DEFAULT ''
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+                conversation_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                PRIMARY KEY (conversation_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS evaluations (
+                conversation_id TEXT NOT NULL,
+                number INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (conversation_id, number)
+            ) WITHOUT ROWID;
+        """)
+        # Files written by earlier versions lack the newer columns.
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(conversations)")}
+        for column, definition in [("summary", "TEXT NOT NULL DEFAULT ''"),
+                                   ("summary_offset", "INTEGER NOT NULL DEFAULT 0"),
+                                   ("candidate_name", "TEXT NOT NULL DEFAULT ''")]:
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE conversations ADD COLUMN {column} {definition}")
+        self._db.commit()
+
+    def load(self, conversation_id: str) -> Optional[Session]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT flags, summary, summary_offset, candidate_name FROM conversations WHERE conversation_id = ?",
+                (conversation_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            rows = self._db.execute(
+                "SELECT type, content FROM messages WHERE conversation_id = ? ORDER BY seq",
+                (conversation_id,)
+            ).fetchall()
+            evaluations = self._db.execute(
+                "SELECT number, record FROM evaluations WHERE conversation_id = ?", (conversation_id,)
+            ).fetchall()
+
+        conv = Session()
+        conv.flags.update(json.loads(row[0]))
+        conv.summary = (row[1], row[2])
+        conv.candidate_name = row[3]
+        conv.transcript = Transcript(rows)
+        conv.persisted = len(rows)
+        conv.evaluations.update((number, json.loads(record)) for number, record in evaluations)
+        return conv
+
+    def _save_state(self, conversation_id: str, conv: Session):
+        summary, offset = conv.summary
+        # A copy reloaded after eviction can lag behind the background
+        # workers; never let it roll back a newer summary or a finished evaluation.
+        self._db.execute(
+            "UPDATE conversations SET summary = ?, summary_offset = ? "
+            "WHERE conversation_id = ? AND summary_offset <= ?",
+            (summary, offset, conversation_id, offset)
+        )
+        self._db.executemany(
+            "INSERT INTO evaluations (conversation_id, number, status, record) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(conversation_id, number) DO UPDATE SET status = excluded.status, record = excluded.record "
+            "WHERE excluded.status != 'pending' OR evaluations.status = 'pending'",
+            [(conversation_id, number, record["status"], json.dumps(record))
+             for number, record in list(conv.evaluations.items())]
+        )
+
+    def save(self, conversation_id: str, conv: Session):
+        start = conv.persisted
+        new_messages = conv.transcript.pairs(start)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO conversations (conversation_id, flags, updated_at, candidate_name) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(conversation_id) DO UPDATE SET flags = excluded.flags, updated_at = excluded.updated_at, "
+                "candidate_name = excluded.candidate_name",
+                (conversation_id, json.dumps(conv.flags.as_dict()), time.time(), conv.candidate_name)
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO messages (conversation_id, seq, type, content) VALUES (?, ?, ?, ?)",
+                [(conversation_id, start + i, kind, content) for i, (kind, content) in enumerate(new_messages)]
+            )
+            self._save_state(conversation_id, conv)
+        conv.persisted = start + len(new_messages)
+
+    def save_state(self, conversation_id: str, conv: Session):
+        """Write the summary and evaluations of a conversation already saved by a turn."""
+        with self._lock, self._db:
+            if self._db.execute("SELECT 1 FROM conversations WHERE conversation_id = ?",
+                                (conversation_id,)).fetchone() is not None:
+                self._save_state(conversation_id, conv)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ConversationStore:
+    """
+    Conversation state sharded across independently locked buckets, so
+    unrelated sessions never contend on a single global lock. Each
+    conversation carries its own lock that serializes its turns.
+
+    Each bucket is an LRU: conversations idle longer than ``ttl_seconds`` or
+    beyond ``max_conversations`` are evicted from memory. With a ``backend``
+    every turn is written through, and evicted or pre-restart conversations
+    are reloaded on their next access.
+    """
+
+    def __init__(self, shards: int = 64, max_conversations: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None, backend: Optional[SQLiteConversationBackend] = None):
+        self._shards: List[Tuple[threading.Lock, "OrderedDict[str, Session]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+        self._shard_capacity = -(-max_conversations // shards) if max_conversations else None
+        self._ttl = ttl_seconds
+        self.backend = backend
+
+    def _shard(self, conversation_id: str):
+        return self._shards[zlib.crc32(conversation_id.encode()) % len(self._shards)]
+
+    def _evict(self, bucket, now: float):
+        # Buckets are kept in access order, so expired entries sit at the head.
+        # A conversation with a turn in flight is never evicted.
+        while bucket:
+            conversation_id, conv = next(iter(bucket.items()))
+            expired = self._ttl is not None and now - conv.last_access > self._ttl
+            full = self._shard_capacity is not None and len(bucket) > self._shard_capacity
+            if not (expired or full) or conv.lock.locked():
+                break
+            del bucket[conversation_id]
+
+    def _lookup(self, conversation_id: str, create: bool):
+        lock, bucket = self._shard(conversation_id)
+        now = time.monotonic()
+        with lock:
+            conv = bucket.get(conversation_id)
+            if conv is None:
+                conv = self.backend.load(conversation_id) if self.backend else None
+                if conv is None:
+                    if not create:
+                        raise KeyError(conversation_id)
+                    conv = Session()
+                bucket[conversation_id] = conv
+            else:
+                bucket.move_to_end(conversation_id)
+            conv.last_access = now
+            self._evict(bucket, now)
+            return conv
+
+    def get(self, conversation_id: str) -> Session:
+        """Return the conversation, reloading or creating it as needed."""
+        return self._lookup(conversation_id, create=True)
+
+    async def aget(self, conversation_id: str) -> Session:
+        """``get`` for coroutines; reloading from the persistent tier runs in a thread."""
+        if self.backend is None or conversation_id in self:
+            return self.get(conversation_id)
+        return await asyncio.to_thread(self.get, conversation_id)
+
+    def save_state(self, conversation_id: str, conv: Session):
+        """Write through a summary or evaluation that finished in the background, if there is a persistent tier."""
+        if self.backend is not None:
+            self.backend.save_state(conversation_id, conv)
+
+    @contextlib.contextmanager
+    def checkout(self, conversation_id: str):
+        """
+        Hold the conversation's lock for one turn so its turns stay strictly
+        ordered, then write it through to the persistent tier, if any.
+        """
+        while True:
+            conv = self.get(conversation_id)
+            conv.lock.acquire()
+            lock, bucket = self._shard(conversation_id)
+            with lock:
+                resident = bucket.get(conversation_id) is conv
+            if resident:
+                break
+            # Evicted between lookup and lock; retry against the reloaded copy.
+            conv.lock.release()
+        try:
+            yield conv
+            if self.backend is not None:
+                self.backend.save(conversation_id, conv)
+        finally:
+            conv.lock.release()
+
+    @contextlib.asynccontextmanager
+    async def acheckout(self, conversation_id: str):
+        """
+        ``checkout`` for coroutines. The conversation lock is polled rather
+        than waited on, so a contended conversation never blocks the event
+        loop and a cancelled waiter never ends up owning the lock.
+        """
+        delay = 0.001
+        while True:
+            conv = await self.aget(conversation_id)
+            if conv.lock.acquire(blocking=False):
+                lock, bucket = self._shard(conversation_id)
+                with lock:
+                    resident = bucket.get(conversation_id) is conv
+                if resident:
+                    break
+                conv.lock.release()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        try:
+            yield conv
+            if self.backend is not None:
+                await asyncio.to_thread(self.backend.save, conversation_id, conv)
+        finally:
+            conv.lock.release()
+
+    def put(self, conversation_id: str, conv: Session):
+        """Insert or replace the in-memory copy of a conversation."""
+        lock, bucket = self._shard(conversation_id)
+        now = time.monotonic()
+        with lock:
+            conv.last_access = now
+            bucket[conversation_id] = conv
+            bucket.move_to_end(conversation_id)
+            self._evict(bucket, now)
+
+    def discard(self, conversation_id: str):
+        """Drop the in-memory copy; the persistent tier, if any, is kept."""
+        lock, bucket = self._shard(conversation_id)
+        with lock:
+            bucket.pop(conversation_id, None)
+
+    def __contains__(self, conversation_id: str) -> bool:
+        lock, bucket = self._shard(conversation_id)
+        with lock:
+            return conversation_id in bucket
+
+    def __getitem__(self, conversation_id: str) -> Session:
+        return self._lookup(conversation_id, create=False)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for _, bucket in self._shards)
+
+    def items(self):
+        """Snapshot of in-memory (conversation_id, conversation) pairs."""
+        snapshot = []
+        for lock, bucket in self._shards:
+            with lock:
+                snapshot.extend(bucket.items())
+        return snapshot
@@ -4,7 +4,7 @@ class Templates:
     developed by TalentScout for the purpose of initial tech job screening.
     """
 
-    _info_prompt = """
+    _info_form = """
     Let's begin with a few details to personalize your screening experience.
 
     Are you a **fresher** or an **experienced professional**?
@@ -20,7 +20,8 @@ class Templates:
         4.Current location
         5.Phone Number
     Kindly reply with your details in the given format.
-    
+    """
+    _info_prompt = _info_form + """
     Candidate says: {input}
     """
 
@@ -46,7 +47,7 @@ class Templates:
     and also display this information to the candidate.
     Candidate says: {input}
     """
-    _tech_stack_prompt = """
+    _tech_stack_form = """
     Please list the technologies, tools, and frameworks you are confident working with. This includes:
 
     - Programming languages (e.g., Python, Java, JavaScript)
@@ -57,10 +58,34 @@ class Templates:
     - Testing or CI/CD tools (e.g., Jenkins, pytest, GitHub Actions)
 
     Only mention those you have real-world experience or project exposure with. Feel free to group them or organize them by category if you'd like.
-    
+    """
+    _tech_stack_prompt = _tech_stack_form + """
     Candidate says: {input}
     """
 
+    # Candidate-facing text for stages rendered locally instead of by the LLM
+    # (see Settings.scripted_stages). {name} and {details} are filled in by the bot.
+    _greet_script = """
+    Hello {name}! I'm the AI Hiring Assistant developed by TalentScout for the
+    purpose of initial tech job screening.
+
+    I'll collect a few details about you, ask about your tech stack and then
+    walk you through a short technical evaluation. Reply whenever you're ready.
+    """
+    _info_script = """
+    Thanks, {name}!
+    """ + _info_form
+    _tech_stack_script = """
+    Thank you, {name}. I've noted your details:
+
+    {details}
+    """ + _tech_stack_form
+
+    # Scoring rules shared by the per-answer and whole-interview evaluation prompts.
+    _rubric = """    - Assign mark range from 1–10 for each question.
+    - Judge technical correctness and depth for the question's difficulty, not style or length.
+"""
+
     _hiring_prompt = """
     You are an intelligent AI Hiring Assistant for TalentScout.
 
@@ -78,8 +103,8 @@ class Templates:
     Conversation Rules:
     - Ask only one question at a time.
     - Do not deviate from the screening purpose.
-    - After all 4 answers, Based on the full conversation so far, evaluate their performance and return a JSON string with keys: score, result, and feedback.
-    - Assign mark range from 1–10 for each question.
+    - Do not grade or score answers; each answer is evaluated separately.
+    - After all 4 answers, thank the candidate and tell them their results are on the score card.
     - Keep a professional and supportive tone throughout.
 
 
@@ -87,19 +112,110 @@ class Templates:
     candidate says: {input}
     """
 
+    _evaluation_prompt = """
+    You are the evaluator for TalentScout's technical screening. Below is the
+    transcript of a completed interview between the AI Hiring Assistant and a
+    candidate. Grade the candidate's answers with these rules:
+
+""" + _rubric + """
+    Reply with the JSON object only. Use keys: score (0-100), result ("pass" or
+    "fail"), feedback (two or three sentences) and marks (the list of
+    per-question marks, in order).
+
+    Transcript:
+    {transcript}
+    """
+
+    _answer_evaluation_prompt = """
+    You are the evaluator for TalentScout's technical screening. Grade one
+    answer from the candidate with these rules:
+
+""" + _rubric + """
+    Reply with a JSON object only, with keys: mark (1-10), correct (true if the
+    answer is acceptable) and feedback (one sentence). If the assistant message
+    below is not a technical question, reply with {{"skip": true}} instead.
+
+    Question:
+    {question}
+
+    Candidate's answer:
+    {answer}
+    """
+
+    _question_generation_prompt = """
+    You write questions for TalentScout's technical screening interviews.
+
+    Write {count} distinct {difficulty} {question_type} questions about {technology}.
+    - "mcq": a question followed by exactly four options on their own lines,
+      labelled A) B) C) D), with exactly one correct option.
+    - "code_fix": a short buggy snippet in a fenced code block and a request to
+      find and fix the bug.
+    - "descriptive": an open question answerable in a few sentences.
+
+    Do not include answers or explanations. Reply with a JSON array of strings only,
+    one question per string.
+    """
+
+    _summary_prompt = """
+    You maintain a running summary of a technical screening interview between an
+    AI Hiring Assistant and a candidate. Update the summary with the new messages.
+
+    Always keep: the candidate's name, experience level and contact details, the
+    tech stack they listed, every question asked with its type and difficulty,
+    and a short note on each answer given. Drop greetings and small talk.
+    Reply with the updated summary only.
+
+    Current summary:
+    {summary}
+
+    New messages:
+    {transcript}
+    """
 
     @property
     def greeting(self):
         return self._greet_prompt
+
     @property
     def info(self):
         return self._info_prompt
+
     @property
     def tech_stack(self):
         return self._tech_stack_prompt
+
     @property
     def terms_prompt(self):
         return self._terms_prompt
+
     @property
     def hiring_prompt(self):
         return self._hiring_prompt
+
+    @property
+    def greeting_script(self):
+        return self._greet_script
+
+    @property
+    def info_script(self):
+        return self._info_script
+
+    @property
+    def tech_stack_script(self):
+        return self._tech_stack_script
+
+    @property
+    def summary_prompt(self):
+        return self._summary_prompt
+
+    @property
+    def answer_evaluation_prompt(self):
+        return self._answer_evaluation_prompt
+
+    @property
+    def question_generation_prompt(self):
+        return self._question_generation_prompt
+
+    @property
+    def evaluation_prompt(self):
+        return self._evaluation_prompt
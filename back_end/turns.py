@@ -0,0 +1,17 @@
+class TurnStream:
+    """Iterable of response chunks; ``result`` is set once it is exhausted."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.result = None
+
+    def __iter__(self):
+        self.result = yield from self._chunks
+
+
+class Overloaded(RuntimeError):
+    """A new interview was not admitted; ``retry_after`` is the estimated wait in seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM capacity exhausted; estimated wait {retry_after:.0f}s")
+        self.retry_after = retry_after
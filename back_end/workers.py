@@ -0,0 +1,357 @@
+"""
+Sharded execution: conversations are spread across worker processes by a
+consistent hash of ``conversation_id``, so turns use more than one core
+while each conversation stays on exactly one worker.
+"""
+import asyncio
+import bisect
+import concurrent.futures
+import hashlib
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from .turns import Overloaded
+from .store import dump_conversation, restore_conversation
+
+logger = logging.getLogger(__name__)
+
+
+def _default_bot():
+    from .bot import LangGraphHiringBot
+    return LangGraphHiringBot()
+
+
+class WorkerError(RuntimeError):
+    """A request failed inside a worker process, or the worker died."""
+
+
+class HashRing:
+    """Consistent hash ring; adding or removing a node only moves the keys it gains or loses."""
+
+    def __init__(self, nodes=(), replicas: int = 64):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._nodes: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    def add(self, node: str):
+        for i in range(self.replicas):
+            point = self._hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._nodes.insert(index, node)
+
+    def remove(self, node: str):
+        keep = [(p, n) for p, n in zip(self._points, self._nodes) if n != node]
+        self._points = [p for p, _ in keep]
+        self._nodes = [n for _, n in keep]
+
+    def copy(self) -> "HashRing":
+        ring = HashRing(replicas=self.replicas)
+        ring._points, ring._nodes = list(self._points), list(self._nodes)
+        return ring
+
+    @property
+    def nodes(self):
+        return sorted(set(self._nodes))
+
+    def lookup(self, key: str) -> str:
+        if not self._points:
+            raise WorkerError("No workers available")
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._nodes[index]
+
+
+def _stripe(conversation_id: str, stripes: int) -> int:
+    return zlib.crc32(conversation_id.encode()) % stripes
+
+
+async def _handle(bot, results, request_id, op, args):
+    try:
+        if op == "turn":
+            user_input, conversation_id, stream = args
+            on_chunk = None
+            if stream:
+                async def on_chunk(text):
+                    results.put((request_id, "chunk", text))
+            value = await bot.aprocess_message(user_input, conversation_id, on_chunk)
+        elif op == "start":
+            value = bot.start_conversation(*args)
+        elif op == "status":
+            value = bot.conversation_status(*args)
+        elif op == "evaluation":
+            value = bot.conversation_evaluation(*args)
+        elif op == "pool":
+            value = bot.pool_status()
+        elif op == "list":
+            stripe, stripes = args
+            value = [cid for cid, _ in bot.conversations.items() if _stripe(cid, stripes) == stripe]
+        elif op == "export":
+            (conversation_id,) = args
+            value = None
+            if conversation_id in bot.conversations:
+                async with bot.conversations.acheckout(conversation_id) as conv:
+                    value = dump_conversation(conv)
+                bot.conversations.discard(conversation_id)
+        elif op == "import":
+            conversation_id, data = args
+            value = bot.conversations.put(conversation_id, restore_conversation(data))
+        else:
+            raise ValueError(f"Unknown worker op {op!r}")
+    except Overloaded as e:
+        results.put((request_id, "overloaded", e.retry_after))
+    except Exception as e:
+        results.put((request_id, "error", repr(e)))
+    else:
+        results.put((request_id, "ok", value))
+
+
+async def _serve_async(bot, requests, results):
+    loop = asyncio.get_running_loop()
+    # Requests queue up meanwhile, so the first candidate gets an open connection.
+    await bot.awarm_up()
+    tasks = set()
+    while True:
+        message = await loop.run_in_executor(None, requests.get)
+        if message is None:
+            break
+        # Requests start in arrival order, so a conversation's turns and its
+        # export during resharding take its lock in the order they were routed.
+        task = loop.create_task(_handle(bot, results, *message))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    bot.close()
+
+
+def _serve(bot_factory, requests, results):
+    asyncio.run(_serve_async(bot_factory(), requests, results))
+
+
+class _Worker:
+    def __init__(self, name, process, requests):
+        self.name = name
+        self.process = process
+        self.requests = requests
+
+
+class WorkerPool:
+    """
+    Front router over worker processes, each running its own
+    ``LangGraphHiringBot`` (conversations, history and tracer state) on an
+    event loop. Offers the bot's ``process_message``/``aprocess_message``
+    interface, so ``back_end/api.py`` can use either.
+
+    ``add_worker`` and ``drain_worker`` reshard one stripe of the key space
+    at a time: turns for that stripe wait while its conversations are handed
+    to their new owners, then continue there. ``bot_factory`` must be
+    importable (picklable) since workers are spawned.
+    """
+
+    def __init__(self, workers: int = 2, bot_factory: Callable = _default_bot,
+                 replicas: int = 64, stripes: int = 64):
+        self._context = multiprocessing.get_context("spawn")
+        self._bot_factory = bot_factory
+        self._results = self._context.Queue()
+        self._workers: Dict[str, _Worker] = {}
+        self._names = itertools.count()
+        self._ids = itertools.count()
+        # request id -> (worker name, future, on_chunk, loop)
+        self._pending: Dict[int, tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._reshard_lock = threading.Lock()
+        self._stripe_locks = [threading.Lock() for _ in range(stripes)]
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_results, name="worker-results", daemon=True)
+        self._reader.start()
+        # There is nothing to migrate yet, so the first workers boot side by
+        # side rather than one ``add_worker`` at a time.
+        ring = HashRing(replicas=replicas)
+        for _ in range(workers):
+            ring.add(self._spawn())
+        # Each stripe switches to a new ring only once its conversations have moved.
+        self._rings = [ring] * stripes
+        for listing in [self._submit(name, "list", 0, stripes) for name in self.workers]:
+            listing.result()
+
+    @property
+    def workers(self) -> List[str]:
+        return list(self._workers)
+
+    def _spawn(self) -> str:
+        name = f"worker-{next(self._names)}"
+        requests = self._context.Queue()
+        process = self._context.Process(target=_serve, args=(self._bot_factory, requests, self._results),
+                                        name=name, daemon=True)
+        process.start()
+        self._workers[name] = _Worker(name, process, requests)
+        return name
+
+    def _submit(self, name: str, op: str, *args, on_chunk=None, loop=None) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        request_id = next(self._ids)
+        with self._pending_lock:
+            self._pending[request_id] = (name, future, on_chunk, loop)
+        self._workers[name].requests.put((request_id, op, args))
+        return future
+
+    def _read_results(self):
+        while True:
+            try:
+                message = self._results.get(timeout=1.0)
+            except queue.Empty:
+                self._fail_dead_workers()
+                continue
+            if message is None:
+                return
+            request_id, kind, value = message
+            with self._pending_lock:
+                entry = self._pending.get(request_id) if kind == "chunk" else self._pending.pop(request_id, None)
+            if entry is None:
+                continue
+            _, future, on_chunk, loop = entry
+            if kind == "chunk":
+                asyncio.run_coroutine_threadsafe(on_chunk(value), loop)
+            elif kind == "ok":
+                future.set_result(value)
+            elif kind == "overloaded":
+                future.set_exception(Overloaded(value))
+            else:
+                future.set_exception(WorkerError(value))
+
+    def _fail_dead_workers(self):
+        dead = {name for name, worker in list(self._workers.items()) if not worker.process.is_alive()}
+        if not dead:
+            return
+        with self._pending_lock:
+            failed = [rid for rid, (name, *_) in self._pending.items() if name in dead]
+            entries = [self._pending.pop(rid) for rid in failed]
+        for name, future, _, _ in entries:
+            future.set_exception(WorkerError(f"{name} exited"))
+
+    def _owner(self, conversation_id: str):
+        stripe = _stripe(conversation_id, len(self._stripe_locks))
+        return self._stripe_locks[stripe], self._rings[stripe]
+
+    def _route(self, conversation_id: str, op: str, *args, **kwargs) -> concurrent.futures.Future:
+        lock, _ = self._owner(conversation_id)
+        with lock:
+            # Re-read under the lock: the stripe may have just been resharded.
+            _, ring = self._owner(conversation_id)
+            return self._submit(ring.lookup(conversation_id), op, *args, **kwargs)
+
+    async def _aroute(self, conversation_id: str, op: str, *args, **kwargs):
+        # Poll rather than block, so a stripe being resharded never stalls the event loop.
+        lock, _ = self._owner(conversation_id)
+        delay = 0.001
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        try:
+            _, ring = self._owner(conversation_id)
+            future = self._submit(ring.lookup(conversation_id), op, *args, **kwargs)
+        finally:
+            lock.release()
+        return await asyncio.wrap_future(future)
+
+    def process_message(self, user_input: str, conversation_id: str = "default"):
+        return self._route(conversation_id, "turn", user_input, conversation_id, False).result()
+
+    async def aprocess_message(self, user_input: str, conversation_id: str = "default", on_chunk=None):
+        loop = asyncio.get_running_loop()
+        return await self._aroute(conversation_id, "turn", user_input, conversation_id, on_chunk is not None,
+                                  on_chunk=on_chunk, loop=loop)
+
+    def start_conversation(self, conversation_id: str, candidate_name: str = "") -> float:
+        return self._route(conversation_id, "start", conversation_id, candidate_name).result()
+
+    def conversation_status(self, conversation_id: str) -> Optional[dict]:
+        return self._route(conversation_id, "status", conversation_id).result()
+
+    def conversation_evaluation(self, conversation_id: str) -> Optional[dict]:
+        return self._route(conversation_id, "evaluation", conversation_id).result()
+
+    def pool_status(self) -> dict:
+        """Each worker's provider connection pool usage; ``saturated`` if any worker's pool is."""
+        statuses = {name: future.result() for name, future in
+                    [(name, self._submit(name, "pool")) for name in self.workers]}
+        return {"workers": statuses,
+                "saturation": max((status["saturation"] for status in statuses.values()), default=0.0),
+                "saturated": any(status["saturated"] for status in statuses.values())}
+
+    async def astart_conversation(self, conversation_id: str, candidate_name: str = "") -> float:
+        return await self._aroute(conversation_id, "start", conversation_id, candidate_name)
+
+    async def aconversation_status(self, conversation_id: str) -> Optional[dict]:
+        return await self._aroute(conversation_id, "status", conversation_id)
+
+    async def aconversation_evaluation(self, conversation_id: str) -> Optional[dict]:
+        return await self._aroute(conversation_id, "evaluation", conversation_id)
+
+    def _reshard(self, ring: HashRing, sources: List[str]):
+        """Move every stripe onto ``ring``, migrating conversations held by ``sources`` that change owner."""
+        stripes = len(self._stripe_locks)
+        moved = 0
+        for stripe, lock in enumerate(self._stripe_locks):
+            with lock:
+                listings = [(name, self._submit(name, "list", stripe, stripes)) for name in sources]
+                for name, listing in listings:
+                    for conversation_id in listing.result():
+                        target = ring.lookup(conversation_id)
+                        if target == name:
+                            continue
+                        data = self._submit(name, "export", conversation_id).result()
+                        if data is not None:
+                            self._submit(target, "import", conversation_id, data).result()
+                            moved += 1
+                self._rings[stripe] = ring
+        return moved
+
+    def add_worker(self) -> str:
+        """Start a worker and move to it the conversations it now owns."""
+        with self._reshard_lock:
+            sources = self.workers
+            name = self._spawn()
+            ring = self._rings[0].copy()
+            ring.add(name)
+            moved = self._reshard(ring, sources)
+        logger.info("Added %s; moved %d conversations", name, moved)
+        return name
+
+    def drain_worker(self, name: str):
+        """Hand a worker's conversations to the remaining workers, then stop it."""
+        with self._reshard_lock:
+            if name not in self._workers:
+                raise KeyError(name)
+            if len(self._workers) == 1:
+                raise WorkerError("Cannot drain the last worker")
+            ring = self._rings[0].copy()
+            ring.remove(name)
+            moved = self._reshard(ring, [name])
+            worker = self._workers.pop(name)
+        worker.requests.put(None)
+        worker.process.join()
+        logger.info("Drained %s; moved %d conversations", name, moved)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.requests.put(None)
+        for worker in workers:
+            worker.process.join()
+        self._results.put(None)
+        self._reader.join()
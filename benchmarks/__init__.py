@@ -0,0 +1,12 @@
+import os
+
+# Benchmarks drive the bot with stand-in LLMs, so a placeholder key is
+# enough for Settings to validate when no .env is present.
+os.environ.setdefault("GROQ_API", "offline-benchmark")
+# Simulated interviews are not candidates, so they stay out of the results
+# store and the feedback log.
+os.environ.setdefault("RESULTS_DB_PATH", "")
+os.environ.setdefault("FEEDBACK_LOG_PATH", "")
+# The simulated model never replies with evaluation JSON; retrying it would
+# only add background LLM calls to the load being measured.
+os.environ.setdefault("EVALUATION_ATTEMPTS", "1")
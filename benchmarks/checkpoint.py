@@ -0,0 +1,117 @@
+"""
+Checkpoint benchmark: per-turn cost of persisting the interview graph state.
+
+    python -m benchmarks.checkpoint --candidates 200
+
+Full scripted interviews run against an instant LLM, so the numbers are the
+non-LLM turn overhead. Three setups are compared: no checkpointer (flags
+passed in from the session), the delta-writing SQLiteCheckpointSaver, and
+the same saver forced to rewrite every channel on each turn, as a saver
+storing whole snapshots would. Checkpoint sizes are serialized bytes. The resume row times a fresh bot's first
+turn of each interview, read back from the checkpoint.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from back_end.bot import LangGraphHiringBot
+from back_end.checkpoint import SQLiteCheckpointSaver
+from back_end.config import settings
+from benchmarks.common import format_table, percentile
+from benchmarks.loadgen import SCRIPT
+
+instant_llm = RunnableLambda(lambda prompt_value: AIMessage(content="Next question: what does a Python decorator do?"))
+
+
+class MeteredSaver(SQLiteCheckpointSaver):
+    """Records the time and serialized bytes of every put and load."""
+
+    full_snapshots = False
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.puts, self.loads, self.bytes = [], [], []
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        if self.full_snapshots:
+            new_versions = dict(checkpoint["channel_versions"])
+        values = checkpoint["channel_values"]
+        size = len(self.serde.dumps_typed({k: v for k, v in checkpoint.items() if k != "channel_values"})[1])
+        size += sum(len(self.serde.dumps_typed(values[channel])[1]) for channel in new_versions if channel in values)
+        started = time.perf_counter()
+        result = super().put(config, checkpoint, metadata, new_versions)
+        self.puts.append(time.perf_counter() - started)
+        self.bytes.append(size)
+        return result
+
+    def get_tuple(self, config):
+        started = time.perf_counter()
+        result = super().get_tuple(config)
+        self.loads.append(time.perf_counter() - started)
+        return result
+
+
+class SnapshotSaver(MeteredSaver):
+    full_snapshots = True
+
+
+def interview(saver, prefix, candidates, turns):
+    """Per-turn latencies of ``candidates`` interviews on a fresh bot checkpointing to ``saver``."""
+    bot = LangGraphHiringBot(llm=instant_llm)
+    if saver is not None:
+        bot.checkpointer = saver
+        bot.graph = bot.create_graph()
+    latencies = []
+    for i in range(candidates):
+        for message in turns:
+            started = time.perf_counter()
+            bot.process_message(message, f"{prefix}-{i}")
+            latencies.append(time.perf_counter() - started)
+    bot.close()
+    return latencies
+
+
+def row(name, latencies, saver=None):
+    if saver is None:
+        return [name, f"{percentile(latencies, 50) * 1e6:.0f}", f"{percentile(latencies, 95) * 1e6:.0f}",
+                "-", "-", "-"]
+    return [name, f"{percentile(latencies, 50) * 1e6:.0f}", f"{percentile(latencies, 95) * 1e6:.0f}",
+            f"{percentile(saver.puts, 50) * 1e6:.0f}", f"{percentile(saver.loads, 50) * 1e6:.0f}",
+            f"{sum(saver.bytes) / len(saver.bytes):.0f}"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=200)
+    args = parser.parse_args(argv)
+    # The conversation backend is left off so only checkpoint writes hit the disk.
+    settings.conversation_db_path = None
+    # Half of each interview runs before the simulated restart.
+    half = len(SCRIPT) // 2
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        rows.append(row("no checkpointer", interview(None, "none", args.candidates, SCRIPT)))
+        for name, saver_type in [("sqlite, delta", MeteredSaver), ("sqlite, all channels", SnapshotSaver)]:
+            saver = saver_type(os.path.join(tmp, f"{saver_type.__name__}.db"))
+            rows.append(row(name, interview(saver, "run", args.candidates, SCRIPT), saver))
+
+        path = os.path.join(tmp, "resume.db")
+        interview(MeteredSaver(path), "resume", args.candidates, SCRIPT[:half])
+        # The new bot has no sessions in memory, as after a restart or on another worker.
+        saver = MeteredSaver(path)
+        rows.append(row("resume after restart", interview(saver, "resume", args.candidates, SCRIPT[half:half + 1]),
+                        saver))
+
+    print(f"{args.candidates} interviews of {len(SCRIPT)} turns, instant LLM")
+    print(format_table(["setup", "turn p50 us", "turn p95 us", "put p50 us", "load p50 us", "bytes/put"], rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
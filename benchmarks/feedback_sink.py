@@ -0,0 +1,128 @@
+"""
+Feedback sink benchmark: how long a submission holds up the caller, and
+what a summary query costs, with and without the write-behind sink.
+
+    python -m benchmarks.feedback_sink --submissions 5000 --fsync-ms 10
+
+``--fsync-ms`` is added to every fsync to stand in for a slow or busy disk.
+"append + fsync" writes and fsyncs each submission in the caller, the
+straightforward way to keep feedback durable. "write-behind" is
+``FeedbackSink``: the caller only queues, and the worker fsyncs every
+``--fsync-every`` submissions or ``--fsync-seconds``. The second table
+compares ``FeedbackSink.summary`` with recomputing the same per-type and
+per-stage averages from the raw log.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from back_end.feedback import FEEDBACK_TYPES, FeedbackSink, FeedbackTotals
+from benchmarks.common import format_table, percentile
+
+STAGES = ["greeting", "info", "tech_stack", "hiring", "complete"]
+
+
+class SlowDisk:
+    """``os.fsync`` with a fixed extra delay, counting calls."""
+
+    def __init__(self, delay_ms: float):
+        self.delay = delay_ms / 1000
+        self.calls = 0
+        self._fsync = os.fsync
+
+    def __call__(self, fd):
+        self.calls += 1
+        time.sleep(self.delay)
+        self._fsync(fd)
+
+
+def submissions(count, rng):
+    return [dict(rating=rng.randint(1, 5), feedback_type=rng.choice(FEEDBACK_TYPES), stage=rng.choice(STAGES),
+                 conversation_id=f"candidate-{i}", comments="Smooth interview, clear questions. " * 3)
+            for i in range(count)]
+
+
+def append_and_fsync(path, batch, disk):
+    """Each submission written and fsynced before the caller continues."""
+    samples = []
+    with open(path, "ab") as f:
+        for fields in batch:
+            started = time.perf_counter()
+            record = {"submitted_at": time.time(), "conversation_id": fields["conversation_id"],
+                      "stage": fields["stage"], "type": fields["feedback_type"], "rating": fields["rating"],
+                      "name": "", "email": "", "comments": fields["comments"]}
+            f.write(json.dumps(record).encode("utf-8") + b"\n")
+            f.flush()
+            disk(f.fileno())
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def write_behind(path, batch, args):
+    sink = FeedbackSink(path, args.fsync_every, args.fsync_seconds, queue_size=len(batch) + 1)
+    samples = []
+    for fields in batch:
+        started = time.perf_counter()
+        sink.submit(**fields)
+        samples.append(time.perf_counter() - started)
+    sink.close()
+    return samples
+
+
+def scan(path):
+    """Per-type and per-stage totals recomputed from every line of the log."""
+    totals = FeedbackTotals()
+    with open(path, "rb") as f:
+        for line in f:
+            totals.add(json.loads(line))
+    return totals.as_dict()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--fsync-ms", type=float, default=10.0)
+    parser.add_argument("--fsync-every", type=int, default=50)
+    parser.add_argument("--fsync-seconds", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    batch = submissions(args.submissions, random.Random(args.seed))
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("append + fsync", "write-behind"):
+            path = os.path.join(directory, name.replace(" ", "_") + ".jsonl")
+            disk = os.fsync = SlowDisk(args.fsync_ms)
+            started = time.perf_counter()
+            samples = (append_and_fsync(path, batch, disk) if name == "append + fsync"
+                       else write_behind(path, batch, args))
+            elapsed = time.perf_counter() - started
+            os.fsync = disk._fsync
+            rows.append([name, f"{percentile(samples, 50) * 1e6:.0f}", f"{percentile(samples, 99) * 1e6:.0f}",
+                         f"{max(samples) * 1e6:.0f}", f"{len(batch) / elapsed:.0f}", disk.calls])
+        print(f"{args.submissions} submissions, +{args.fsync_ms:.0f} ms per fsync")
+        print(format_table(["writer", "submit p50 us", "submit p99 us", "submit max us", "submissions/s",
+                            "fsyncs"], rows))
+        print()
+
+        path = os.path.join(directory, "write-behind.jsonl")
+        sink = FeedbackSink(path)
+        started = time.perf_counter()
+        summary = sink.summary()
+        summary_ms = (time.perf_counter() - started) * 1000
+        sink.close()
+        started = time.perf_counter()
+        scanned = scan(path)
+        scan_ms = (time.perf_counter() - started) * 1000
+        assert scanned["by_stage"] == summary["by_stage"] and scanned["by_type"] == summary["by_type"]
+    print(format_table(["summary", "ms"], [["running totals", f"{summary_ms:.2f}"],
+                                           ["scan the log", f"{scan_ms:.2f}"]]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Offline load generator: virtual candidates run full interviews through
+LangGraphHiringBot.process_message against a SimulatedChatModel.
+
+    python -m benchmarks.loadgen --candidates 2000 --concurrency 200 --latency-ms 300
+
+Reports throughput, p50/p95/p99 turn latency per stage, error counts and
+the growth of ``bot.conversations`` and tracer state as the run progresses.
+"""
+import argparse
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from back_end.bot import LangGraphHiringBot
+from back_end.store import stage_for
+from benchmarks.common import deep_sizeof, format_table, percentile
+from benchmarks.simulated_llm import SimulatedChatModel
+
+SCRIPT = [
+    "Jane Doe",
+    "okay",
+    "fresher, jane@example.com, Backend Developer, Chennai, 9876543210",
+    "Python, Django, PostgreSQL, Docker, Git",
+    "B",
+    "C",
+    "The bug is the off-by-one in range(len(items) + 1); use range(len(items)).",
+    "A process has its own memory space while threads share the memory of their process.",
+    "A",
+    "Thanks!",
+]
+
+
+class LoadReport:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.turns = 0
+        self.lock = threading.Lock()
+
+    def record(self, stage, seconds, error):
+        with self.lock:
+            self.turns += 1
+            if error:
+                self.errors[stage] += 1
+            else:
+                self.latencies[stage].append(seconds)
+
+
+def run_candidate(bot, conversation_id, report, retries):
+    for message in SCRIPT:
+        flags = bot.conversations.get(conversation_id).flags
+        stage = stage_for(flags).value
+        for _ in range(retries + 1):
+            start = time.perf_counter()
+            try:
+                bot.process_message(message, conversation_id)
+            except Exception:
+                report.record(stage, time.perf_counter() - start, error=True)
+                continue
+            report.record(stage, time.perf_counter() - start, error=False)
+            break
+
+
+def state_size(bot):
+    return deep_sizeof(bot.conversations) + deep_sizeof(bot.tracer.traces)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", choices=["constant", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-second", type=float, default=500.0)
+    parser.add_argument("--output-tokens", type=int, default=60)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--checkpoints", type=int, default=4, help="memory samples taken during the run")
+    args = parser.parse_args(argv)
+
+    llm = SimulatedChatModel(latency=args.latency, latency_ms=args.latency_ms,
+                             tokens_per_second=args.tokens_per_second,
+                             output_tokens=args.output_tokens, error_rate=args.error_rate)
+    bot = LangGraphHiringBot(llm=llm)
+    report = LoadReport()
+    memory = [(0, state_size(bot))]
+    every = max(1, args.candidates // args.checkpoints)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        futures = [pool.submit(run_candidate, bot, f"candidate-{i}", report, args.retries)
+                   for i in range(args.candidates)]
+        for done, future in enumerate(futures, 1):
+            future.result()
+            if done % every == 0 or done == args.candidates:
+                memory.append((done, state_size(bot)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.candidates} candidates, {report.turns} turns at concurrency {args.concurrency} "
+          f"in {elapsed:.1f}s: {report.turns / elapsed:.1f} turns/s, "
+          f"{args.candidates / elapsed * 60:.1f} interviews/min\n")
+
+    rows = []
+    for stage in sorted(set(report.latencies) | set(report.errors)):
+        samples = report.latencies[stage]
+        rows.append([stage, len(samples), report.errors[stage]]
+                    + [f"{percentile(samples, p) * 1000:.0f}" for p in (50, 95, 99)])
+    print(format_table(["stage", "turns", "errors", "p50 ms", "p95 ms", "p99 ms"], rows))
+
+    print()
+    print(format_table(["candidates done", "state KiB", "KiB/candidate"],
+                       [[done, f"{size / 1024:.0f}", f"{size / 1024 / done:.1f}" if done else "-"]
+                        for done, size in memory]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
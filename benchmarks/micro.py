@@ -0,0 +1,159 @@
+"""
+Micro-benchmarks for the non-LLM cost of a turn, with JSON baselines.
+
+    python -m benchmarks.micro run --output benchmarks/baselines/micro.json
+    python -m benchmarks.micro run --compare benchmarks/baselines/micro.json
+    python -m benchmarks.micro compare old.json new.json --threshold 0.25
+
+``compare`` (and ``run --compare``) exits non-zero when any benchmark's
+best-of-N time is slower than the baseline by more than ``--threshold``.
+The minimum is compared rather than the median because it is the least
+sensitive to scheduler noise at microsecond scale.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from back_end.bot import LangGraphHiringBot, _compile_prompt, _prompt_inputs, route_next_stage
+from back_end.cache import ResponseCache
+from back_end.smith import LangSmithTracer
+from back_end.store import Session, Transcript
+from back_end.templates import Templates
+from front_end.transcript import export_transcript
+
+instant_llm = RunnableLambda(lambda prompt_value: AIMessage(content="Next question: what does a Python decorator do?"))
+
+HISTORY = [
+    HumanMessage(content="Python, Django, PostgreSQL, Docker"),
+    AIMessage(content="Question 1 (easy, MCQ): Which keyword defines a generator? A) yield B) return C) async D) def"),
+    HumanMessage(content="A"),
+    AIMessage(content="Correct. Question 2 (medium, MCQ): ..."),
+]
+
+
+def _hiring_flags():
+    return {"greeting_done": True, "info_done": True, "tech_done": True,
+            "hiring_done": True, "hiring_question_count": 2}
+
+
+def build_benchmarks():
+    """name -> zero-argument callable exercising one hot-path operation."""
+    templates = Templates()
+    bot = LangGraphHiringBot(llm=instant_llm)
+    tracer = LangSmithTracer()
+    prompt = _compile_prompt(templates.hiring_prompt)
+    state = {"user_input": "A", "conversation_id": "bench", **_hiring_flags()}
+    history_session = Session()
+    history_session.transcript = Transcript((m.type, m.content) for m in HISTORY)
+    portal_messages = [{"role": "user" if i % 2 else "assistant", "content": "x" * 200, "stage": "hiring",
+                        "timestamp": "2025-01-01T00:00:00"} for i in range(20)]
+
+    def turn():
+        conv = bot.conversations.get("bench-turn")
+        # First hiring turn: later ones also queue a background answer evaluation.
+        conv.flags.update(_hiring_flags(), hiring_question_count=0)
+        conv.transcript = Transcript((m.type, m.content) for m in HISTORY)
+        bot.process_message("A", "bench-turn")
+
+    def tracer_round_trip():
+        tracer.traces.clear()
+        tracer.start_trace("bench", "A", "hiring")
+        tracer.end_trace("bench", "Next question ...", {**state, "response": "Next question ...", "stage": "hiring"})
+
+    return {
+        "route_next_stage": lambda: route_next_stage(state),
+        "state_merge": lambda: {**state, "response": "Next question ...", "stage": "hiring", "hiring_done": True},
+        "prompt_format": lambda: prompt.invoke(_prompt_inputs(HISTORY, "A")),
+        "history_window": lambda: bot.history.window("bench", history_session, "hiring"),
+        "cache_key": lambda: ResponseCache.key("hiring", "v1", "A", HISTORY),
+        "tracer_start_end": tracer_round_trip,
+        "process_message_turn": turn,
+        "transcript_export": lambda: export_transcript("Jane Doe", "bench", portal_messages),
+    }
+
+
+def run(names=None, repeat=7):
+    results = {}
+    for name, fn in build_benchmarks().items():
+        if names and name not in names:
+            continue
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        samples = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+        results[name] = {"median_us": statistics.median(samples), "min_us": min(samples), "loops": number}
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Print a comparison table; return the names that regressed beyond ``threshold``."""
+    regressions = []
+    print(f"{'benchmark':<24}{'baseline us':>14}{'current us':>14}{'change':>10}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<24}{'-':>14}{result['min_us']:>14.2f}{'new':>10}")
+            continue
+        change = result["min_us"] / base["min_us"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<24}{base['min_us']:>14.2f}{result['min_us']:>14.2f}{change:>+9.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="run the suite")
+    run_parser.add_argument("--output", help="write results to this JSON file")
+    run_parser.add_argument("--compare", help="baseline JSON to compare against")
+    run_parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    run_parser.add_argument("--threshold", type=float, default=0.25)
+    cmp_parser = sub.add_parser("compare", help="compare two result files")
+    cmp_parser.add_argument("baseline")
+    cmp_parser.add_argument("current")
+    cmp_parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run(args.only)
+        if args.output:
+            os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+        if not args.compare:
+            for name, result in current["results"].items():
+                print(f"{name:<24}{result['min_us']:>12.2f} us (median {result['median_us']:.2f})")
+            return 0
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
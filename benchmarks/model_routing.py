@@ -0,0 +1,104 @@
+"""
+Model-routing benchmark: full interviews with every stage on the 70B model
+versus the per-stage routes in ``Settings.llm_routes``.
+
+    python -m benchmarks.model_routing --candidates 20 --concurrency 20
+
+Each model name gets a SimulatedChatModel with that model's latency,
+decode speed and list price, so the report shows per-stage turn latency,
+time spent waiting on the LLM per interview and the cost of 1000
+interviews, including background summaries and answer scoring.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+
+from back_end.bot import LangGraphHiringBot
+from back_end.store import stage_for
+from back_end.config import settings
+from back_end.models import llm_route
+from benchmarks.common import format_table, percentile
+from benchmarks.loadgen import SCRIPT
+from benchmarks.simulated_llm import SimulatedChatModel
+
+# Time to first token (ms), decode speed (tokens/s) and USD per million
+# input/output tokens, roughly in line with Groq's published figures.
+MODEL_PROFILES = {
+    "llama3-70b-8192": {"latency_ms": 450.0, "tokens_per_second": 280.0, "price": (0.59, 0.79)},
+    "llama3-8b-8192": {"latency_ms": 150.0, "tokens_per_second": 1200.0, "price": (0.05, 0.08)},
+}
+
+
+def single_model_routes(model="llama3-70b-8192", max_tokens=1024):
+    return {use: {**llm_route(use), "model": model, "max_tokens": max(max_tokens, llm_route(use)["max_tokens"])}
+            for use in settings.llm_routes}
+
+
+async def run(routes, args):
+    models = {}
+
+    def factory(model):
+        profile = MODEL_PROFILES[model]
+        models[model] = SimulatedChatModel(latency="lognormal", latency_ms=profile["latency_ms"],
+                                           tokens_per_second=profile["tokens_per_second"],
+                                           output_tokens=args.output_tokens, model_name=model, seed=len(models))
+        return models[model]
+
+    settings.llm_routes = routes
+    bot = LangGraphHiringBot(llm_factory=factory)
+    latencies = defaultdict(list)
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def candidate(i):
+        async with limit:
+            conversation_id = f"candidate-{i}"
+            for message in SCRIPT:
+                stage = stage_for(bot.conversations.get(conversation_id).flags).value
+                started = time.perf_counter()
+                await bot.aprocess_message(message, conversation_id)
+                latencies[stage].append(time.perf_counter() - started)
+
+    await asyncio.gather(*(candidate(i) for i in range(args.candidates)))
+    # Waits for background answer scoring, so its tokens are counted.
+    bot.close()
+    usage = {model: llm.usage for model, llm in models.items()}
+    return latencies, usage
+
+
+def cost(usage):
+    total = 0.0
+    for model, tally in usage.items():
+        price_in, price_out = MODEL_PROFILES[model]["price"]
+        total += (tally["input_tokens"] * price_in + tally["output_tokens"] * price_out) / 1e6
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--output-tokens", type=int, default=400,
+                        help="reply length the simulated models aim for before max_tokens cuts them off")
+    args = parser.parse_args(argv)
+    # Every hiring question comes from the LLM, as without a question bank.
+    settings.question_bank_path = None
+
+    rows = []
+    for name, routes in [("single 70B", single_model_routes()), ("routed", dict(settings.llm_routes))]:
+        latencies, usage = asyncio.run(run(routes, args))
+        intro = latencies["greeting"] + latencies["info"] + latencies["tech_stack"]
+        per_interview = sum(sum(samples) for samples in latencies.values()) / args.candidates
+        output_tokens = sum(tally["output_tokens"] for tally in usage.values()) / args.candidates
+        rows.append([name, f"{percentile(intro, 50) * 1000:.0f}", f"{percentile(intro, 95) * 1000:.0f}",
+                     f"{percentile(latencies['hiring'], 50) * 1000:.0f}", f"{per_interview:.1f}",
+                     f"{output_tokens:.0f}", f"{cost(usage) / args.candidates * 1000:.2f}"])
+
+    print(format_table(["routes", "intro p50 ms", "intro p95 ms", "hiring p50 ms", "LLM s/interview",
+                        "out tokens/interview", "USD/1000 interviews"], rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Exam portal render benchmark: script time per chat turn as the transcript grows.
+
+    python -m benchmarks.portal_render --turns 100
+
+Drives ``front_end/pages/exam_portal.py`` through Streamlit's AppTest with
+a stand-in interview client that replies instantly with a long code
+answer, once with the default message window and once with every message
+rendered. AppTest reruns the whole page on each send; "fragment ms" times
+``chat_pane`` within that run, which is all a browser session reruns when
+a message is sent. "pane KB" is the transcript HTML the pane sends to the
+browser on that run.
+"""
+import argparse
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from back_end.config import settings
+from benchmarks.common import format_table, percentile
+
+
+# Seconds spent in the chat fragment on each page run, appended by portal_app.
+FRAGMENT_SECONDS = []
+
+
+def portal_app(window):
+    import time
+
+    import benchmarks  # noqa: F401
+    from back_end.config import settings
+    from back_end.turns import TurnStream
+    from benchmarks.portal_render import FRAGMENT_SECONDS
+    from front_end.pages import exam_portal
+
+    reply = "Here is one way to do it:\n" + "\n".join(f"    line_{i} = compute({i})  # step {i}" for i in range(40))
+
+    class InstantClient:
+        def start_interview(self, candidate_name=""):
+            return "benchmark-conversation"
+
+        def stream_message(self, user_input, conversation_id):
+            def chunks():
+                yield reply
+                return {"response": reply, "stage": "hiring"}
+            return TurnStream(chunks())
+
+    # The module outlives page runs, so wrap the original fragment only once.
+    chat_pane = getattr(exam_portal.chat_pane, "untimed", exam_portal.chat_pane)
+
+    def timed_chat_pane():
+        started = time.perf_counter()
+        try:
+            chat_pane()
+        finally:
+            FRAGMENT_SECONDS.append(time.perf_counter() - started)
+
+    settings.portal_message_window = window
+    exam_portal.get_bot = InstantClient
+    timed_chat_pane.untimed = chat_pane
+    exam_portal.chat_pane = timed_chat_pane
+    exam_portal.main()
+
+
+def run(window, turns, marks):
+    # The list portal_app appends to, even when this module runs as __main__.
+    from benchmarks.portal_render import FRAGMENT_SECONDS
+    app = AppTest.from_function(portal_app, args=(window,), default_timeout=60).run()
+    app.text_input(key="name_input").input("Jane Doe")
+    app.button[0].click().run()
+    timings = {}
+    page, fragment = [], []
+    for turn in range(1, turns + 1):
+        app.text_input(key="user_input").input(f"answer {turn}")
+        send = next(button for button in app.button if button.label.startswith("Send"))
+        del FRAGMENT_SECONDS[:]
+        started = time.perf_counter()
+        send.click().run()
+        page.append(time.perf_counter() - started)
+        fragment.append(sum(FRAGMENT_SECONDS))
+        if turn in marks:
+            pane = max((element.value for element in app.markdown), key=len)
+            timings[turn] = (percentile(page, 50), percentile(fragment, 50), len(pane.encode()))
+            page, fragment = [], []
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=100)
+    args = parser.parse_args(argv)
+    marks = sorted({max(1, args.turns // 10), args.turns // 4, args.turns // 2, args.turns})
+
+    rows = []
+    for name, window in [(f"window {settings.portal_message_window}", settings.portal_message_window),
+                         ("all messages", 10 ** 9)]:
+        timings = run(window, args.turns, marks)
+        for mark in marks:
+            page_s, fragment_s, pane_bytes = timings[mark]
+            rows.append([name, mark, f"{page_s * 1000:.1f}", f"{fragment_s * 1000:.1f}", f"{pane_bytes / 1000:.1f}"])
+    print("median per turn over the turns since the previous row")
+    print(format_table(["rendering", "turn", "page ms", "fragment ms", "pane KB"], rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
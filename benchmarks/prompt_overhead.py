@@ -0,0 +1,64 @@
+"""
+Per-turn overhead outside the LLM call: prompt construction, chain
+composition and formatting, before and after precompiling stage chains.
+
+    python -m benchmarks.prompt_overhead --turns 2000
+"""
+import argparse
+import sys
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from back_end.bot import _compile_prompt, _prompt_inputs
+from back_end.templates import Templates
+
+instant_llm = RunnableLambda(lambda prompt_value: AIMessage(content="ok"))
+
+
+def legacy_turn(template, history, input_str):
+    # The per-turn path before chains were precompiled.
+    prompt = ChatPromptTemplate.from_messages([
+        ('system', template),
+        *[(msg.type, msg.content) for msg in history[-4:]],
+        ('human', '{input}')
+    ])
+    return (prompt | instant_llm | StrOutputParser()).invoke({"input": input_str})
+
+
+def compiled_turn(chain, history, input_str):
+    return chain.invoke(_prompt_inputs(history, input_str))
+
+
+def timed(fn, turns):
+    start = time.perf_counter()
+    for _ in range(turns):
+        fn()
+    return (time.perf_counter() - start) / turns * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    templates = Templates()
+    history = [HumanMessage(content="I use Python and Django"), AIMessage(content="Great, first question ..."),
+               HumanMessage(content="The answer is B"), AIMessage(content="Correct. Next question ...")]
+    input_str = "def f(x): return x + 1"
+
+    print(f"{'stage':<12}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for stage, template in [("greeting", templates.greeting), ("info", templates.info),
+                            ("tech_stack", templates.tech_stack), ("hiring", templates.hiring_prompt)]:
+        chain = _compile_prompt(template) | instant_llm | StrOutputParser()
+        before = timed(lambda: legacy_turn(template, history, input_str), args.turns)
+        after = timed(lambda: compiled_turn(chain, history, input_str), args.turns)
+        print(f"{stage:<12}{before:>14.1f}{after:>14.1f}{before / after:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
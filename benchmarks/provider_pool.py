@@ -0,0 +1,134 @@
+"""
+Provider connection benchmark: first-turn latency and connections opened
+when several bots in one process talk to the LLM provider.
+
+    python -m benchmarks.provider_pool --bots 4 --handshake-ms 150
+
+A local stand-in for the Groq API charges ``--handshake-ms`` once per new
+TCP connection, as TLS setup to a remote provider does, and ``--latency-ms``
+per completion. Each bot (one per Streamlit page or worker) runs the first
+four turns of an interview through real ``ChatGroq`` clients, which cover
+both routed models. "own clients" builds ChatGroq without a shared
+pool, as every bot did before. "shared pool" sends every client through
+``back_end/connections.py``, and "+ warm-up" first opens connections as
+the service does at startup.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from back_end import connections
+from back_end.bot import LangGraphHiringBot
+from back_end.config import settings
+from benchmarks.common import format_table, percentile
+from benchmarks.loadgen import SCRIPT
+
+
+class FakeProvider(ThreadingHTTPServer):
+    """OpenAI-style chat completions over keep-alive HTTP, with a per-connection setup cost."""
+
+    daemon_threads = True
+
+    def __init__(self, handshake_ms: float, latency_ms: float):
+        self.handshake = handshake_ms / 1000
+        self.latency = latency_ms / 1000
+        self.connections = 0
+        self._lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _ProviderHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _ProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.latency)
+        body = json.dumps({
+            "id": "chatcmpl-benchmark", "object": "chat.completion", "created": int(time.time()),
+            "model": request["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "Next question: what does a decorator do?"}}],
+            "usage": {"prompt_tokens": 200, "completion_tokens": 10, "total_tokens": 210},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def own_client(model):
+    from langchain_groq import ChatGroq
+    return ChatGroq(api_key=settings.GROQ_API.get_secret_value(), model=model, temperature=0,
+                    base_url=settings.llm_base_url)
+
+
+def run(provider, bots, shared, warm):
+    """First-turn and later-turn latencies over ``bots`` fresh bots, and the connections they opened."""
+    connections.close()
+    opened_before = provider.connections
+    if warm:
+        connections.open_connections()
+    first, later = [], []
+    for i in range(bots):
+        bot = LangGraphHiringBot(llm_factory=None if shared else own_client)
+        for turn, message in enumerate(SCRIPT[:4]):
+            started = time.perf_counter()
+            bot.process_message(message, f"candidate-{i}")
+            (later if turn else first).append(time.perf_counter() - started)
+        bot.close()
+    return first, later, provider.connections - opened_before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bots", type=int, default=4)
+    parser.add_argument("--handshake-ms", type=float, default=150.0)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    provider = FakeProvider(args.handshake_ms, args.latency_ms)
+    threading.Thread(target=provider.serve_forever, daemon=True).start()
+    settings.llm_base_url = provider.url
+    # Only the graph's LLM calls should reach the provider.
+    settings.conversation_db_path = None
+    settings.question_bank_path = None
+
+    rows = []
+    for name, shared, warm in [("own clients", False, False), ("shared pool", True, False),
+                               ("shared pool + warm-up", True, True)]:
+        first, later, opened = run(provider, args.bots, shared, warm)
+        rows.append([name, f"{percentile(first, 50) * 1000:.0f}", f"{max(first) * 1000:.0f}",
+                     f"{percentile(later, 50) * 1000:.0f}", f"{max(later) * 1000:.0f}", opened])
+    provider.shutdown()
+    connections.close()
+
+    print(f"{args.bots} bots, {args.handshake_ms:.0f} ms connection setup, {args.latency_ms:.0f} ms per completion")
+    print(format_table(["clients", "first turn p50 ms", "first turn max ms", "later turns p50 ms",
+                        "later turns max ms", "connections"], rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
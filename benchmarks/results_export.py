@@ -0,0 +1,126 @@
+"""
+Results store benchmark: filtered query latency and streamed export cost
+over a seeded hiring drive.
+
+    python -m benchmarks.results_export --candidates 20000
+
+Seeds ``--candidates`` completed interviews, four questions each, spread
+over 90 days, five positions and a dozen technologies, into a temporary
+results store. The first table times the HR filters against the indexes;
+"scan" is the same filter done in Python over every row, as a drive kept
+in flat files would need. The second streams each export and reports its
+size, time and the peak Python memory (tracemalloc) while it ran.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from back_end.results import ResultsStore
+from benchmarks.common import format_table, percentile
+
+POSITIONS = ["Backend Developer", "Frontend Developer", "Data Engineer", "DevOps Engineer", "ML Engineer"]
+TECHS = ["python", "django", "flask", "java", "spring", "javascript", "react", "docker", "kubernetes",
+         "postgresql", "aws", "go"]
+DAY = 86400
+
+
+def seed(store, candidates, now, rng):
+    for i in range(candidates):
+        questions = []
+        for number in range(1, 5):
+            mark = rng.randint(1, 10)
+            questions.append({"number": number, "question": f"Question {number} " + "x" * 120,
+                              "answer": "answer " * 30, "status": "scored", "mark": mark, "correct": mark >= 6,
+                              "feedback": "One line of feedback on the answer."})
+        correct = sum(q["correct"] for q in questions)
+        score = round(sum(q["mark"] for q in questions) * 10 / len(questions))
+        card = {"total_questions": 4, "correct_answers": correct, "score": score, "pass_score": 60,
+                "result": "Pass" if score >= 60 else "Fail", "feedback": "Thank you!", "questions": questions}
+        profile = {"candidate_name": f"Candidate {i}", "email": f"candidate{i}@example.com",
+                   "experience": f"{rng.randint(0, 10)} years", "position": rng.choice(POSITIONS),
+                   "location": "Chennai", "tech_stack": ", ".join(rng.sample(TECHS, 3))}
+        store.record(f"candidate-{i:06d}", profile, card, completed_at=now - rng.random() * 90 * DAY)
+
+
+def scan(store, since, position, tech, result):
+    """The filter applied in Python to every candidate row."""
+    matches = []
+    for batch in store.iter_rows("candidates"):
+        for row in batch:
+            _, completed_at, _, _, _, row_position, _, tech_stack, _, _, _, _, row_result = row
+            if (completed_at >= since and row_position.lower() == position.lower() and row_result == result
+                    and tech in tech_stack.split(", ")):
+                matches.append(row)
+    return len(matches)
+
+
+def timed(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = function()
+        samples.append(time.perf_counter() - started)
+    return value, percentile(samples, 50) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    now = time.time()
+    with tempfile.TemporaryDirectory() as directory:
+        store = ResultsStore(os.path.join(directory, "results.db"))
+        started = time.perf_counter()
+        seed(store, args.candidates, now, rng)
+        print(f"seeded {args.candidates} candidates in {time.perf_counter() - started:.1f}s "
+              f"({os.path.getsize(store.path) / 1e6:.1f} MB)")
+        print()
+
+        since = now - 7 * DAY
+        filters = [
+            ("last 7 days", dict(since=since)),
+            ("position", dict(position="backend developer")),
+            ("tech", dict(tech="kubernetes")),
+            ("7 days + position + tech + pass", dict(since=since, position="Backend Developer", tech="python",
+                                                     result="pass")),
+        ]
+        rows = []
+        for name, query in filters:
+            total, count_ms = timed(lambda: store.count(**query), args.repeat)
+            _, page_ms = timed(lambda: store.query(100, 0, **query), args.repeat)
+            rows.append([name, total, f"{count_ms:.1f}", f"{page_ms:.1f}"])
+        matched, scan_ms = timed(lambda: scan(store, since, "Backend Developer", "python", "Pass"), args.repeat)
+        rows.append(["scan: 7 days + position + tech + pass", matched, f"{scan_ms:.1f}", ""])
+        print(f"median of {args.repeat}")
+        print(format_table(["filter", "matches", "count ms", "first page ms"], rows))
+        print()
+
+        # A small export first, so pyarrow's one-off setup falls outside the measurements.
+        list(store.export("parquet", until=now - 89 * DAY))
+        rows = []
+        for format in ("csv", "parquet"):
+            for kind in ("candidates", "answers"):
+                tracemalloc.start()
+                started = time.perf_counter()
+                size = sum(len(chunk) for chunk in store.export(format, kind, batch_size=args.batch_size))
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                rows.append([format, kind, f"{size / 1e6:.1f}", f"{elapsed:.2f}", f"{peak / 1e6:.1f}"])
+        store.close()
+    print(f"full export, {args.batch_size} rows per batch")
+    print(format_table(["format", "rows", "MB", "seconds", "peak Python MB"], rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Worker-pool scaling benchmark: full interviews through WorkerPool against a
+SimulatedChatModel, at increasing worker counts.
+
+    python -m benchmarks.scaling --workers 1 2 4 8 --candidates 400 --concurrency 400
+
+Reports turns/s per worker count and the scaling efficiency relative to one
+worker. With ``--reshard`` it then runs interviews while a worker is added
+and another drained, and checks that no conversation lost or duplicated a
+message. Scaling is bounded by the cores available.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from back_end.workers import WorkerPool
+from benchmarks.common import format_table
+from benchmarks.loadgen import SCRIPT
+
+
+def simulated_bot():
+    """Worker bot factory; runs in the spawned worker process."""
+    import benchmarks  # noqa: F401  (sets the placeholder GROQ_API)
+    from back_end.bot import LangGraphHiringBot
+    from benchmarks.simulated_llm import SimulatedChatModel
+    options = dict(latency="constant", latency_ms=float(os.environ.get("SCALING_LATENCY_MS", "50")),
+                   tokens_per_second=5000.0, output_tokens=20)
+    return LangGraphHiringBot(llm=SimulatedChatModel(**options))
+
+
+async def run_candidates(pool, prefix, candidates, concurrency):
+    limit = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def candidate(i):
+        nonlocal errors
+        async with limit:
+            for message in SCRIPT:
+                try:
+                    await pool.aprocess_message(message, f"{prefix}-{i}")
+                except Exception:
+                    errors += 1
+
+    await asyncio.gather(*(candidate(i) for i in range(candidates)))
+    return errors
+
+
+def measure(workers, args):
+    pool = WorkerPool(workers, bot_factory=simulated_bot)
+    try:
+        # Warm up imports and chains in every worker before timing.
+        asyncio.run(run_candidates(pool, "warmup", workers * 4, workers * 4))
+        start = time.perf_counter()
+        errors = asyncio.run(run_candidates(pool, "run", args.candidates, args.concurrency))
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+    return args.candidates * len(SCRIPT) / elapsed, errors
+
+
+def reshard_check(args):
+    pool = WorkerPool(2, bot_factory=simulated_bot)
+
+    async def churn():
+        run = asyncio.ensure_future(run_candidates(pool, "reshard", args.candidates, args.concurrency))
+        await asyncio.sleep(0.5)
+        added = await asyncio.to_thread(pool.add_worker)
+        await asyncio.sleep(0.5)
+        await asyncio.to_thread(pool.drain_worker, "worker-0")
+        errors = await run
+        return added, errors
+
+    try:
+        added, errors = asyncio.run(churn())
+        bad = [i for i in range(args.candidates)
+               if pool.conversation_status(f"reshard-{i}")["messages"] != 2 * len(SCRIPT) - 2]
+    finally:
+        pool.close()
+    print(f"\nReshard check (added {added}, drained worker-0 mid-run): "
+          f"{errors} errors, {len(bad)} conversations with missing or extra messages")
+    return errors == 0 and not bad
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--reshard", action="store_true")
+    args = parser.parse_args(argv)
+    os.environ["SCALING_LATENCY_MS"] = str(args.latency_ms)
+
+    rows = []
+    baseline = None
+    for workers in args.workers:
+        rate, errors = measure(workers, args)
+        baseline = baseline or rate / workers
+        rows.append([workers, f"{rate:.1f}", f"{rate / (baseline * workers):.0%}", errors])
+    print(f"{args.candidates} interviews per run, concurrency {args.concurrency}, "
+          f"{os.cpu_count()} CPUs\n")
+    print(format_table(["workers", "turns/s", "efficiency", "errors"], rows))
+
+    if args.reshard and not reshard_check(args):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
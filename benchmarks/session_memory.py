@@ -0,0 +1,88 @@
+"""
+Session memory benchmark: bytes per active session for the slotted
+Session model and for the previous dict-of-LangChain-messages layout.
+
+    python -m benchmarks.session_memory --sessions 10000 --turns 10
+
+Every session gets a distinct transcript of ``--turns`` candidate/assistant
+exchanges, so no message text is shared between sessions. Allocations are
+measured with tracemalloc.
+"""
+import argparse
+import sys
+import threading
+import time
+import tracemalloc
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from back_end.store import Session
+from benchmarks.common import format_table
+from benchmarks.loadgen import SCRIPT
+
+REPLY = ("Thanks for your answer. Question {n} of 4 (Medium, Multiple Choice on python): which of these "
+         "statements about generators is true? A) ... B) ... C) ... D) ...")
+
+
+def exchanges(session, turns):
+    for n in range(turns):
+        yield f"{SCRIPT[n % len(SCRIPT)]} [{session}]", REPLY.format(n=n) + f" [{session}]"
+
+
+def legacy_conversation(session, turns):
+    """The conversation layout before Session: plain dicts holding LangChain message objects."""
+    messages = []
+    for user_text, reply in exchanges(session, turns):
+        messages.extend([HumanMessage(content=user_text), AIMessage(content=reply)])
+    return {
+        "messages": messages,
+        "flags": {"greeting_done": True, "info_done": True, "tech_done": True, "hiring_done": True,
+                  "hiring_question_count": 2, "tech_stack": "Python, Django"},
+        "lock": threading.Lock(),
+        "evaluations": {},
+        "summary": ("", 0),
+        "persisted": 0,
+        "last_access": time.monotonic(),
+    }
+
+
+def session_conversation(session, turns):
+    conv = Session()
+    for user_text, reply in exchanges(session, turns):
+        conv.transcript.append("human", user_text)
+        conv.transcript.append("ai", reply)
+    conv.flags.update(greeting_done=True, info_done=True, tech_done=True, hiring_done=True,
+                      hiring_question_count=2, tech_stack="Python, Django")
+    return conv
+
+
+def measure(build, sessions, turns):
+    """Bytes per session retained by ``sessions`` conversations keyed by id, as in a store bucket."""
+    text_bytes = sum(sys.getsizeof(a) + sys.getsizeof(b) for a, b in exchanges(0, turns))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = {f"session-{i}": build(i, turns) for i in range(sessions)}
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del held
+    return used / sessions, text_bytes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    rows = []
+    for name, build in [("dict + messages", legacy_conversation), ("Session", session_conversation)]:
+        per_session, text_bytes = measure(build, args.sessions, args.turns)
+        rows.append([name, f"{per_session:,.0f}", f"{per_session - text_bytes:,.0f}",
+                     f"{per_session * args.sessions / 2 ** 20:,.1f}"])
+    print(f"{args.sessions} sessions, {args.turns} exchanges each")
+    print(format_table(["layout", "bytes/session", "overhead bytes/session", f"MiB for {args.sessions}"], rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class SimulatedLLMError(RuntimeError):
+    """Injected provider failure, reported as a 503 so the scheduler retries it."""
+
+    status_code = 503
+
+
+class SimulatedChatModel(BaseChatModel):
+    """
+    Drop-in stand-in for ``ChatGroq`` used by the offline benchmarks.
+
+    Each call waits a time-to-first-token drawn from ``latency`` ("constant",
+    "uniform" or "lognormal" around ``latency_ms``), then emits
+    ``output_tokens`` tokens (capped by a ``max_tokens`` call argument) at
+    ``tokens_per_second``. A fraction ``error_rate`` of calls raise
+    ``SimulatedLLMError`` instead. ``usage`` totals the tokens served.
+    """
+
+    latency: str = "lognormal"
+    latency_ms: float = 300.0
+    latency_spread: float = 0.5
+    tokens_per_second: float = 250.0
+    output_tokens: int = 60
+    error_rate: float = 0.0
+    model_name: str = "simulated"
+    seed: Optional[int] = None
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+        self._usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+
+    @property
+    def usage(self) -> dict:
+        return dict(self._usage)
+
+    @property
+    def _llm_type(self) -> str:
+        return "simulated-chat"
+
+    def _first_token_delay(self) -> float:
+        if self.latency == "constant":
+            ms = self.latency_ms
+        elif self.latency == "uniform":
+            ms = self._rng.uniform(self.latency_ms * (1 - self.latency_spread),
+                                   self.latency_ms * (1 + self.latency_spread))
+        else:
+            ms = self._rng.lognormvariate(0, self.latency_spread) * self.latency_ms
+        return ms / 1000
+
+    def _plan(self, messages: List[BaseMessage], max_tokens: Optional[int] = None):
+        if self._rng.random() < self.error_rate:
+            raise SimulatedLLMError(f"{self.model_name}: injected provider error")
+        input_tokens = sum(len(str(msg.content)) for msg in messages) // 4 + 1
+        output_tokens = min(self.output_tokens, max_tokens or self.output_tokens)
+        tokens = [f"tok{i} " for i in range(output_tokens)]
+        usage = {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                 "total_tokens": input_tokens + output_tokens}
+        self._usage["calls"] += 1
+        self._usage["input_tokens"] += input_tokens
+        self._usage["output_tokens"] += output_tokens
+        return self._first_token_delay(), 1 / self.tokens_per_second, tokens, usage
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        first, per_token, tokens, usage = self._plan(messages, kwargs.get("max_tokens"))
+        time.sleep(first + per_token * len(tokens))
+        message = AIMessage(content="".join(tokens), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        first, per_token, tokens, usage = self._plan(messages, kwargs.get("max_tokens"))
+        time.sleep(first)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(per_token)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=token, usage_metadata=usage if i == len(tokens) - 1 else None))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        first, per_token, tokens, usage = self._plan(messages, kwargs.get("max_tokens"))
+        await asyncio.sleep(first + per_token * len(tokens))
+        message = AIMessage(content="".join(tokens), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        first, per_token, tokens, usage = self._plan(messages, kwargs.get("max_tokens"))
+        await asyncio.sleep(first)
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(per_token)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=token, usage_metadata=usage if i == len(tokens) - 1 else None))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
@@ -0,0 +1,104 @@
+"""
+Cold-start benchmark: import time and time to first response, each in a
+fresh interpreter.
+
+    python -m benchmarks.startup --repeat 5
+
+The first table is the import time of the modules a process loads before
+it can serve anything: the API, the bot, the worker router, and the
+portal's client and settings. The second runs the API in-process (through
+Starlette's TestClient) against an instant SimulatedChatModel and reports,
+from process launch, when ``/healthz`` first answers, when ``/readyz``
+reports the bot warm, and when the first interview turn comes back.
+"eager" builds the bot before serving, as the service did before warm-up
+moved to the background.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import format_table, percentile
+
+MODULES = ["back_end.config", "back_end.store", "back_end.workers", "back_end.bot", "back_end.api",
+           "front_end.client"]
+
+
+def simulated_bot():
+    from back_end.bot import LangGraphHiringBot
+    from benchmarks.simulated_llm import SimulatedChatModel
+    return LangGraphHiringBot(llm=SimulatedChatModel(latency="constant", latency_ms=0, output_tokens=20))
+
+
+def probe_import(module):
+    started = time.perf_counter()
+    __import__(module)
+    return {"import": time.perf_counter() - started}
+
+
+def probe_api(mode, launched):
+    from fastapi.testclient import TestClient
+
+    from back_end import api
+    imported = time.time() - launched
+    api.build_bot = simulated_bot
+    if mode == "eager":
+        api.app.state.bot = simulated_bot()
+    with TestClient(api.app) as client:
+        client.get("/healthz").raise_for_status()
+        healthy = time.time() - launched
+        while client.get("/readyz").status_code != 200:
+            time.sleep(0.005)
+        ready = time.time() - launched
+        conversation_id = client.post("/interviews").json()["conversation_id"]
+        client.post(f"/interviews/{conversation_id}/turns", json={"message": "Hello"}).raise_for_status()
+        first = time.time() - launched
+    return {"import": imported, "healthz": healthy, "readyz": ready, "first response": first}
+
+
+def probe(kind, target):
+    """Run one probe in a fresh interpreter; returns its timings in seconds."""
+    launched = time.time()
+    output = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--probe", kind, target, str(launched)],
+                            check=True, capture_output=True, text=True, env={**os.environ, "LOG_LEVEL": "WARNING"})
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def median_ms(runs, key):
+    return f"{percentile([run[key] for run in runs], 50) * 1000:.0f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--probe", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        import benchmarks  # noqa: F401  (sets the placeholder GROQ_API)
+        kind, target, launched = args.probe
+        timings = probe_import(target) if kind == "import" else probe_api(target, float(launched))
+        print(json.dumps(timings))
+        return 0
+
+    rows = []
+    for module in MODULES:
+        rows.append([module, median_ms([probe("import", module) for _ in range(args.repeat)], "import")])
+    print(f"median import time over {args.repeat} fresh interpreters")
+    print(format_table(["module", "import ms"], rows))
+    print()
+
+    columns = ["import", "healthz", "readyz", "first response"]
+    rows = []
+    for mode in ("eager", "background"):
+        runs = [probe("api", mode) for _ in range(args.repeat)]
+        rows.append([mode] + [median_ms(runs, column) for column in columns])
+    print("API service, ms from process launch (instant LLM)")
+    print(format_table(["bot warm-up"] + [f"{column} ms" for column in columns], rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
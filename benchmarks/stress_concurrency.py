@@ -0,0 +1,93 @@
+"""
+Multi-threaded stress test for a shared LangGraphHiringBot.
+
+Hundreds of sessions fire all of their turns at once against one bot
+instance (the same situation as ``st.cache_resource`` in the exam portal,
+including double-clicks from a single candidate). Afterwards every session
+must hold exactly one message pair, one trace and one flag update per turn.
+
+    python -m benchmarks.stress_concurrency --sessions 500 --turns 9
+"""
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from back_end.bot import LangGraphHiringBot
+
+
+# Answer evaluations ask for JSON; every other prompt gets a plain reply.
+EVALUATION = '{"mark": 7, "correct": true, "feedback": "ok"}'
+
+
+def stub_llm(delay: float):
+    def respond(prompt_value):
+        time.sleep(random.uniform(0, delay))
+        return AIMessage(content=EVALUATION if "Reply with a JSON object only" in prompt_value.to_string() else "ok")
+    return RunnableLambda(respond)
+
+
+def run_turn(bot, conversation_id, use_stream):
+    if use_stream:
+        stream = bot.stream_message("answer", conversation_id)
+        for _ in stream:
+            pass
+        return stream.result
+    return bot.process_message("answer", conversation_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--turns", type=int, default=9)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--delay", type=float, default=0.002, help="max simulated LLM latency (s)")
+    args = parser.parse_args(argv)
+
+    bot = LangGraphHiringBot(llm=stub_llm(args.delay))
+    jobs = [(f"session-{s}", t % 2 == 0) for s in range(args.sessions) for t in range(args.turns)]
+    random.shuffle(jobs)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as pool:
+        for future in [pool.submit(run_turn, bot, cid, stream) for cid, stream in jobs]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    # Waits for the background answer evaluations the turns queued.
+    bot.close()
+
+    expected_questions = max(0, min(args.turns - 3, 6))
+    # Each hiring turn after the first answers the previous question.
+    expected_answers = max(0, expected_questions - 1)
+    failures = []
+    for s in range(args.sessions):
+        cid = f"session-{s}"
+        conv = bot.conversations[cid]
+        traces = bot.tracer.get_conversation_traces(cid)
+        if len(conv.transcript) != 2 * min(args.turns, 9):
+            failures.append(f"{cid}: {len(conv.transcript)} messages")
+        if conv.flags.hiring_question_count != expected_questions:
+            failures.append(f"{cid}: hiring_question_count={conv.flags.hiring_question_count}")
+        if len(traces) != min(args.turns, 9) or any(t["output"] is None for t in traces):
+            failures.append(f"{cid}: {len(traces)} traces")
+        statuses = [record["status"] for record in conv.evaluations.values()]
+        if len(statuses) != expected_answers or set(statuses) - {"scored"}:
+            failures.append(f"{cid}: evaluations {statuses}")
+
+    print(f"{len(jobs)} turns across {args.sessions} sessions on {args.threads} threads "
+          f"in {elapsed:.2f}s ({len(jobs) / elapsed:.0f} turns/s)")
+    if failures:
+        print(f"FAILED: {len(failures)} lost or duplicated updates")
+        for failure in failures[:20]:
+            print(f"  {failure}")
+        return 1
+    print("OK: no lost updates")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import json
+from typing import Optional
+
+import httpx
+
+from back_end.turns import TurnStream
+
+
+class ServiceBusy(RuntimeError):
+    """The service turned away a new interview; ``retry_after`` is its wait estimate in seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Interview service is at capacity; retry in about {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class InterviewClient:
+    """
+    HTTP client for the interview service in ``back_end/api.py``, with the
+    same ``process_message``/``stream_message`` interface as the in-process bot.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 120.0, client: Optional[httpx.Client] = None):
+        self._http = client or httpx.Client(base_url=base_url.rstrip("/"), timeout=timeout)
+
+    def start_interview(self, candidate_name: str = "") -> str:
+        response = self._http.post("/interviews", json={"candidate_name": candidate_name})
+        if response.status_code == 503:
+            raise ServiceBusy(float(response.headers.get("Retry-After", 30)))
+        response.raise_for_status()
+        return response.json()["conversation_id"]
+
+    def status(self, conversation_id: str) -> dict:
+        response = self._http.get(f"/interviews/{conversation_id}")
+        response.raise_for_status()
+        return response.json()
+
+    def evaluation(self, conversation_id: str) -> dict:
+        response = self._http.get(f"/interviews/{conversation_id}/evaluation")
+        response.raise_for_status()
+        return response.json()
+
+    def result(self, conversation_id: str) -> Optional[dict]:
+        """The stored score card of a completed interview, or None until it is recorded."""
+        response = self._http.get(f"/results/{conversation_id}")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def submit_feedback(self, rating: int, feedback_type: str = "General", conversation_id: Optional[str] = None,
+                        name: str = "", email: str = "", comments: str = "") -> dict:
+        response = self._http.post("/feedback", json={
+            "rating": rating, "type": feedback_type, "conversation_id": conversation_id,
+            "name": name, "email": email, "comments": comments,
+        })
+        response.raise_for_status()
+        return response.json()
+
+    def feedback_summary(self) -> dict:
+        response = self._http.get("/feedback/summary")
+        response.raise_for_status()
+        return response.json()
+
+    def process_message(self, user_input: str, conversation_id: str) -> dict:
+        response = self._http.post(f"/interviews/{conversation_id}/turns", json={"message": user_input})
+        response.raise_for_status()
+        return response.json()
+
+    def stream_message(self, user_input: str, conversation_id: str) -> TurnStream:
+        return TurnStream(self._stream_turn(user_input, conversation_id))
+
+    def _stream_turn(self, user_input, conversation_id):
+        url = f"/interviews/{conversation_id}/turns/stream"
+        with self._http.stream("POST", url, json={"message": user_input}) as response:
+            response.raise_for_status()
+            event = None
+            for line in response.iter_lines():
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    data = json.loads(line[len("data: "):])
+                    if event == "done":
+                        return data
+                    if event == "error":
+                        raise RuntimeError(data["detail"])
+                    yield data
+                elif not line:
+                    event = None
+        raise RuntimeError("Interview service closed the stream before the turn finished")
+
+    def close(self):
+        self._http.close()
@@ -1,15 +1,154 @@
 import streamlit as st
-import uuid
+import html
+import logging
+import time
 from datetime import datetime
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-from back_end.bot import LangGraphHiringBot
+from back_end.config import settings
+from back_end.metrics import UI_RENDER_SECONDS, start_metrics_server
+from front_end.client import InterviewClient, ServiceBusy
+from front_end.transcript import export_transcript
 
 
 @st.cache_resource
 def get_bot():
-    return LangGraphHiringBot()
+    return InterviewClient(settings.api_url, timeout=settings.api_timeout_seconds)
+
+
+def start_interview(candidate_name):
+    """New conversation id, or a wait notice and a stopped page while the service is at capacity."""
+    try:
+        return get_bot().start_interview(candidate_name)
+    except ServiceBusy as e:
+        st.warning(f"⏳ Many candidates are interviewing right now. Please try again in about "
+                   f"{max(1, round(e.retry_after))} seconds.")
+        if st.button("🔄 Try Again"):
+            st.rerun()
+        st.stop()
+
+
+def message_html(message):
+    """HTML for one chat message, built on first render and kept on the message."""
+    rendered = message.get("html")
+    if rendered is None:
+        content = html.escape(message["content"]).replace("\n", "<br>")
+        if message["role"] == "user":
+            rendered = f"<div class='user-message'><strong>You:</strong> {content}</div>"
+        else:
+            rendered = f"<div class='bot-message'><strong>Bot:</strong> {content}</div>"
+            if message.get("stage"):
+                rendered = f"<div class='stage-indicator'>{html.escape(message['stage'].title())}</div>" + rendered
+        message["html"] = rendered
+    return rendered
+
+
+def show_earlier_messages():
+    st.session_state.chat_window += settings.portal_message_window
+
+
+def queue_message():
+    """Form callback: record the candidate's message before the chat pane reruns."""
+    user_input = st.session_state.user_input
+    if user_input.strip():
+        st.session_state.messages.append({
+            "role": "user",
+            "content": user_input,
+            "timestamp": datetime.now().isoformat()
+        })
+        st.session_state.pending_input = user_input
+
+
+def send_message(user_input, reply_placeholder):
+    """Stream the reply to ``user_input`` into the placeholder and record it; returns the new stage."""
+    try:
+        stream = get_bot().stream_message(user_input, st.session_state.conversation_id)
+        streamed_text = ""
+        for chunk in stream:
+            streamed_text += chunk
+            reply_placeholder.markdown(message_html({"role": "assistant", "content": streamed_text}),
+                                       unsafe_allow_html=True)
+        response = stream.result
+        reply = {
+            "role": "assistant",
+            "content": response["response"],
+            "stage": response["stage"],
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        st.error(f"Error processing message: {str(e)}")
+        reply = {
+            "role": "assistant",
+            "content": "Sorry, I encountered an error. Please try again.",
+            "stage": "error",
+            "timestamp": datetime.now().isoformat()
+        }
+        response = {"stage": st.session_state.current_stage}
+
+    st.session_state.messages.append(reply)
+    reply_placeholder.markdown(message_html(reply), unsafe_allow_html=True)
+    return response["stage"]
+
+
+@st.fragment
+def chat_pane():
+    """
+    Transcript and message form. Sending a message reruns only this
+    fragment, and only the last ``chat_window`` messages are rendered, so a
+    turn costs the same however long the interview has run. The whole page
+    reruns only when the stage changes, to update the sidebar.
+    """
+    render_started = time.perf_counter()
+    try:
+        messages = st.session_state.messages
+        hidden = max(0, len(messages) - st.session_state.chat_window)
+        if hidden:
+            st.caption(f"Showing the last {len(messages) - hidden} of {len(messages)} messages.")
+            st.button(f"⬆️ Show {min(hidden, settings.portal_message_window)} earlier messages",
+                      on_click=show_earlier_messages)
+        st.markdown("".join(message_html(message) for message in messages[hidden:]), unsafe_allow_html=True)
+
+        user_input = st.session_state.pop("pending_input", None)
+        if user_input is not None:
+            stage = send_message(user_input, st.empty())
+            if stage != st.session_state.current_stage:
+                st.session_state.current_stage = stage
+                st.session_state.interview_complete = stage == "complete"
+                st.rerun()
+
+        if not st.session_state.interview_complete:
+            with st.form(key="chat_form", clear_on_submit=True):
+                st.text_input(
+                    "Your message:",
+                    placeholder="Type your response here...",
+                    key="user_input"
+                )
+                col_send, col_clear = st.columns([1, 1])
+
+                with col_send:
+                    st.form_submit_button("Send 📤", type="primary", on_click=queue_message)
+
+                with col_clear:
+                    if st.form_submit_button("Clear Chat 🗑️"):
+                        st.session_state.reset_chat = True
+                        st.rerun()
+
+        else:
+            st.success("🎉 Interview Complete! Thank you for your time.")
+            st.info("You can start a new interview using the sidebar button.")
+
+            if st.button("➡️ Next: Score Card"):
+                st.session_state.show_scorecard = True
+                st.switch_page("pages/score_dashboard.py")
+    finally:
+        UI_RENDER_SECONDS.observe(time.perf_counter() - render_started, page="exam_portal_chat")
+
+
+@st.cache_resource
+def get_metrics_server():
+    logging.basicConfig(level=settings.log_level)
+    return start_metrics_server(settings.metrics_port) if settings.metrics_port else None
 
 
 def main():
@@ -22,12 +161,14 @@ def main():
 
     # --- Safe Reset Check ---
     if st.session_state.get("reset_chat"):
-        st.session_state.conversation_id = str(uuid.uuid4())
+        # The next interview starts once the candidate enters their name.
+        st.session_state.pop("conversation_id", None)
         st.session_state.messages = []
         st.session_state.current_stage = "greeting"
         st.session_state.interview_complete = False
         st.session_state.candidate_name = ""
         st.session_state.name_entered = False
+        st.session_state.chat_window = settings.portal_message_window
         st.session_state.reset_chat = False
 
     # --- Custom CSS ---
@@ -87,9 +228,6 @@ def main():
     st.markdown("<h1 class='main-header'>🤖 AI Hiring Assistant</h1>", unsafe_allow_html=True)
 
     # --- Session Initialization ---
-    if "conversation_id" not in st.session_state:
-        st.session_state.conversation_id = str(uuid.uuid4())
-
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
@@ -105,6 +243,9 @@ def main():
     if "name_entered" not in st.session_state:
         st.session_state.name_entered = False
 
+    if "chat_window" not in st.session_state:
+        st.session_state.chat_window = settings.portal_message_window
+
     # --- Name Entry Screen ---
     if not st.session_state.name_entered:
         st.markdown(
@@ -135,6 +276,10 @@ def main():
 
         return
 
+    # The interview starts with the name from the form, which the service records with its results.
+    if "conversation_id" not in st.session_state:
+        st.session_state.conversation_id = start_interview(st.session_state.candidate_name)
+
     # --- Sidebar ---
     with st.sidebar:
         st.header("Interview Progress")
@@ -160,7 +305,6 @@ def main():
 
         st.subheader("Session Info")
         st.write(f"**Session ID:** {st.session_state.conversation_id[:8]}...")
-        st.write(f"**Messages:** {len(st.session_state.messages)}")
         st.write(f"**Current Stage:** {st.session_state.current_stage}")
 
         if st.button("🔄 Start New Interview", type="secondary"):
@@ -172,82 +316,7 @@ def main():
 
     with col1:
         st.subheader("Chat Interface")
-
-        chat_container = st.container()
-        with chat_container:
-            for message in st.session_state.messages:
-                if message["role"] == "user":
-                    st.markdown(f"""
-                    <div class="user-message">
-                        <strong>You:</strong> {message["content"]}
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="stage-indicator">{message.get("stage", "").title()}</div>
-                    <div class="bot-message">
-                        <strong>Bot:</strong> {message["content"]}
-                    </div>
-                    """, unsafe_allow_html=True)
-
-        if not st.session_state.interview_complete:
-            with st.form(key="chat_form", clear_on_submit=True):
-                user_input = st.text_input(
-                    "Your message:",
-                    placeholder="Type your response here...",
-                    key="user_input"
-                )
-                col_send, col_clear = st.columns([1, 1])
-
-                with col_send:
-                    send_button = st.form_submit_button("Send 📤", type="primary")
-
-                with col_clear:
-                    if st.form_submit_button("Clear Chat 🗑️"):
-                        st.session_state.reset_chat = True
-                        st.rerun()
-
-            if send_button and user_input.strip():
-                st.session_state.messages.append({
-                    "role": "user",
-                    "content": user_input,
-                    "timestamp": datetime.now().isoformat()
-                })
-
-                bot = get_bot()
-                try:
-                    response = bot.process_message(user_input, st.session_state.conversation_id)
-
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response["response"],
-                        "stage": response["stage"],
-                        "timestamp": datetime.now().isoformat()
-                    })
-
-                    st.session_state.current_stage = response["stage"]
-
-                    if response["stage"] == "complete":
-                        st.session_state.interview_complete = True
-
-                except Exception as e:
-                    st.error(f"Error processing message: {str(e)}")
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": "Sorry, I encountered an error. Please try again.",
-                        "stage": "error",
-                        "timestamp": datetime.now().isoformat()
-                    })
-
-                st.rerun()
-
-        else:
-            st.success("🎉 Interview Complete! Thank you for your time.")
-            st.info("You can start a new interview using the sidebar button.")
-
-            if st.button("➡️ Next: Score Card"):
-                st.session_state.show_scorecard = True
-                st.switch_page("pages/score_card.py")
+        chat_pane()
 
     with col2:
         st.subheader("Tips")
@@ -268,14 +337,11 @@ def main():
 
         st.subheader("Quick Actions")
         if st.button("💾 Export Chat", type="secondary"):
-            chat_text = f"Interview Chat - {st.session_state.candidate_name}\n"
-            chat_text += f"Session ID: {st.session_state.conversation_id}\n"
-            chat_text += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            chat_text += "=" * 50 + "\n\n"
-            chat_text += "\n".join([
-                f"{msg['role'].title()}: {msg['content']}"
-                for msg in st.session_state.messages
-            ])
+            chat_text = export_transcript(
+                st.session_state.candidate_name,
+                st.session_state.conversation_id,
+                st.session_state.messages,
+            )
             st.download_button(
                 label="Download Chat History",
                 data=chat_text,
@@ -285,4 +351,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    get_metrics_server()
+    render_started = time.perf_counter()
+    try:
+        main()
+    finally:
+        UI_RENDER_SECONDS.observe(time.perf_counter() - render_started, page="exam_portal")
\ No newline at end of file
@@ -1,4 +1,16 @@
 import streamlit as st
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from back_end.config import settings
+from back_end.feedback import FEEDBACK_TYPES
+from front_end.client import InterviewClient
+
+
+@st.cache_resource
+def get_client():
+    return InterviewClient(settings.api_url, timeout=settings.api_timeout_seconds)
+
 
 st.set_page_config(page_title="Feedback Form", layout="centered")
 st.title("📝 Feedback Form")
@@ -8,7 +20,7 @@ name = st.text_input("Your Name (optional)")
 email = st.text_input("Your Email (optional)")
 
 # Feedback Type
-feedback_type = st.selectbox("Type of Feedback", ["General", "Bug Report", "Feature Request", "Other"])
+feedback_type = st.selectbox("Type of Feedback", FEEDBACK_TYPES)
 
 # Rating
 rating = st.slider("Rate your experience (1 = Bad, 5 = Excellent)", 1, 5, 3)
@@ -25,7 +37,13 @@ if st.button("Submit Feedback"):
         "rating": rating,
         "comments": comments
     }
-    st.success("✅ Thank you for your feedback!")
-    st.subheader("📦 Your Submitted Data")
-    st.json(feedback_data)
-
+    try:
+        # Queued by the interview service and written to the feedback log in the background.
+        get_client().submit_feedback(rating, feedback_type, st.session_state.get("conversation_id"),
+                                     name=name, email=email, comments=comments)
+    except Exception as e:
+        st.error(f"Could not submit your feedback: {e}")
+    else:
+        st.success("✅ Thank you for your feedback!")
+        st.subheader("📦 Your Submitted Data")
+        st.json(feedback_data)
@@ -1,5 +1,18 @@
+import csv
+import io
 import streamlit as st
 from datetime import datetime
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from back_end.config import settings
+from front_end.client import InterviewClient
+
+
+@st.cache_resource
+def get_client():
+    return InterviewClient(settings.api_url, timeout=settings.api_timeout_seconds)
+
 
 st.set_page_config(
     page_title="Interview Score Card",
@@ -47,28 +60,37 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Fallback defaults if direct access
-if "name" not in st.session_state:
-    st.session_state.name = "Guest"
-if "candidate_name" not in st.session_state:
-    st.session_state.candidate_name = st.session_state.name
-if "total_questions" not in st.session_state:
-    st.session_state.total_questions = 4
-if "correct_answers" not in st.session_state:
-    st.session_state.correct_answers = 3
-if "score_data" not in st.session_state:
-    st.session_state.score_data = {
-        "score": round((st.session_state.correct_answers / st.session_state.total_questions) * 100),
-        "result": "Pass" if (st.session_state.correct_answers / st.session_state.total_questions) >= 0.6 else "Fail",
-        "feedback": "Thank you for completing the interview!"
-    }
-if "conversation_id" not in st.session_state:
-    st.session_state.conversation_id = "N/A"
+# The interview's stored result, recorded once it is complete and every answer is scored
+conversation_id = st.session_state.get("conversation_id", "N/A")
+record = None
+evaluation = None
+if conversation_id != "N/A":
+    try:
+        record = get_client().result(conversation_id)
+        if record is None or record["result"] == "Incomplete":
+            # Asking for the evaluation also resubmits answers that could not be scored.
+            evaluation = get_client().evaluation(conversation_id)
+    except Exception as e:
+        st.warning(f"Could not load interview results: {e}")
 
 # Header
 st.markdown("<h1 class='score-header'>📊 Interview Score Card</h1>", unsafe_allow_html=True)
 st.markdown("---")
 
+if record is None:
+    if evaluation is not None and evaluation["pending"]:
+        st.info(f"⏳ {evaluation['pending']} answer(s) are still being scored.")
+        if st.button("🔄 Refresh Results"):
+            st.rerun()
+    else:
+        st.info("No result is recorded for this session yet. Complete the interview to see your score card.")
+    st.stop()
+
+completed_at = datetime.fromisoformat(record["completed_at"]).astimezone()
+score = record["score"]
+pass_threshold = record["pass_score"]
+feedback = record["feedback"] or "Thank you for completing the interview!"
+
 # Score Card Container
 st.markdown("<div class='score-card'>", unsafe_allow_html=True)
 
@@ -76,12 +98,11 @@ st.markdown("<div class='score-card'>", unsafe_allow_html=True)
 st.subheader("👤 Candidate Information")
 col1, col2 = st.columns(2)
 with col1:
-    st.write(f"**Name:** {st.session_state.candidate_name}")
-    st.write(
-        f"**Session ID:** {st.session_state.conversation_id[:8] if st.session_state.conversation_id != 'N/A' else 'N/A'}...")
+    st.write(f"**Name:** {record['candidate_name']}")
+    st.write(f"**Session ID:** {record['conversation_id'][:8]}...")
 with col2:
-    st.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d')}")
-    st.write(f"**Time:** {datetime.now().strftime('%H:%M:%S')}")
+    st.write(f"**Date:** {completed_at.strftime('%Y-%m-%d')}")
+    st.write(f"**Time:** {completed_at.strftime('%H:%M:%S')}")
 
 st.markdown("---")
 
@@ -92,27 +113,25 @@ col1, col2, col3, col4 = st.columns(4)
 with col1:
     st.metric(
         label="Total Questions",
-        value=st.session_state.total_questions,
+        value=record["total_questions"],
         help="Number of questions asked during the interview"
     )
 
 with col2:
     st.metric(
         label="Responses Given",
-        value=st.session_state.correct_answers,
+        value=record["correct_answers"],
         help="Number of satisfactory responses provided"
     )
 
 with col3:
     st.metric(
         label="Score",
-        value=f"{st.session_state.score_data['score']}%",
-        delta=f"{st.session_state.score_data['score'] - 60}%" if st.session_state.score_data[
-                                                                     'score'] >= 60 else f"{st.session_state.score_data['score'] - 60}%"
+        value=f"{score}%",
+        delta=f"{score - pass_threshold}%"
     )
 
 with col4:
-    pass_threshold = 60
     st.metric(
         label="Pass Threshold",
         value=f"{pass_threshold}%",
@@ -121,15 +140,31 @@ with col4:
 
 st.markdown("---")
 
+questions = [q for q in record["questions"] if q["status"] != "skipped"]
+if questions:
+    st.subheader("🧮 Per-Question Results")
+    st.table([{
+        "Question": q["number"],
+        "Mark": f"{q['mark']}/10" if q["status"] == "scored" else q["status"].title(),
+        "Correct": ("✅" if q["correct"] else "❌") if q["status"] == "scored" else "",
+        "Feedback": q["feedback"],
+    } for q in questions])
+    st.markdown("---")
+
 # Final Result Section
 st.subheader("🎯 Interview Result")
 
 # Display result with appropriate styling
-if st.session_state.score_data['result'].lower() == 'pass':
+if record['result'] == 'Incomplete':
+    st.warning(f"⚠️ {record['total_questions']} answer(s) are scored so far; the rest could not be scored yet "
+               "and are being retried. Your final result will appear here once they are.")
+    if st.button("🔄 Refresh Results"):
+        st.rerun()
+elif record['result'].lower() == 'pass':
     st.markdown(f"""
     <div class='pass-result'>
         <h3>🎉 Congratulations! You PASSED the interview!</h3>
-        <p><strong>Final Score:</strong> {st.session_state.score_data['score']}/100</p>
+        <p><strong>Final Score:</strong> {score}/100</p>
     </div>
     """, unsafe_allow_html=True)
     st.balloons()
@@ -137,14 +172,13 @@ else:
     st.markdown(f"""
     <div class='fail-result'>
         <h3>📚 Interview Result: Did not meet the pass threshold</h3>
-        <p><strong>Final Score:</strong> {st.session_state.score_data['score']}/100</p>
+        <p><strong>Final Score:</strong> {score}/100</p>
         <p>Don't worry! Consider this as a learning experience and try again.</p>
     </div>
     """, unsafe_allow_html=True)
 
 # Performance Breakdown
 st.subheader("📈 Performance Analysis")
-score = st.session_state.score_data['score']
 
 if score >= 90:
     performance_level = "Excellent"
@@ -174,7 +208,7 @@ st.markdown(f"""
 st.subheader("💬 Detailed Feedback")
 st.markdown(f"""
 <div class='feedback-box'>
-    <p>{st.session_state.score_data['feedback']}</p>
+    <p>{feedback}</p>
 </div>
 """, unsafe_allow_html=True)
 
@@ -231,19 +265,19 @@ INTERVIEW SCORE REPORT
 =====================
 
 Candidate Information:
-- Name: {st.session_state.candidate_name}
-- Session ID: {st.session_state.conversation_id}
-- Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+- Name: {record['candidate_name']}
+- Session ID: {record['conversation_id']}
+- Date: {completed_at.strftime('%Y-%m-%d %H:%M:%S')}
 
 Interview Summary:
-- Total Questions: {st.session_state.total_questions}
-- Satisfactory Responses: {st.session_state.correct_answers}
-- Final Score: {st.session_state.score_data['score']}/100
-- Result: {st.session_state.score_data['result']}
+- Total Questions: {record['total_questions']}
+- Satisfactory Responses: {record['correct_answers']}
+- Final Score: {score}/100
+- Result: {record['result']}
 - Performance Level: {performance_level}
 
 Feedback:
-{st.session_state.score_data['feedback']}
+{feedback}
 
 Performance Analysis:
 {performance_message}
@@ -254,18 +288,24 @@ Generated by AI Hiring Assistant
     st.download_button(
         label="📄 Download Score Report",
         data=report_text,
-        file_name=f"interview_score_{st.session_state.candidate_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.txt",
+        file_name=f"interview_score_{record['candidate_name'].replace(' ', '_')}_{completed_at.strftime('%Y%m%d')}.txt",
         mime="text/plain"
     )
 
 with col2:
     # Generate CSV for HR systems
-    csv_data = f"Name,Session_ID,Date,Total_Questions,Correct_Answers,Score,Result,Performance_Level\n"
-    csv_data += f"{st.session_state.candidate_name},{st.session_state.conversation_id},{datetime.now().strftime('%Y-%m-%d')},{st.session_state.total_questions},{st.session_state.correct_answers},{st.session_state.score_data['score']},{st.session_state.score_data['result']},{performance_level}"
+    csv_buffer = io.StringIO()
+    writer = csv.writer(csv_buffer)
+    writer.writerow(["Name", "Session_ID", "Date", "Total_Questions", "Correct_Answers", "Score", "Result",
+                     "Performance_Level"])
+    writer.writerow([record["candidate_name"], record["conversation_id"], completed_at.strftime('%Y-%m-%d'),
+                     record["total_questions"], record["correct_answers"], score, record["result"],
+                     performance_level])
+    csv_data = csv_buffer.getvalue()
 
     st.download_button(
         label="📊 Download CSV Data",
         data=csv_data,
-        file_name=f"interview_data_{datetime.now().strftime('%Y%m%d')}.csv",
+        file_name=f"interview_data_{completed_at.strftime('%Y%m%d')}.csv",
         mime="text/csv"
     )
\ No newline at end of file
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def export_transcript(candidate_name: str, conversation_id: str, messages: List[Dict],
+                      exported_at: Optional[datetime] = None) -> str:
+    """Plain-text chat export offered by the exam portal's "Export Chat" action."""
+    exported_at = exported_at or datetime.now()
+    header = (
+        f"Interview Chat - {candidate_name}\n"
+        f"Session ID: {conversation_id}\n"
+        f"Date: {exported_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        + "=" * 50 + "\n\n"
+    )
+    return header + "\n".join(f"{msg['role'].title()}: {msg['content']}" for msg in messages)